@@ -12,7 +12,8 @@ class MongoJWTAuthentication(JWTAuthentication):
             return None
         
         try:
-            mongo_user = User.objects.get(id=ObjectId(user_id))
+            # blocked_by can grow long and is only read via api.utils.blocking.
+            mongo_user = User.objects.exclude("blocked_by").get(id=ObjectId(user_id))
         except Exception:
             return None
         return mongo_user
@@ -0,0 +1,54 @@
+from asgiref.sync import sync_to_async
+from bson import ObjectId
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+from api.models.artwork_model.bid import Auction
+from api.utils.realtime import auction_group, auction_snapshot, countdown
+
+
+@sync_to_async
+def get_auction(auction_id):
+    return Auction.objects(id=auction_id).only("status", "end_time", "summary").first()
+
+
+class AuctionConsumer(AsyncJsonWebsocketConsumer):
+    """
+    Streams one auction to its watchers: a snapshot on connect, then "bid",
+    "closed" and "sync" deltas. Clients may send {"type": "sync"} to get the
+    countdown resynced against the server clock.
+    """
+
+    async def connect(self):
+        self.auction_id = self.scope["url_route"]["kwargs"]["auction_id"]
+        self.group_name = None
+        if not ObjectId.is_valid(self.auction_id):
+            await self.close(code=4404)
+            return
+
+        auction = await get_auction(self.auction_id)
+        if auction is None:
+            await self.close(code=4404)
+            return
+
+        self.group_name = auction_group(self.auction_id)
+        await self.channel_layer.group_add(self.group_name, self.channel_name)
+        await self.accept()
+        await self.send_json(auction_snapshot(auction))
+
+    async def disconnect(self, code):
+        if self.group_name:
+            await self.channel_layer.group_discard(self.group_name, self.channel_name)
+
+    async def receive_json(self, content, **kwargs):
+        if content.get("type") == "sync":
+            auction = await get_auction(self.auction_id)
+            if auction is not None:
+                await self.send_json({"type": "sync", **countdown(auction)})
+
+    async def auction_bid(self, event):
+        await self.send_json(event["payload"])
+
+    async def auction_closed(self, event):
+        await self.send_json(event["payload"])
+
+    async def auction_sync(self, event):
+        await self.send_json(event["payload"])
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+from api.models.artwork_model.bid import Auction
+from api.utils.loaders import ref_ids
+
+
+class Command(BaseCommand):
+    help = "Build the embedded bid summary of auctions created before it existed."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Rebuild every auction's summary, not only those that are missing or stale.",
+        )
+
+    def handle(self, *args, **options):
+        # Left by an earlier version of place_bid; Auction no longer declares
+        # them, so documents that still carry them cannot be loaded.
+        Auction._get_collection().update_many(
+            {"$or": [{"highest_amount": {"$exists": True}}, {"highest_bidder": {"$exists": True}}]},
+            {"$unset": {"highest_amount": "", "highest_bidder": ""}},
+        )
+
+        rebuilt = 0
+        # These load a default summary that looks current when there are no bids.
+        missing = set(Auction.objects(summary__exists=False).scalar("id"))
+        for auction in Auction.objects.only("bid_history", "summary").no_cache():
+            stale = auction.summary.bid_count != len(ref_ids(auction, "bid_history"))
+            if options["all"] or stale or auction.id in missing:
+                # Forces sync_summary to rebuild it.
+                auction.summary.bid_count = -1
+                auction.sync_summary()
+                rebuilt += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rebuilt} auction summaries."))
@@ -0,0 +1,198 @@
+import resource
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+import numpy as np
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from pymongo import UpdateOne
+from api.models.artwork_model.artwork import Art
+from api.models.interaction_model.follows import Follower
+from api.models.interaction_model.interaction import Like
+from api.models.interaction_model.suggestions import FollowSuggestionRun, FollowSuggestions
+from api.models.user_model.users import User
+from api.utils.follow_suggestions import FollowGraph
+
+
+class Command(BaseCommand):
+    help = (
+        "Write each user's top \"who to follow\" suggestions to follow_suggestions, "
+        "scored from the follow and like graphs. Incremental by default: only users "
+        "who followed, unfollowed or liked since the last run, users without "
+        "suggestions and users whose suggestions are older than --max-age are scored."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--full", action="store_true", help="Score every user.")
+        parser.add_argument("--max-age", type=int, default=7, help="Days after which suggestions are recomputed anyway.")
+        parser.add_argument("--batch-size", type=int, default=1000, help="Users scored per matrix batch.")
+        parser.add_argument(
+            "--benchmark",
+            type=int,
+            metavar="USERS",
+            help="Score a synthetic graph of this many users instead of the database and report time and memory.",
+        )
+
+    def handle(self, *args, **options):
+        if options["benchmark"]:
+            self.benchmark(options["benchmark"], options["batch_size"])
+            return
+
+        started_at = datetime.utcnow()
+        timer = Timer()
+        last_run = FollowSuggestionRun.objects(finished_at__ne=None).order_by("-finished_at").first()
+        full = options["full"] or last_run is None
+
+        users = list(User._get_collection().find({}, {"user_status": 1, "blocked_users": 1, "blocked_by": 1}))
+        user_ids = [user["_id"] for user in users]
+        index = {user_id: i for i, user_id in enumerate(user_ids)}
+        graph = FollowGraph(len(user_ids), self.follow_edges(index), self.like_edges(index))
+        timer.lap("graph")
+
+        if full:
+            targets = list(range(len(user_ids)))
+        else:
+            targets = sorted(index[user_id] for user_id in self.changed_users(last_run.started_at, options["max_age"]) if user_id in index)
+
+        excluded = {
+            index[user["_id"]]: [index[other] for other in user.get("blocked_users", []) + user.get("blocked_by", []) if other in index]
+            for user in users
+            if user.get("blocked_users") or user.get("blocked_by")
+        }
+        candidates = np.array([user.get("user_status", "Active") == "Active" for user in users], dtype=bool)
+
+        written = 0
+        for start in range(0, len(targets), options["batch_size"]):
+            rows = targets[start:start + options["batch_size"]]
+            scored = graph.score(rows, settings.FOLLOW_SUGGESTION_WEIGHTS, settings.FOLLOW_SUGGESTIONS_PER_USER, excluded, candidates)
+            written += self.write(user_ids, rows, scored)
+        timer.lap("score")
+
+        FollowSuggestionRun(started_at=started_at, finished_at=datetime.utcnow(), users_scored=written, full=full).save()
+        self.stdout.write(self.style.SUCCESS(
+            f"Scored {written} of {len(user_ids)} users ({'full' if full else 'incremental'}) in {timer.report()}."
+        ))
+
+    def follow_edges(self, index):
+        followers, followed = [], []
+        for edge in Follower._get_collection().find({}, {"follower": 1, "following": 1, "_id": 0}):
+            if edge.get("follower") in index and edge.get("following") in index:
+                followers.append(index[edge["follower"]])
+                followed.append(index[edge["following"]])
+        return followers, followed
+
+    def like_edges(self, index):
+        artists = {art["_id"]: art.get("artist") for art in Art._get_collection().find({}, {"artist": 1})}
+        likers, liked_artists = [], []
+        for like in Like._get_collection().find({"art": {"$ne": None}}, {"user": 1, "art": 1, "_id": 0}):
+            artist = artists.get(like.get("art"))
+            if like.get("user") in index and artist in index:
+                likers.append(index[like["user"]])
+                liked_artists.append(index[artist])
+        return likers, liked_artists
+
+    def changed_users(self, since, max_age):
+        changed = set(User.objects(graph_changed_at__gt=since).scalar("id"))
+        # Unlikes leave no trace; they are picked up by --max-age or a --full run.
+        changed.update(like["user"] for like in Like._get_collection().find({"created_at": {"$gt": since}}, {"user": 1}))
+
+        scored = set(FollowSuggestions.objects(computed_at__gte=datetime.utcnow() - timedelta(days=max_age)).scalar("user"))
+        unscored = set(User.objects.scalar("id")) - scored
+        return changed | unscored
+
+    def write(self, user_ids, rows, scored):
+        cards = {
+            user["_id"]: user
+            for user in User._get_collection().find(
+                {"_id": {"$in": list({user_ids[candidate] for suggestions in scored for candidate, *_ in suggestions})}},
+                {"username": 1, "first_name": 1, "last_name": 1, "profile_picture": 1},
+            )
+        }
+
+        now = datetime.utcnow()
+        operations = []
+        for row, suggestions in zip(rows, scored):
+            documents = []
+            for candidate, score, reason, mutual_count in suggestions:
+                card = cards.get(user_ids[candidate], {})
+                documents.append({
+                    "user": user_ids[candidate],
+                    "username": card.get("username"),
+                    "first_name": card.get("first_name"),
+                    "last_name": card.get("last_name"),
+                    "profile_picture": card.get("profile_picture"),
+                    "score": round(score, 4),
+                    "reason": reason,
+                    "mutual_count": mutual_count,
+                })
+            operations.append(UpdateOne(
+                {"user": user_ids[row]},
+                {"$set": {"suggestions": documents, "computed_at": now}},
+                upsert=True,
+            ))
+
+        if operations:
+            FollowSuggestions._get_collection().bulk_write(operations, ordered=False)
+        return len(operations)
+
+    def benchmark(self, n_users, batch_size):
+        rng = np.random.default_rng(7)
+        n_artists = max(1, n_users // 10)
+        # Heavy-tailed popularity: a few artists attract most follows and likes.
+        popularity = 1 / np.arange(1, n_artists + 1) ** 0.9
+        popularity /= popularity.sum()
+        artists = rng.permutation(n_users)[:n_artists]
+
+        follows_per_user = rng.poisson(30, n_users)
+        followers = np.repeat(np.arange(n_users), follows_per_user)
+        followed = np.where(
+            rng.random(len(followers)) < 0.7,
+            artists[rng.choice(n_artists, len(followers), p=popularity)],
+            rng.integers(0, n_users, len(followers)),
+        )
+        likes_per_user = rng.poisson(20, n_users)
+        likers = np.repeat(np.arange(n_users), likes_per_user)
+        liked = artists[rng.choice(n_artists, len(likers), p=popularity)]
+
+        tracemalloc.start()
+        timer = Timer()
+        graph = FollowGraph(n_users, (followers, followed), (likers, liked))
+        timer.lap("graph")
+
+        weights = settings.FOLLOW_SUGGESTION_WEIGHTS
+        k = settings.FOLLOW_SUGGESTIONS_PER_USER
+        suggested = 0
+        for start in range(0, n_users, batch_size):
+            rows = range(start, min(start + batch_size, n_users))
+            suggested += sum(len(row) for row in graph.score(rows, weights, k))
+        timer.lap("score")
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        self.stdout.write(
+            f"Users: {n_users}, artists: {graph.artist_count}, follows: {graph.follows.nnz}, "
+            f"artist likes: {graph.likes.nnz}, co-like pairs: {graph.colike.nnz}\n"
+            f"Time: {timer.report()}\n"
+            f"Suggestions: {suggested} ({suggested / n_users:.1f} per user)\n"
+            f"Peak traced memory: {peak / 2 ** 20:.0f} MiB, max RSS: {max_rss_mib():.0f} MiB"
+        )
+
+
+class Timer:
+    def __init__(self):
+        self.started = self.last = time.perf_counter()
+        self.laps = []
+
+    def lap(self, name):
+        now = time.perf_counter()
+        self.laps.append((name, now - self.last))
+        self.last = now
+
+    def report(self):
+        laps = ", ".join(f"{name} {seconds:.1f}s" for name, seconds in self.laps)
+        return f"{time.perf_counter() - self.started:.1f}s ({laps})"
+
+
+def max_rss_mib():
+    # ru_maxrss is KiB on Linux.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
@@ -0,0 +1,60 @@
+from datetime import datetime
+from django.core.management.base import BaseCommand
+from pymongo import UpdateOne
+from api.models.artwork_model.bid import Auction
+from api.models.interaction_model.interaction import View
+from api.utils.loaders import ref_id, ref_ids
+from api.utils.view_tracking import TARGET_TYPES
+
+
+class Command(BaseCommand):
+    help = (
+        "Move the embedded viewed_by arrays of auctions and exhibits into the views "
+        "collection and set view_count from it."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--keep-arrays",
+            action="store_true",
+            help="Leave viewed_by in place after copying it.",
+        )
+
+    def handle(self, *args, **options):
+        views = View._get_collection()
+        now = datetime.utcnow()
+
+        for document_cls, target_type in TARGET_TYPES.items():
+            documents = document_cls.objects(viewed_by__0__exists=True).no_cache()
+            if document_cls is Auction:
+                documents = documents.only("viewed_by", "artwork")
+            else:
+                documents = documents.only("viewed_by")
+
+            migrated = 0
+            for document in documents:
+                art_id = ref_id(document, "artwork") if document_cls is Auction else None
+                operations = [
+                    UpdateOne(
+                        {"target": document.id, "user": user_id},
+                        {"$setOnInsert": {
+                            "target_type": target_type,
+                            "art": art_id,
+                            # The arrays never recorded when someone viewed.
+                            "created_at": now,
+                        }},
+                        upsert=True,
+                    )
+                    for user_id in dict.fromkeys(ref_ids(document, "viewed_by"))
+                ]
+                views.bulk_write(operations, ordered=False)
+
+                update = {"set__view_count": View.objects(target=document.id).count()}
+                if not options["keep_arrays"]:
+                    update["unset__viewed_by"] = True
+                document_cls.objects(id=document.id).update_one(**update)
+                migrated += 1
+
+            self.stdout.write(f"{target_type}: migrated viewers of {migrated} document(s).")
+
+        self.stdout.write(self.style.SUCCESS("View tracking migrated."))
@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+from api.models.artwork_model.artwork import (
+    Art, ArtStatus, ArtVisibility, normalize_art_status, normalize_art_visibility
+)
+
+
+# Art field -> (normalizer, canonical values).
+NORMALIZED_FIELDS = (
+    ("art_status", normalize_art_status, {status.value for status in ArtStatus}),
+    ("visibility", normalize_art_visibility, {visibility.value for visibility in ArtVisibility}),
+)
+
+
+class Command(BaseCommand):
+    help = "Rewrite legacy art_status/visibility spellings on Art to their canonical values."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report the values that would be rewritten without writing them.",
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options["dry_run"]
+        collection = Art._get_collection()
+
+        for field, normalize, canonical in NORMALIZED_FIELDS:
+            db_field = Art._fields[field].db_field
+            for value in collection.distinct(db_field):
+                if value is None or value in canonical:
+                    continue
+
+                target = normalize(value)
+                if target not in canonical:
+                    self.stderr.write(f"{field}: no canonical value for {value!r}, left as is.")
+                    continue
+
+                if dry_run:
+                    count = collection.count_documents({db_field: value})
+                    self.stdout.write(f"{field}: would rewrite {count} {value!r} -> {target!r}")
+                else:
+                    result = collection.update_many({db_field: value}, {"$set": {db_field: target}})
+                    self.stdout.write(f"{field}: rewrote {result.modified_count} {value!r} -> {target!r}")
+
+        self.stdout.write(self.style.SUCCESS("Art status/visibility values normalized."))
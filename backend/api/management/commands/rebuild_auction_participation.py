@@ -0,0 +1,58 @@
+from django.core.management.base import BaseCommand
+from pymongo import UpdateOne
+from api.models.artwork_model.bid import Auction, AuctionParticipation, Bid
+from api.utils.loaders import ref_id, ref_ids
+
+
+class Command(BaseCommand):
+    help = "Rebuild the auction_participation collection from every auction's bid history."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500, help="Auctions read per batch.")
+
+    def handle(self, *args, **options):
+        collection = AuctionParticipation._get_collection()
+        auctions = Auction.objects(bid_history__0__exists=True).only("status", "summary", "bid_history").no_cache()
+
+        written = 0
+        batch = []
+        for auction in auctions:
+            batch.append(auction)
+            if len(batch) >= options["batch_size"]:
+                written += self.rebuild(collection, batch)
+                batch = []
+        if batch:
+            written += self.rebuild(collection, batch)
+
+        self.stdout.write(self.style.SUCCESS(f"Wrote {written} auction participation rows."))
+
+    def rebuild(self, collection, auctions):
+        bid_ids = [bid_id for auction in auctions for bid_id in ref_ids(auction, "bid_history")]
+        bids = {bid.id: bid for bid in Bid.objects(id__in=bid_ids).only("bidder", "amount", "timestamp")}
+
+        operations = []
+        for auction in auctions:
+            per_user = {}
+            for bid_id in ref_ids(auction, "bid_history"):
+                bid = bids.get(bid_id)
+                if bid is None:
+                    continue
+                user_bids = per_user.setdefault(ref_id(bid, "bidder"), [])
+                user_bids.append(bid)
+
+            for user_id, user_bids in per_user.items():
+                last = max(user_bids, key=lambda bid: bid.timestamp)
+                operations.append(UpdateOne(
+                    {"user": user_id, "auction": auction.id},
+                    {"$set": {
+                        "last_bid_amount": last.amount,
+                        "last_bid_at": last.timestamp,
+                        "highest_bid_amount": max(bid.amount for bid in user_bids),
+                        "outcome": auction.participation_outcome(user_id),
+                    }},
+                    upsert=True,
+                ))
+
+        if operations:
+            collection.bulk_write(operations, ordered=False)
+        return len(operations)
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+from pymongo import UpdateOne
+from api.models.user_model.users import User
+
+
+class Command(BaseCommand):
+    help = "Recompute every user's blocked_by list from the other users' blocked_users."
+
+    def handle(self, *args, **options):
+        blocked_by = {}
+        for user in User.objects(blocked_users__0__exists=True).only("blocked_users").no_cache():
+            for blocked_id in user.blocked_users:
+                blocked_by.setdefault(blocked_id, set()).add(user.id)
+
+        operations = []
+        for user in User.objects.only("blocked_by").no_cache():
+            expected = blocked_by.get(user.id, set())
+            if set(user.blocked_by) != expected:
+                operations.append(UpdateOne({"_id": user.id}, {"$set": {"blocked_by": sorted(expected)}}))
+
+        if operations:
+            User._get_collection().bulk_write(operations, ordered=False)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt blocked_by for {len(operations)} user(s)."))
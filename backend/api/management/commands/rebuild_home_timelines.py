@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from api.models.interaction_model.follows import Follower
+from api.models.interaction_model.timeline import TimelineEntry
+from api.utils.timeline import backfill_follow
+
+
+class Command(BaseCommand):
+    help = "Fill the home_timeline collection from existing follows, e.g. after first deploying it."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--clear", action="store_true", help="Drop every timeline entry first.")
+
+    def handle(self, *args, **options):
+        if options["clear"]:
+            TimelineEntry.objects.delete()
+
+        follows = written = 0
+        for follow in Follower.objects.only("follower", "following").no_cache():
+            written += backfill_follow(follow)
+            follows += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Backfilled {follows} follows ({written} timeline writes)."))
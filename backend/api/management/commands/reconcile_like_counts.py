@@ -0,0 +1,59 @@
+from django.core.management.base import BaseCommand
+from pymongo import UpdateOne
+from api.models.artwork_model.artwork import Art
+from api.models.artwork_model.bid import Auction
+from api.models.exhibit_model.exhibit import Exhibit
+from api.models.interaction_model.interaction import Like
+
+
+# Like field -> document class holding the denormalized ``likes_count``.
+LIKE_TARGETS = (
+    ("art", Art),
+    ("auction", Auction),
+    ("exhibit", Exhibit),
+)
+
+
+class Command(BaseCommand):
+    help = "Rebuild likes_count on Art, Auction and Exhibit from the likes collection."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report the counters that would change without writing them.",
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options["dry_run"]
+        likes = Like._get_collection()
+
+        for field, document_cls in LIKE_TARGETS:
+            db_field = Like._fields[field].db_field
+            counts = {
+                row["_id"]: row["count"]
+                for row in likes.aggregate([
+                    {"$match": {db_field: {"$ne": None}}},
+                    {"$group": {"_id": f"${db_field}", "count": {"$sum": 1}}},
+                ])
+            }
+
+            collection = document_cls._get_collection()
+            operations = []
+            for doc in collection.find({}, {"likes_count": 1}):
+                expected = counts.get(doc["_id"], 0)
+                if doc.get("likes_count") != expected:
+                    operations.append(
+                        UpdateOne({"_id": doc["_id"]}, {"$set": {"likes_count": expected}})
+                    )
+
+            if operations and not dry_run:
+                collection.bulk_write(operations, ordered=False)
+
+            verb = "would fix" if dry_run else "fixed"
+            self.stdout.write(
+                f"{document_cls.__name__}: {verb} {len(operations)} counter(s) "
+                f"from {sum(counts.values())} like(s)."
+            )
+
+        self.stdout.write(self.style.SUCCESS("Like counters reconciled."))
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from pymongo import UpdateOne
+from api.models.artwork_model.artwork import Art
+from api.models.artwork_model.bid import Auction
+from api.utils.loaders import ref_id
+
+
+class Command(BaseCommand):
+    help = "Copy each auction's artist from its artwork and rescore ongoing auctions' popularity."
+
+    def handle(self, *args, **options):
+        missing = list(Auction.objects(artist=None).only("artwork"))
+        artwork_ids = list({ref_id(auction, "artwork") for auction in missing})
+        artists = {art.id: ref_id(art, "artist") for art in Art.objects(id__in=artwork_ids).only("artist")}
+
+        operations = [
+            UpdateOne({"_id": auction.id}, {"$set": {"artist": artists[ref_id(auction, "artwork")]}})
+            for auction in missing
+            if artists.get(ref_id(auction, "artwork"))
+        ]
+        if operations:
+            Auction._get_collection().bulk_write(operations, ordered=False)
+        self.stdout.write(f"Set the artist of {len(operations)} auction(s).")
+
+        rescored = Auction.refresh_popularity_scores()
+        self.stdout.write(self.style.SUCCESS(f"Rescored {rescored} ongoing auction(s)."))
@@ -0,0 +1,43 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from api.utils.trending import refresh_trending
+
+
+class Command(BaseCommand):
+    help = "Recompute the time-decayed trending artwork leaderboard (trending_art collection)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep running, refreshing every TRENDING_REFRESH_SECONDS.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=settings.TRENDING_REFRESH_SECONDS,
+            help="Seconds between refreshes when --loop is set.",
+        )
+        parser.add_argument(
+            "--top-k",
+            type=int,
+            default=settings.TRENDING_TOP_K,
+            help="Number of artworks kept in the leaderboard.",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            started = time.monotonic()
+            try:
+                ranked = refresh_trending(top_k=options["top_k"])
+                elapsed = time.monotonic() - started
+                self.stdout.write(f"Ranked {ranked} trending artwork(s) in {elapsed:.2f}s.")
+            except Exception as e:
+                if not options["loop"]:
+                    raise
+                self.stderr.write(f"Trending refresh failed: {e}")
+
+            if not options["loop"]:
+                break
+            time.sleep(max(0, options["interval"] - (time.monotonic() - started)))
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+from pymongo import UpdateOne
+from api.models.interaction_model.follows import Follower
+from api.models.user_model.users import User
+
+
+class Command(BaseCommand):
+    help = "Recompute every user's followers_count and following_count from the followers collection."
+
+    def handle(self, *args, **options):
+        followers = self.counts("$following")
+        following = self.counts("$follower")
+
+        operations = []
+        for user in User.objects.only("followers_count", "following_count").no_cache():
+            expected = (followers.get(user.id, 0), following.get(user.id, 0))
+            if (user.followers_count, user.following_count) != expected:
+                operations.append(UpdateOne(
+                    {"_id": user.id},
+                    {"$set": {"followers_count": expected[0], "following_count": expected[1]}},
+                ))
+
+        if operations:
+            User._get_collection().bulk_write(operations, ordered=False)
+        self.stdout.write(self.style.SUCCESS(f"Corrected the follow counts of {len(operations)} user(s)."))
+
+    def counts(self, field):
+        rows = Follower._get_collection().aggregate([{"$group": {"_id": field, "count": {"$sum": 1}}}])
+        return {row["_id"]: row["count"] for row in rows}
@@ -0,0 +1,107 @@
+import heapq
+import time
+from datetime import datetime, timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from api.models.artwork_model.bid import Auction, AuctionStatus
+
+
+class Command(BaseCommand):
+    help = (
+        "Close auctions at their end_time. Keeps an in-memory timer heap of ongoing "
+        "auctions, reseeded from the (status, end_time) index every --rescan seconds, "
+        "when ongoing auctions are also rescored for the popular list."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rescan",
+            type=int,
+            default=settings.AUCTION_SCHEDULER_RESCAN_SECONDS,
+            help="Seconds between index scans for new or rescheduled auctions.",
+        )
+        parser.add_argument(
+            "--lookahead",
+            type=int,
+            default=settings.AUCTION_SCHEDULER_LOOKAHEAD_SECONDS,
+            help="Only auctions ending within this many seconds are kept in memory.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Close every auction that has already ended, then exit.",
+        )
+
+    def handle(self, *args, **options):
+        if options["once"]:
+            closed = sum(self.close(auction_id) for auction_id in self.expired_ids(datetime.utcnow()))
+            self.stdout.write(f"Closed {closed} expired auction(s).")
+            return
+
+        rescan = timedelta(seconds=options["rescan"])
+        lookahead = timedelta(seconds=options["lookahead"])
+        heap = []
+        scheduled = set()
+        next_scan = datetime.utcnow()
+
+        while True:
+            now = datetime.utcnow()
+
+            if now >= next_scan:
+                added = self.seed(heap, scheduled, now + max(lookahead, rescan))
+                if added:
+                    self.stdout.write(f"Scheduled {added} auction(s); {len(heap)} pending.")
+                self.rescore(now)
+                next_scan = now + rescan
+
+            while heap and heap[0][0] <= now:
+                end_time, auction_id = heapq.heappop(heap)
+                scheduled.discard((end_time, auction_id))
+                if self.close(auction_id):
+                    self.stdout.write(f"Closed auction {auction_id} (ended {end_time.isoformat()}).")
+
+            wake_at = min(heap[0][0], next_scan) if heap else next_scan
+            time.sleep(max(0.0, (wake_at - datetime.utcnow()).total_seconds()))
+
+    def rescore(self, now):
+        try:
+            Auction.refresh_popularity_scores(now)
+        except Exception as e:
+            self.stderr.write(f"Error refreshing auction popularity: {e}")
+
+    def expired_ids(self, now):
+        return list(Auction.objects(
+            status=AuctionStatus.ON_GOING.value,
+            end_time__lte=now,
+        ).order_by("end_time").scalar("id"))
+
+    def seed(self, heap, scheduled, horizon):
+        upcoming = Auction.objects(
+            status=AuctionStatus.ON_GOING.value,
+            end_time__lte=horizon,
+        ).order_by("end_time").only("end_time")
+
+        added = 0
+        for auction in upcoming:
+            entry = (auction.end_time, auction.id)
+            if entry not in scheduled:
+                # An auction whose end_time moved keeps its stale entry; close() rechecks it.
+                scheduled.add(entry)
+                heapq.heappush(heap, entry)
+                added += 1
+        return added
+
+    def close(self, auction_id):
+        auction = Auction.objects(
+            id=auction_id,
+            status=AuctionStatus.ON_GOING.value,
+            end_time__lte=datetime.utcnow(),
+        ).first()
+        if auction is None:
+            return False
+
+        try:
+            return auction.close_auction()
+        except Exception as e:
+            self.stderr.write(f"Error closing auction {auction_id}: {e}")
+            return False
@@ -0,0 +1,88 @@
+import time
+from datetime import datetime, timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from api.models.artwork_model.bid import AUCTION_CLOSED_JOB, Auction
+from api.models.jobs_model.outbox import OutboxJob, OutboxStatus
+from api.utils.timeline import TIMELINE_ART_JOB, sync_art
+
+
+def settle_closed_auction(job):
+    auction = Auction.objects(id=job.payload["auction"]).first()
+    if auction is not None:
+        auction.settle_close(job)
+
+
+def sync_art_timelines(job):
+    sync_art(job.payload["art"])
+
+
+HANDLERS = {
+    AUCTION_CLOSED_JOB: settle_closed_auction,
+    TIMELINE_ART_JOB: sync_art_timelines,
+}
+
+# Auctions closed this long ago but still unsettled lost their job (e.g. the
+# closing process died before enqueueing it) and are queued again.
+REQUEUE_AFTER = timedelta(minutes=5)
+
+
+class Command(BaseCommand):
+    help = (
+        "Run queued outbox jobs, such as the notifications, purchase and artwork "
+        "update of a closed auction, retrying failures with backoff."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--poll", type=float, default=settings.OUTBOX_POLL_SECONDS, help="Seconds to sleep when idle.")
+        parser.add_argument("--lease", type=int, default=settings.OUTBOX_LEASE_SECONDS, help="Seconds a claimed job is reserved.")
+        parser.add_argument("--max-attempts", type=int, default=settings.OUTBOX_MAX_ATTEMPTS)
+        parser.add_argument("--once", action="store_true", help="Run every due job, then exit.")
+        parser.add_argument("--retry-failed", action="store_true", help="Queue jobs that ran out of attempts again, then exit.")
+
+    def handle(self, *args, **options):
+        if options["retry_failed"]:
+            count = OutboxJob.objects(status=OutboxStatus.FAILED.value).update(
+                set__status=OutboxStatus.PENDING.value,
+                set__attempts=0,
+                set__available_at=datetime.utcnow(),
+            )
+            self.stdout.write(f"Requeued {count} failed job(s).")
+            return
+
+        next_sweep = datetime.utcnow()
+        while True:
+            if datetime.utcnow() >= next_sweep:
+                self.requeue_unsettled()
+                next_sweep = datetime.utcnow() + REQUEUE_AFTER
+
+            job = OutboxJob.claim(options["lease"])
+            if job is None:
+                if options["once"]:
+                    return
+                time.sleep(options["poll"])
+                continue
+
+            self.run(job, options["max_attempts"])
+
+    def run(self, job, max_attempts):
+        handler = HANDLERS.get(job.kind)
+        try:
+            if handler is None:
+                raise ValueError(f"No handler for job kind '{job.kind}'.")
+            handler(job)
+            job.complete()
+            self.stdout.write(f"Ran {job.key}.")
+        except Exception as e:
+            if job.retry_later(str(e), max_attempts):
+                self.stderr.write(f"Error running {job.key} (attempt {job.attempts}), will retry: {e}")
+            else:
+                self.stderr.write(f"Error running {job.key}, giving up after {job.attempts} attempts: {e}")
+
+    def requeue_unsettled(self):
+        unsettled = Auction.objects(
+            settled=False,
+            closed_at__lte=datetime.utcnow() - REQUEUE_AFTER,
+        ).scalar("id")
+        for auction_id in unsettled:
+            OutboxJob.enqueue(AUCTION_CLOSED_JOB, f"{AUCTION_CLOSED_JOB}:{auction_id}", {"auction": str(auction_id)})
@@ -0,0 +1,140 @@
+import json
+import random
+from datetime import datetime, timedelta
+from urllib.parse import urlparse
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from mongoengine.connection import get_connection
+from mongoengine.queryset.visitor import Q
+from rest_framework_simplejwt.tokens import RefreshToken
+from api.models.artwork_model.artwork import Art, ArtStatus, ArtVisibility
+from api.models.artwork_model.bid import AUCTION_CLOSED_JOB, Auction, AuctionParticipation, Bid
+from api.models.interaction_model.interaction import Like, View
+from api.models.interaction_model.notification import Notification
+from api.models.interaction_model.timeline import TimelineEntry
+from api.models.jobs_model.outbox import OutboxJob
+from api.models.purchase_model.purchase import Purchase
+from api.models.user_model.users import User
+from api.utils.timeline import TIMELINE_ART_JOB
+
+PREFIX = "loadtest-"
+LOCAL_HOSTS = {"localhost", "127.0.0.1", "::1", "mongo"}
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed bidders, artists and auctions for loadtests/locustfile.py and write "
+        "their ids and access tokens to a fixture file. Local databases only."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--bidders", type=int, default=500)
+        parser.add_argument("--artists", type=int, default=20)
+        parser.add_argument("--auctions", type=int, default=60)
+        parser.add_argument("--hot", type=int, default=3, help="Auctions most bids are aimed at.")
+        parser.add_argument("--expiring", type=int, default=10, help="Auctions that end during the run.")
+        parser.add_argument(
+            "--expire-within",
+            type=int,
+            default=600,
+            help="Seconds over which the expiring auctions' end times are spread.",
+        )
+        parser.add_argument("--out", default="loadtests/fixture.json")
+        parser.add_argument("--flush", action="store_true", help="Only delete previously seeded data.")
+
+    def handle(self, *args, **options):
+        self.ensure_local()
+        self.flush()
+        if options["flush"]:
+            self.stdout.write(self.style.SUCCESS("Removed seeded load-test data."))
+            return
+
+        if options["hot"] + options["expiring"] > options["auctions"]:
+            raise CommandError("--hot plus --expiring cannot exceed --auctions.")
+
+        artists = self.make_users("artist", options["artists"])
+        bidders = self.make_users("bidder", options["bidders"])
+
+        now = datetime.utcnow()
+        auctions = []
+        for index in range(options["auctions"]):
+            artist = artists[index % len(artists)]
+            artwork = Art(
+                title=f"{PREFIX}{index}",
+                artist=artist,
+                price=random.randint(10, 500),
+                art_status=ArtStatus.ON_BID.value,
+                visibility=ArtVisibility.PUBLIC.value,
+                image_url=["https://example.com/loadtest.jpg"],
+            )
+            artwork.save()
+
+            expiring = index < options["expiring"]
+            if expiring:
+                end_time = now + timedelta(seconds=random.randint(60, max(60, options["expire_within"])))
+            else:
+                end_time = now + timedelta(days=random.randint(1, 7))
+            auction = Auction.create_auction(artwork.id, now, end_time, 1)
+            auctions.append({
+                "id": str(auction.id),
+                "artwork_id": str(artwork.id),
+                "artist_id": str(artist.id),
+                "hot": options["expiring"] <= index < options["expiring"] + options["hot"],
+                "expiring": expiring,
+                "end_time": end_time.isoformat() + "Z",
+            })
+
+        fixture = {
+            "seeded_at": now.isoformat() + "Z",
+            "bidders": [self.credentials(user) for user in bidders],
+            "auctions": auctions,
+        }
+        with open(options["out"], "w") as f:
+            json.dump(fixture, f, indent=2)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Seeded {len(bidders)} bidders and {len(auctions)} auctions; fixture written to {options['out']}."
+        ))
+
+    def ensure_local(self):
+        hosts = {host for host, _port in get_connection().topology_description.server_descriptions()}
+        if not hosts or not hosts <= LOCAL_HOSTS:
+            raise CommandError(f"Refusing to seed load-test data into a non-local MongoDB ({', '.join(sorted(map(str, hosts)))}).")
+        if settings.REDIS_URL and urlparse(settings.REDIS_URL).hostname not in LOCAL_HOSTS:
+            raise CommandError("Refusing to run against a non-local Redis.")
+
+    def make_users(self, role, count):
+        users = []
+        for index in range(count):
+            username = f"{PREFIX}{role}-{index}"
+            user = User(username=username, email=f"{username}@example.com", first_name="Load", last_name=f"{role.title()} {index}")
+            user.save()
+            users.append(user)
+        return users
+
+    def credentials(self, user):
+        return {"id": str(user.id), "token": str(RefreshToken.for_user(user).access_token)}
+
+    def flush(self):
+        users = User.objects(username__startswith=PREFIX).only("id")
+        user_ids = [user.id for user in users]
+        artworks = Art.objects(title__startswith=PREFIX).only("id")
+        artwork_ids = [artwork.id for artwork in artworks]
+        auction_ids = [auction.id for auction in Auction.objects(artwork__in=artwork_ids).only("id")]
+
+        # Rows a run leaves behind: bids, closes and their side effects.
+        View.objects(Q(target__in=auction_ids + artwork_ids) | Q(user__in=user_ids)).delete()
+        Like.objects(Q(user__in=user_ids) | Q(art__in=artwork_ids) | Q(auction__in=auction_ids)).delete()
+        Notification.objects(Q(user__in=user_ids) | Q(art__in=artwork_ids) | Q(auction__in=auction_ids)).delete()
+        Purchase.objects(Q(buyer__in=user_ids) | Q(art__in=artwork_ids) | Q(auction__in=auction_ids)).delete()
+        TimelineEntry.objects(Q(owner__in=user_ids) | Q(art__in=artwork_ids)).delete()
+        AuctionParticipation.objects(auction__in=auction_ids).delete()
+        Bid.objects(artwork__in=artwork_ids).delete()
+        Auction.objects(id__in=auction_ids).delete()
+        Art.objects(id__in=artwork_ids).delete()
+        User.objects(id__in=user_ids).delete()
+        # Last, since deleting the artworks queues timeline jobs for them.
+        OutboxJob.objects(
+            Q(kind=AUCTION_CLOSED_JOB, payload__auction__in=[str(auction_id) for auction_id in auction_ids])
+            | Q(kind=TIMELINE_ART_JOB, payload__art__in=[str(artwork_id) for artwork_id in artwork_ids])
+        ).delete()
@@ -0,0 +1,144 @@
+import asyncio
+import statistics
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta
+from channels.layers import get_channel_layer
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+from mongoengine.connection import get_connection
+from api.management.commands.seed_loadtest import LOCAL_HOSTS
+from api.models.artwork_model.artwork import Art, ArtStatus, ArtVisibility
+from api.models.artwork_model.bid import Auction
+from api.models.user_model.users import User
+from api.utils.realtime import auction_event, auction_group, bid_delta
+from backend.routing import websocket_urlpatterns
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure how many watchers one process can stream an auction to. Opens "
+        "in-process WebSocket connections over the in-memory channel layer, "
+        "broadcasts bids and reports fan-out latency per step. Local databases only."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--steps",
+            default="250,500,1000,2000",
+            help="Comma-separated watcher counts to try, in increasing order.",
+        )
+        parser.add_argument("--bids", type=int, default=20, help="Bids broadcast per step.")
+        parser.add_argument(
+            "--budget-ms",
+            type=float,
+            default=250.0,
+            help="p95 fan-out latency a step must stay under to count as sustained.",
+        )
+        parser.add_argument("--connect-batch", type=int, default=100, help="Connections opened concurrently.")
+
+    def handle(self, *args, **options):
+        try:
+            steps = [int(step) for step in options["steps"].split(",")]
+        except ValueError:
+            raise CommandError("--steps must be a comma-separated list of integers.")
+
+        self.ensure_local()
+        artist, artwork, auction = self.make_auction()
+        try:
+            with override_settings(CHANNEL_LAYERS={"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}}):
+                sustained = 0
+                for watchers in steps:
+                    result = asyncio.run(self.run_step(auction, watchers, options))
+                    self.report(watchers, result)
+                    if result["p95_ms"] > options["budget_ms"] or result["dropped"]:
+                        break
+                    sustained = watchers
+        finally:
+            auction.delete()
+            artwork.delete()
+            artist.delete()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Sustained {sustained} watchers with p95 fan-out under {options['budget_ms']:.0f} ms."
+        ))
+
+    def ensure_local(self):
+        # The run writes a user, an artwork and a live auction; keep them out of shared databases.
+        hosts = {host for host, _port in get_connection().topology_description.server_descriptions()}
+        if not hosts or not hosts <= LOCAL_HOSTS:
+            raise CommandError(f"Refusing to create a load-test auction in a non-local MongoDB ({', '.join(sorted(map(str, hosts)))}).")
+
+    def make_auction(self):
+        run = uuid.uuid4().hex[:8]
+        artist = User(username=f"ws-load-{run}", email=f"ws-load-{run}@example.com", first_name="Load", last_name="Test")
+        artist.save()
+        artwork = Art(
+            title=f"WebSocket load test {run}",
+            artist=artist,
+            price=1,
+            art_status=ArtStatus.ON_BID.value,
+            visibility=ArtVisibility.HIDDEN.value,
+        )
+        artwork.save()
+        now = datetime.utcnow()
+        auction = Auction.create_auction(artwork.id, now, now + timedelta(hours=1), 1)
+        return artist, artwork, auction
+
+    async def run_step(self, auction, watchers, options):
+        application = URLRouter(websocket_urlpatterns)
+        channel_layer = get_channel_layer()
+        path = f"/ws/auction/{auction.id}/"
+
+        tracemalloc.start()
+        started = time.monotonic()
+        communicators = []
+        for offset in range(0, watchers, options["connect_batch"]):
+            batch = [
+                WebsocketCommunicator(application, path)
+                for _ in range(min(options["connect_batch"], watchers - offset))
+            ]
+            results = await asyncio.gather(*(communicator.connect() for communicator in batch))
+            if not all(connected for connected, _ in results):
+                raise CommandError("A watcher was refused; does the auction still exist?")
+            await asyncio.gather(*(communicator.receive_json_from() for communicator in batch))
+            communicators.extend(batch)
+        connect_seconds = time.monotonic() - started
+        memory, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        latencies = []
+        dropped = 0
+        for count in range(1, options["bids"] + 1):
+            auction.summary.amount = float(count)
+            auction.summary.bid_count = count
+            sent = time.monotonic()
+            await channel_layer.group_send(auction_group(auction.id), auction_event("auction.bid", bid_delta(auction)))
+            received = await asyncio.gather(
+                *(communicator.receive_json_from(timeout=5) for communicator in communicators),
+                return_exceptions=True,
+            )
+            latencies.append((time.monotonic() - sent) * 1000)
+            dropped += sum(1 for message in received if isinstance(message, Exception))
+
+        await asyncio.gather(*(communicator.disconnect() for communicator in communicators))
+
+        latencies.sort()
+        return {
+            "connect_rate": watchers / connect_seconds if connect_seconds else 0.0,
+            "kb_per_watcher": memory / 1024 / watchers,
+            "p50_ms": statistics.median(latencies),
+            "p95_ms": latencies[int(0.95 * (len(latencies) - 1))],
+            "max_ms": latencies[-1],
+            "dropped": dropped,
+        }
+
+    def report(self, watchers, result):
+        self.stdout.write(
+            f"{watchers:>6} watchers | {result['connect_rate']:8.0f} connects/s | "
+            f"{result['kb_per_watcher']:6.1f} KB/watcher | fan-out p50 {result['p50_ms']:7.1f} ms, "
+            f"p95 {result['p95_ms']:7.1f} ms, max {result['max_ms']:7.1f} ms | dropped {result['dropped']}"
+        )
@@ -1,3 +1,35 @@
+import json
+import logging
+import time
+from collections import Counter
+from contextvars import ContextVar
+from bson import json_util
+from django.conf import settings
+from pymongo import monitoring
+from api.utils.loaders import identity_scope
+
+
+logger = logging.getLogger("api.requests")
+
+_query_log = ContextVar("query_log", default=None)
+
+# Driver bookkeeping that differs between otherwise identical commands.
+VOLATILE_COMMAND_KEYS = {"lsid", "$clusterTime", "$db", "txnNumber", "$readPreference", "cursor"}
+
+
+def query_shape(value):
+    """
+    ``value`` with every scalar replaced by ``"?"`` and every list by its
+    first element's shape: keys and operators stay, values (hashes, OTPs,
+    emails) never reach the log.
+    """
+    if isinstance(value, dict):
+        return {key: query_shape(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [query_shape(value[0])] if value else []
+    return "?"
+
+
 class CrossOriginOpenerPolicyMiddleware:
     def __init__(self, get_response):
         self.get_response = get_response
@@ -6,3 +38,130 @@ class CrossOriginOpenerPolicyMiddleware:
         response = self.get_response(request)
         response['Cross-Origin-Opener-Policy'] = 'same-origin'
         return response
+
+
+class IdentityMapMiddleware:
+    """Scopes the serializers' document identity map to a single request."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with identity_scope():
+            return self.get_response(request)
+
+
+class QueryLog:
+    def __init__(self):
+        self.queries = []
+        self.in_flight = {}
+
+    @property
+    def db_ms(self):
+        return sum(query["ms"] for query in self.queries)
+
+    def duplicates(self):
+        counts = Counter(query["fingerprint"] for query in self.queries)
+        return {fingerprint: count for fingerprint, count in counts.items() if count > 1}
+
+
+class QueryCounterListener(monitoring.CommandListener):
+    """
+    pymongo command listener that records each command into the active
+    request's QueryLog. Commands issued outside a request (heartbeats,
+    management commands) are ignored.
+    """
+
+    def started(self, event):
+        query_log = _query_log.get()
+        if query_log is None:
+            return
+
+        command = event.command
+        name = event.command_name
+        collection = command.get("collection") if name == "getMore" else command.get(name)
+        body = {key: value for key, value in command.items() if key not in VOLATILE_COMMAND_KEYS}
+        query_log.in_flight[(event.connection_id, event.request_id)] = {
+            "command": name,
+            "collection": collection if isinstance(collection, str) else None,
+            # Full values, kept in memory only to spot repeated queries.
+            "fingerprint": json_util.dumps(body, sort_keys=True),
+            "shape": json.dumps(query_shape(body), sort_keys=True),
+        }
+
+    def succeeded(self, event):
+        self._finish(event)
+
+    def failed(self, event):
+        self._finish(event)
+
+    def _finish(self, event):
+        query_log = _query_log.get()
+        if query_log is None:
+            return
+
+        query = query_log.in_flight.pop((event.connection_id, event.request_id), None)
+        if query is not None:
+            query["ms"] = event.duration_micros / 1000
+            query_log.queries.append(query)
+
+
+class QueryCountMiddleware:
+    """
+    Counts the MongoDB commands a request issues and how long they took.
+
+    Adds a ``Server-Timing`` header, logs one JSON line per request to the
+    ``api.requests`` logger and, for requests slower than SLOW_REQUEST_MS,
+    a second line listing every query.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        query_log = QueryLog()
+        token = _query_log.set(query_log)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _query_log.reset(token)
+
+        total_ms = (time.perf_counter() - started) * 1000
+        db_ms = query_log.db_ms
+        duplicates = query_log.duplicates()
+
+        response["Server-Timing"] = (
+            f'db;dur={db_ms:.1f};desc="{len(query_log.queries)} queries", '
+            f"app;dur={max(total_ms - db_ms, 0):.1f}, "
+            f"total;dur={total_ms:.1f}"
+        )
+
+        logger.info(json.dumps({
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "total_ms": round(total_ms, 1),
+            "db_ms": round(db_ms, 1),
+            "queries": len(query_log.queries),
+            "duplicate_queries": sum(count - 1 for count in duplicates.values()),
+        }))
+
+        slow_ms = settings.SLOW_REQUEST_MS
+        if slow_ms and total_ms >= slow_ms:
+            logger.warning(json.dumps({
+                "slow_request": request.path,
+                "total_ms": round(total_ms, 1),
+                "queries": [
+                    {
+                        "command": query["command"],
+                        "collection": query["collection"],
+                        "ms": round(query["ms"], 2),
+                        "repeated": duplicates.get(query["fingerprint"], 1),
+                        "body": query["shape"][:500],
+                    }
+                    for query in query_log.queries
+                ],
+            }))
+
+        return response
@@ -3,9 +3,60 @@ from mongoengine import (
     URLField, ListField, FloatField, DateTimeField
 )
 from datetime import datetime
+from enum import Enum
 from ..user_model.users import User  
 
 
+class ArtStatus(Enum):
+    ACTIVE = "Active"
+    ON_SALE = "onSale"
+    ON_BID = "onBid"
+    SOLD = "Sold"
+    HIDDEN = "Hidden"
+
+
+class ArtVisibility(Enum):
+    PUBLIC = "Public"
+    PRIVATE = "Private"
+    HIDDEN = "Hidden"
+    UNLISTED = "Unlisted"
+    DELETED = "Deleted"
+    ARCHIVED = "Archived"
+
+
+# Spellings found in stored documents that don't fold onto an enum value by case alone.
+ART_STATUS_ALIASES = {
+    "forsale": ArtStatus.ON_SALE,
+}
+
+
+def _fold(value):
+    return "".join(value.split()).replace("_", "").replace("-", "").lower()
+
+
+def normalize_choice(enum_cls, value, aliases=None):
+    """Map stored spellings such as "on Sale" or "public" onto the canonical enum value."""
+    if not isinstance(value, str):
+        return value
+
+    folded = _fold(value)
+    for member in enum_cls:
+        if _fold(member.value) == folded:
+            return member.value
+    if aliases and folded in aliases:
+        return aliases[folded].value
+    return value
+
+
+def normalize_art_status(value):
+    return normalize_choice(ArtStatus, value, ART_STATUS_ALIASES)
+
+
+def normalize_art_visibility(value):
+    return normalize_choice(ArtVisibility, value)
+
+
+
 class ArtReview(Document):
     art = ReferenceField('Art', required=True)
     user = ReferenceField(User, required=True)
@@ -20,7 +71,7 @@ class Art(Document):
     artist = ReferenceField(User, required=True)
     category = StringField(max_length=100)
     medium = StringField(max_length=100)
-    art_status = StringField(max_length=100)
+    art_status = StringField(max_length=100, choices=[status.value for status in ArtStatus])
 
     price = IntField(required=True)
     discounted_price = IntField(required=False, default=None)  
@@ -33,19 +84,34 @@ class Art(Document):
     quantity = IntField(required=False)
 
     visibility = StringField(
-        choices=['Public', 'Private', 'Hidden', 'Unlisted', 'Deleted', 'Archived'],
-        default='Public'
+        choices=[visibility.value for visibility in ArtVisibility],
+        default=ArtVisibility.PUBLIC.value
     )
 
     average_rating = FloatField(default=0.0)
     total_ratings = IntField(default=0)
+    likes_count = IntField(default=0)
 
     created_at = DateTimeField(default=datetime.utcnow)
     updated_at = DateTimeField(default=datetime.utcnow)
 
-    meta = {'collection': 'art'}
+    meta = {
+        'collection': 'art',
+        'indexes': [
+            ('-created_at', '-id'),
+            ('artist', '-created_at', '-id'),
+            ('visibility', 'art_status', '-created_at', '-id'),
+            ('artist', 'art_status', '-created_at', '-id'),
+        ]
+    }
+
+    def clean(self):
+        self.art_status = normalize_art_status(self.art_status)
+        self.visibility = normalize_art_visibility(self.visibility)
 
     def save(self, *args, **kwargs):
+        # Artwork and exhibit detail responses validate on updated_at.
+        self.updated_at = datetime.utcnow()
         print("DEBUG: Saving Art Object =", self.to_json())
         super().save(*args, **kwargs)
         print("DEBUG: Art Saved Successfully")
@@ -1,11 +1,40 @@
-from mongoengine import Document, ReferenceField, FloatField, DateTimeField, BooleanField, ListField,StringField,CASCADE
+from mongoengine import Document, ReferenceField, FloatField, DateTimeField, BooleanField, ListField,StringField,IntField,CASCADE
+from mongoengine import EmbeddedDocument, EmbeddedDocumentField, ObjectIdField
 from datetime import datetime
+from django.conf import settings
+from pymongo import UpdateOne
 from api.models.user_model.users import User
-from api.models.artwork_model.artwork import Art
+from api.models.artwork_model.artwork import Art, ArtStatus
 from enum import Enum
+from bson import ObjectId
 from datetime import datetime
 from django.utils.timesince import timesince
 from mongoengine import DoesNotExist
+from mongoengine.queryset.visitor import Q
+from mongoengine.errors import NotUniqueError
+from api.models.jobs_model.outbox import OutboxJob
+from api.utils.cache_utils import invalidate_tags
+from api.utils.loaders import ref_id, ref_ids
+from api.utils.realtime import broadcast_closed
+
+AUCTION_CLOSED_JOB = "auction_closed"
+# Each retry follows a bid that landed between reading and closing the auction.
+CLOSE_ATTEMPTS = 5
+
+
+def send_once(notification):
+    # Keyed notifications are unique, so a repeated send is a no-op.
+    try:
+        notification.save(force_insert=True)
+    except NotUniqueError:
+        pass
+
+
+def set_art_status(artwork, art_status):
+    artwork.art_status = art_status
+    artwork.save()
+
+
 class Bid(Document):
     bidder = ReferenceField(User, required=True, reverse_delete_rule=2)
     artwork = ReferenceField(Art, required=True, reverse_delete_rule=2)
@@ -17,19 +46,85 @@ class Bid(Document):
         choices=("anonymous", "username", "fullName")
     )
 
+    meta = {
+        'indexes': [
+            ('artwork', '-timestamp', '-id'),
+        ]
+    }
+
+
+def bidder_display_name(user, identity_type):
+    if identity_type == "anonymous":
+        return "Anonymous"
+    if user is None:
+        return "Unknown User"
+    if identity_type == "fullName":
+        full_name = f"{user.first_name or ''} {user.last_name or ''}".strip()
+        return full_name or user.username
+    return user.username
+
+
+class AuctionSummary(EmbeddedDocument):
+    """
+    What cards and lists show about an auction's bids, kept up to date by
+    ``Auction.place_bid`` so they never have to read the bid collection.
+    """
+    amount = FloatField()
+    bidder = ObjectIdField()
+    bidder_name = StringField()
+    bid_count = IntField(default=0)
+    participants = ListField(ObjectIdField(), default=list)
+
+    @classmethod
+    def from_bids(cls, bids):
+        if not bids:
+            return cls()
+        highest = max(bids, key=lambda bid: bid.amount)
+        participants = list(dict.fromkeys(ref_id(bid, "bidder") for bid in bids))
+        return cls(
+            amount=highest.amount,
+            bidder=ref_id(highest, "bidder"),
+            bidder_name=bidder_display_name(User.objects(id=ref_id(highest, "bidder")).first(), highest.identity_type),
+            bid_count=len(bids),
+            participants=participants,
+        )
+
 class AuctionStatus(Enum):
     ON_GOING = "on_going"
     SOLD = "sold"
     CLOSED = "closed"
     NO_BIDDER = "no_bidder"
     RE_AUCTIONED="reauctioned"
+
+
+class BidRejected(Exception):
+    ENDED = "auction_ended"
+    OWN_ARTWORK = "own_artwork"
+    ALREADY_HIGHEST = "already_highest"
+    TOO_LOW = "bid_too_low"
+
+    MESSAGES = {
+        ENDED: "This auction has ended.",
+        OWN_ARTWORK: "You cannot bid on your own artwork.",
+        ALREADY_HIGHEST: "You are currently the highest bidder.",
+        TOO_LOW: "Bid must be higher than the current highest bid.",
+    }
+
+    def __init__(self, reason, highest_amount=None):
+        self.reason = reason
+        self.highest_amount = highest_amount
+        super().__init__(self.MESSAGES[reason])
+
     
 class Auction(Document):
     artwork = ReferenceField(Art, required=True)
+    # Copy of artwork.artist, so feeds can skip blocked artists without loading artworks.
+    artist = ReferenceField(User)
     start_bid_amount = FloatField(required=True, min_value=0.1)
     start_time = DateTimeField(required=True)
     end_time = DateTimeField(required=True)
     highest_bid = ReferenceField(Bid, required=False)
+    summary = EmbeddedDocumentField(AuctionSummary, default=AuctionSummary)
     
     
     status = StringField(
@@ -38,43 +133,227 @@ class Auction(Document):
     )
     
     bid_history = ListField(ReferenceField(Bid))
+    # Legacy; viewers now live in the views collection (manage.py migrate_view_tracking).
     viewed_by = ListField(ReferenceField(User, reverse_delete_rule=CASCADE), default=[])
+    view_count = IntField(default=0)
+    likes_count = IntField(default=0)
+    popularity = FloatField(default=0.0)
+    closed_at = DateTimeField()
+    # False until run_outbox_worker has applied the closing side effects.
+    settled = BooleanField(default=False)
+    updated_at = DateTimeField(default=datetime.utcnow)
 
-    def close_auction(self):
-        from api.models.interaction_model.notification import Notification
-        from django.utils.timezone import now as dj_now
+    meta = {
+        'indexes': [
+            ('status', 'end_time'),
+            ('status', '-popularity', '-id'),
+            ('settled', 'closed_at'),
+        ]
+    }
 
-        if self.status in [AuctionStatus.SOLD.value, AuctionStatus.CLOSED.value, AuctionStatus.NO_BIDDER.value]:
-            return
+    POPULARITY_FIELDS = ("start_time", "end_time", "likes_count", "view_count", "summary")
+
+    def save(self, *args, **kwargs):
+        self.updated_at = datetime.utcnow()
+        return super().save(*args, **kwargs)
+
+    def popularity_score(self, now=None):
+        """
+        Likes and unique viewers, plus how fast bids come in and how close the
+        auction is to closing, weighted by AUCTION_POPULARITY_WEIGHTS.
+        """
+        now = now or datetime.utcnow()
+        weights = settings.AUCTION_POPULARITY_WEIGHTS
+        hours_open = max((now - self.start_time).total_seconds() / 3600, 1.0)
+        hours_left = max((self.end_time - now).total_seconds() / 3600, 0.0)
+        return (
+            weights["like"] * (self.likes_count or 0)
+            + weights["viewer"] * (self.view_count or 0)
+            + weights["bid_rate"] * self.summary.bid_count / hours_open
+            + weights["closing"] / (1.0 + hours_left)
+        )
+
+    @classmethod
+    def refresh_popularity(cls, auction_id):
+        # Called after each like, bid or new viewer of one auction.
+        auction = cls.objects(id=auction_id).only(*cls.POPULARITY_FIELDS).first()
+        if auction is not None:
+            cls.objects(id=auction_id).update_one(set__popularity=auction.popularity_score())
+
+    @classmethod
+    def refresh_popularity_scores(cls, now=None):
+        """Rescore every ongoing auction, so the closing term keeps up with the clock."""
+        now = now or datetime.utcnow()
+        auctions = cls.objects(status=AuctionStatus.ON_GOING.value).only(*cls.POPULARITY_FIELDS).no_cache()
+        operations = [
+            UpdateOne({"_id": auction.id}, {"$set": {"popularity": auction.popularity_score(now)}})
+            for auction in auctions
+        ]
+        if operations:
+            cls._get_collection().bulk_write(operations, ordered=False)
+        return len(operations)
+
+    def rejection_reason(self, bidder, amount, now=None):
+        now = now or datetime.utcnow()
+        if self.status != AuctionStatus.ON_GOING.value or self.end_time <= now:
+            return BidRejected.ENDED
+        if self.summary.bidder == bidder.id:
+            return BidRejected.ALREADY_HIGHEST
+        if self.summary.amount is not None and amount <= self.summary.amount:
+            return BidRejected.TOO_LOW
+        return None
+
+    def sync_summary(self):
+        # Rebuilds the summary of auctions that predate it (or were edited by hand).
+        bid_ids = ref_ids(self, "bid_history")
+        if self.summary.bid_count == len(bid_ids):
+            if not bid_ids:
+                # A bidless auction without a stored summary loads the default
+                # one; store it so filters on summary__ fields match it.
+                Auction.objects(id=self.id, summary__exists=False, bid_history__size=0).update_one(set__summary=AuctionSummary())
+            return self
+        summary = AuctionSummary.from_bids(list(Bid.objects(id__in=bid_ids)))
+        Auction.objects(id=self.id, bid_history__size=len(bid_ids)).update_one(set__summary=summary)
+        self.reload()
+        return self
+
+    def place_bid(self, bidder, amount, identity_type):
+        """
+        Accept ``bidder``'s bid only if it still beats the high bid at write time.
+
+        The bid is recorded with one conditional findAndModify matching on the
+        status, end time and current high amount, so of several concurrent bids
+        at most one can win each level. Raises ``BidRejected`` otherwise.
+        """
+        self.sync_summary()
+        reason = self.rejection_reason(bidder, amount)
+        if reason:
+            raise BidRejected(reason, self.summary.amount)
 
+        # The bid row is only written once it has won, so losing bids never
+        # show up in the bid history.
+        bid_id = ObjectId()
         now = datetime.utcnow()
+        updated = Auction.objects(
+            Q(summary__amount=None) | Q(summary__amount__lt=amount),
+            id=self.id,
+            status=AuctionStatus.ON_GOING.value,
+            end_time__gt=now,
+            summary__bidder__ne=bidder.id,
+        ).modify(
+            new=True,
+            set__highest_bid=bid_id,
+            set__summary__amount=amount,
+            set__summary__bidder=bidder.id,
+            set__summary__bidder_name=bidder_display_name(bidder, identity_type),
+            inc__summary__bid_count=1,
+            add_to_set__summary__participants=bidder.id,
+            set__updated_at=now,
+            push__bid_history=bid_id,
+        )
 
-        try:
-            artwork = self.artwork
-        except DoesNotExist:
-            return
+        if updated is None:
+            # Someone else got in between the check and the write; say why.
+            self.reload()
+            raise BidRejected(self.rejection_reason(bidder, amount, now) or BidRejected.TOO_LOW, self.summary.amount)
 
-        if self.bid_history:
-            highest = max(self.bid_history, key=lambda bid: bid.amount)
-            self.highest_bid = highest
-            self.status = AuctionStatus.SOLD.value
-            self.save()
+        bid = Bid(
+            id=bid_id,
+            bidder=bidder,
+            artwork=ref_id(self, "artwork"),
+            amount=amount,
+            identity_type=identity_type,
+            timestamp=now,
+        )
+        bid.save(force_insert=True)
 
-            artwork.art_status = "Sold"
-            artwork.save()
+        # Refresh this instance from the write without marking anything as changed.
+        self._data.update(updated._data)
+        Auction.objects(id=self.id).update_one(set__popularity=self.popularity_score(now))
+        AuctionParticipation.record_bid(self, bidder, amount, now)
+        return bid
 
-           
-            host = request.get_host()
-            protocol = "http" if "localhost" in host else "https"
-            link = f"/bid/{str(auction.id)}/"
+    def participation_outcome(self, user_id):
+        if self.status == AuctionStatus.ON_GOING.value:
+            return ParticipationOutcome.ACTIVE.value
+        if self.status == AuctionStatus.SOLD.value and self.summary.bidder == user_id:
+            return ParticipationOutcome.WON.value
+        return ParticipationOutcome.LOST.value
+
+    def close_auction(self):
+        """
+        Move an ongoing auction to SOLD or CLOSED, exactly once even when the
+        scheduler and a request race to close it, and queue the side effects
+        (artwork status, purchase, notifications) for run_outbox_worker.
+        Returns whether this call did the closing.
+        """
+        for _ in range(CLOSE_ATTEMPTS):
+            if self.status != AuctionStatus.ON_GOING.value:
+                break
+            self.sync_summary()
+            updates = {"set__closed_at": datetime.utcnow(), "set__settled": False}
+            if self.summary.bid_count:
+                # place_bid keeps highest_bid current, so bid_history is only scanned for old data.
+                highest = self.highest_bid or max(self.bid_history, key=lambda bid: bid.amount)
+                updates.update(set__status=AuctionStatus.SOLD.value, set__highest_bid=highest)
+            else:
+                updates["set__status"] = AuctionStatus.CLOSED.value
+
+            # Conditioned on the bid count so a bid accepted meanwhile is not lost.
+            unchanged = Q(summary__bid_count=self.summary.bid_count)
+            if not self.summary.bid_count:
+                unchanged |= Q(summary__exists=False)
+            closed = Auction.objects(
+                unchanged,
+                id=self.id,
+                status=AuctionStatus.ON_GOING.value,
+            ).modify(new=True, **updates)
+
+            if closed is not None:
+                self._data.update(closed._data)
+                OutboxJob.enqueue(AUCTION_CLOSED_JOB, f"{AUCTION_CLOSED_JOB}:{self.id}", {"auction": str(self.id)})
+                # modify() fires no signals.
+                invalidate_tags(f"auction:{self.id}", "auction:feed")
+                broadcast_closed(self)
+                return True
+
+            current = Auction.objects(id=self.id).first()
+            if current is None:
+                return False
+            self._data.update(current._data)
+        else:
+            print(f"Auction {self.id} still changing after {CLOSE_ATTEMPTS} close attempts; leaving it for the next pass.")
 
-           
-            Notification.objects.create(
-                user=highest.bidder, 
-                actor=artwork.artist,
+        return False
+
+    def settle_close(self, job):
+        """Side effects of close_auction; run by run_outbox_worker, every step safe to repeat."""
+        from api.models.interaction_model.notification import Notification
+        from api.models.purchase_model.purchase import Purchase
+
+        artwork = Art.objects(id=ref_id(self, "artwork")).first()
+        if artwork is not None and self.status == AuctionStatus.SOLD.value:
+            highest = Bid.objects.get(id=ref_id(self, "highest_bid"))
+            bidder = highest.bidder
+            artist = artwork.artist
+            link = f"/bid/{str(self.id)}/"
+
+            job.step("artwork", lambda: set_art_status(artwork, ArtStatus.SOLD.value))
+            job.step("purchase", lambda: Purchase.objects(auction=self.id).update_one(
+                upsert=True,
+                set_on_insert__buyer=bidder.id,
+                set_on_insert__art=artwork.id,
+                set_on_insert__price=highest.amount,
+                set_on_insert__purchased_at=datetime.utcnow(),
+            ))
+            job.step("winner_notification", lambda: send_once(Notification(
+                key=f"{job.key}:winner",
+                user=bidder,
+                actor=artist,
                 message=f" Congratulations! You won the auction for '{artwork.title}' with a bid of ${highest.amount:.2f}.",
                 art=artwork,
-                name=f"{artwork.artist.first_name} {artwork.artist.last_name}",
+                auction=self,
+                name=f"{artist.first_name} {artist.last_name}",
                 action="won the auction",
                 target=artwork.title,
                 icon="🏆",
@@ -82,16 +361,15 @@ class Auction(Document):
                 money=True,
                 donation="Auction",
                 link=link,
-                created_at=dj_now(),
-            )
-
-           
-            Notification.objects.create(
-                user=artwork.artist,  
-                actor=highest.bidder,
-                message=f"Your artwork '{artwork.title}' was sold to {highest.bidder.username} for ${highest.amount:.2f}.",
+            )))
+            job.step("seller_notification", lambda: send_once(Notification(
+                key=f"{job.key}:seller",
+                user=artist,
+                actor=bidder,
+                message=f"Your artwork '{artwork.title}' was sold to {bidder.username} for ${highest.amount:.2f}.",
                 art=artwork,
-                name=f"{highest.bidder.first_name} {highest.bidder.last_name}",
+                auction=self,
+                name=f"{bidder.first_name} {bidder.last_name}",
                 action="bought your artwork",
                 target=artwork.title,
                 icon="🖼️",
@@ -99,25 +377,21 @@ class Auction(Document):
                 money=True,
                 donation="Auction",
                 link=link,
-                created_at=dj_now(),
-            )
-
-        else:
-            self.status = AuctionStatus.CLOSED.value
-            self.save()
-
-            artwork.art_status = "Active"
-            artwork.save()
-
-
-
+            )))
+        elif artwork is not None:
+            job.step("artwork", lambda: set_art_status(artwork, ArtStatus.ACTIVE.value))
 
+        job.step("participation", lambda: AuctionParticipation.record_outcome(self))
+        Auction.objects(id=self.id).update_one(set__settled=True)
+        invalidate_tags(f"auction:{self.id}")
 
     @classmethod
     def create_auction(cls, artwork_id, start_time, end_time, start_bid_amount):
         
+        artwork = Art.objects.get(id=artwork_id)
         auction = cls(
-            artwork=Art.objects.get(id=artwork_id),
+            artwork=artwork,
+            artist=ref_id(artwork, "artist"),
             start_bid_amount=start_bid_amount,
             start_time=start_time,
             end_time=end_time,
@@ -125,3 +399,64 @@ class Auction(Document):
         )
         auction.save()
         return auction
+
+
+class ParticipationOutcome(Enum):
+    ACTIVE = "active"
+    WON = "won"
+    LOST = "lost"
+
+
+class AuctionParticipation(Document):
+    """
+    One row per (user, auction) the user bid on, so "my bids" style lists are
+    an indexed lookup instead of a scan over every auction's bid_history.
+    Written by Auction.place_bid and settled by Auction.close_auction.
+    """
+    user = ReferenceField(User, required=True, reverse_delete_rule=CASCADE)
+    auction = ReferenceField(Auction, required=True, reverse_delete_rule=CASCADE)
+    last_bid_amount = FloatField()
+    last_bid_at = DateTimeField()
+    highest_bid_amount = FloatField()
+    outcome = StringField(
+        choices=[outcome.value for outcome in ParticipationOutcome],
+        default=ParticipationOutcome.ACTIVE.value
+    )
+
+    meta = {
+        'collection': 'auction_participation',
+        'indexes': [
+            {'fields': ['user', 'auction'], 'unique': True},
+            ('user', 'outcome'),
+            'auction',
+        ]
+    }
+
+    @classmethod
+    def record_bid(cls, auction, bidder, amount, at):
+        cls.objects(user=bidder.id, auction=auction.id).update_one(
+            upsert=True,
+            set__last_bid_amount=amount,
+            set__last_bid_at=at,
+            max__highest_bid_amount=amount,
+            set_on_insert__outcome=ParticipationOutcome.ACTIVE.value,
+        )
+
+    @classmethod
+    def record_outcome(cls, auction):
+        if auction.status == AuctionStatus.ON_GOING.value:
+            return
+        winner = auction.summary.bidder if auction.status == AuctionStatus.SOLD.value else None
+        # Losers and the winner are written separately so no row passes through a wrong outcome.
+        if winner:
+            cls.objects(auction=auction.id, user=winner).update_one(set__outcome=ParticipationOutcome.WON.value)
+            cls.objects(auction=auction.id, user__ne=winner).update(set__outcome=ParticipationOutcome.LOST.value)
+        else:
+            cls.objects(auction=auction.id).update(set__outcome=ParticipationOutcome.LOST.value)
+
+    @classmethod
+    def auction_ids(cls, user_id, outcome=None):
+        participations = cls.objects(user=user_id)
+        if outcome:
+            participations = participations.filter(outcome=outcome)
+        return [ref_id(row, "auction") for row in participations.only("auction")]
@@ -0,0 +1,20 @@
+from mongoengine import Document, ReferenceField, IntField, FloatField, DateTimeField
+from datetime import datetime
+from api.models.user_model.users import User
+from api.models.artwork_model.artwork import Art
+
+
+class TrendingArt(Document):
+    # One row per leaderboard slot, rewritten in place by `manage.py refresh_trending`.
+    rank = IntField(required=True, unique=True)
+    art = ReferenceField(Art, required=True)
+    artist = ReferenceField(User)
+    score = FloatField(default=0.0)
+    computed_at = DateTimeField(default=datetime.utcnow)
+
+    meta = {
+        'collection': 'trending_art',
+        'indexes': [
+            ('artist', 'rank'),
+        ]
+    }
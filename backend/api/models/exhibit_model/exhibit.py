@@ -22,10 +22,13 @@ class Exhibit(Document):
     chosen_env = IntField(required=False, null=True)
     created_at = DateTimeField(default=datetime.utcnow)
     updated_at = DateTimeField(default=datetime.utcnow)
+    # Legacy; viewers now live in the views collection (manage.py migrate_view_tracking).
     viewed_by = ListField(ReferenceField(User, reverse_delete_rule=CASCADE), default=[])
+    view_count = IntField(default=0)
+    likes_count = IntField(default=0)
 
     meta = {
         'collection': 'exhibits',
-        'indexes': ['owner', 'visibility', 'start_time']
+        'indexes': ['owner', 'visibility', 'start_time', ('-created_at', '-id')]
     }
 
@@ -1,16 +1,54 @@
-from mongoengine import Document, ReferenceField, DateTimeField
+from mongoengine import Document, ReferenceField, DateTimeField, BooleanField
+from mongoengine import signals
+from mongoengine.errors import NotUniqueError
 from datetime import datetime
 from ..user_model.users import User
+from api.utils.loaders import ref_id
 
 
 class Follower(Document):
     follower = ReferenceField(User, required=True) 
     following = ReferenceField(User, required=True)  
     followed_at = DateTimeField(default=datetime.utcnow)
+    # The followed artist has too many followers to fan out to; their artworks
+    # are read into this follower's home timeline instead.
+    pull = BooleanField(default=False)
 
     meta = {
         'collection': 'followers',
         'indexes': [
             {'fields': ('follower', 'following'), 'unique': True}, 
+            ('follower', 'pull'),
+            ('following', '-followed_at', '-id'),
+            ('follower', '-followed_at', '-id'),
         ]
     }
+
+    @classmethod
+    def follow(cls, follower, following):
+        """Create the follow and bump both users' counters; None if it already existed."""
+        follow = cls(follower=follower, following=following)
+        try:
+            follow.save(force_insert=True)
+        except NotUniqueError:
+            return None
+        cls.bump_counts(follower.id, following.id, 1)
+        return follow
+
+    def unfollow(self):
+        # delete_one rather than delete(), so of two concurrent unfollows only one
+        # sees the row go and decrements the counters.
+        if not Follower._get_collection().delete_one({"_id": self.id}).deleted_count:
+            return False
+        signals.post_delete.send(Follower, document=self)
+        Follower.bump_counts(ref_id(self, "follower"), ref_id(self, "following"), -1)
+        return True
+
+    @staticmethod
+    def bump_counts(follower_id, following_id, delta):
+        User.objects(id=follower_id).update_one(set__graph_changed_at=datetime.utcnow())
+        for user_id, field in ((follower_id, "following_count"), (following_id, "followers_count")):
+            users = User.objects(id=user_id)
+            if delta < 0:
+                users = users.filter(**{f"{field}__gt": 0})
+            users.update_one(**{f"inc__{field}": delta})
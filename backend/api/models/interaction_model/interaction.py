@@ -1,4 +1,4 @@
-from mongoengine import Document, StringField, ReferenceField, IntField, DateTimeField
+from mongoengine import Document, StringField, ReferenceField, IntField, DateTimeField, ObjectIdField
 from datetime import datetime
 from ..user_model.users import User
 from ..artwork_model.artwork import Art
@@ -22,8 +22,31 @@ class Like(Document):
     exhibit=ReferenceField(Exhibit, required=False, null=True)
     created_at = DateTimeField(default=datetime.utcnow)
 
-    meta = {'collection': 'likes'}
+    meta = {
+        'collection': 'likes',
+        'indexes': ['created_at'],
+    }
     
+class View(Document):
+    # One row per signed-in viewer of an auction or exhibit; anonymous
+    # viewers only go into a HyperLogLog sketch (api/utils/view_tracking.py).
+    target = ObjectIdField(required=True)
+    target_type = StringField(required=True, choices=("auction", "exhibit"))
+    user = ReferenceField(User, required=True)
+    # The auction's artwork, so trending can score views per artwork.
+    art = ReferenceField(Art, required=False, null=True)
+    created_at = DateTimeField(default=datetime.utcnow)
+
+    meta = {
+        'collection': 'views',
+        'indexes': [
+            {'fields': ('target', 'user'), 'unique': True},
+            ('target', '-created_at'),
+            ('user', 'target'),
+            ('art', 'created_at'),
+        ]
+    }
+
 class LikeExhibit(Document):
     user = ReferenceField(User)  
     exhibit = ReferenceField(Exhibit) 
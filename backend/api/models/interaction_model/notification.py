@@ -32,6 +32,14 @@ class Notification(Document):
     donation = StringField(required=False)
     money = BooleanField(default=False)
     check = BooleanField(default=False) 
+    # Set on notifications sent by background jobs, so a retried job cannot send one twice.
+    key = StringField(required=False)
 
-    meta = {'collection': 'notifications'}
+    meta = {
+        'collection': 'notifications',
+        'indexes': [
+            ('user', '-created_at', '-id'),
+            {'fields': ['key'], 'unique': True, 'sparse': True},
+        ]
+    }
     
\ No newline at end of file
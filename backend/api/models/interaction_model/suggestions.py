@@ -0,0 +1,48 @@
+from mongoengine import Document, EmbeddedDocument, EmbeddedDocumentField, ListField
+from mongoengine import ObjectIdField, StringField, FloatField, IntField, DateTimeField, BooleanField
+from datetime import datetime
+
+
+class SuggestionReason:
+    MUTUAL_FOLLOWS = "followed_by_people_you_follow"
+    SIMILAR_LIKES = "liked_by_people_with_your_taste"
+    LIKED_WORK = "you_liked_their_work"
+
+
+class SuggestedUser(EmbeddedDocument):
+    # Card fields are copied in so the endpoint serves suggestions in one read.
+    user = ObjectIdField(required=True)
+    username = StringField()
+    first_name = StringField()
+    last_name = StringField()
+    profile_picture = StringField()
+    score = FloatField()
+    reason = StringField()
+    # People the user follows who follow this one.
+    mutual_count = IntField(default=0)
+
+
+class FollowSuggestions(Document):
+    """Top "who to follow" suggestions per user, written by manage.py build_follow_suggestions."""
+
+    user = ObjectIdField(required=True, unique=True)
+    suggestions = ListField(EmbeddedDocumentField(SuggestedUser))
+    computed_at = DateTimeField(default=datetime.utcnow)
+
+    meta = {
+        'collection': 'follow_suggestions',
+        'indexes': ['computed_at'],
+    }
+
+
+class FollowSuggestionRun(Document):
+    # The next incremental run recomputes users whose edges changed after started_at.
+    started_at = DateTimeField(required=True)
+    finished_at = DateTimeField()
+    users_scored = IntField(default=0)
+    full = BooleanField(default=False)
+
+    meta = {
+        'collection': 'follow_suggestion_runs',
+        'indexes': ['-finished_at'],
+    }
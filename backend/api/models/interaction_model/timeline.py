@@ -0,0 +1,26 @@
+from mongoengine import Document, ObjectIdField, DateTimeField
+
+
+class TimelineEntry(Document):
+    """
+    One artwork in a user's home timeline (artworks of the artists they
+    follow), written when the artwork becomes public. Artists with more than
+    TIMELINE_FANOUT_MAX_FOLLOWERS followers are not fanned out; their
+    artworks are merged in when the timeline is read (see api.utils.timeline).
+    """
+
+    owner = ObjectIdField(required=True)
+    art = ObjectIdField(required=True)
+    artist = ObjectIdField(required=True)
+    # The artwork's created_at, which the timeline is ordered by.
+    created_at = DateTimeField(required=True)
+
+    meta = {
+        'collection': 'home_timeline',
+        'indexes': [
+            {'fields': ('owner', 'art'), 'unique': True},
+            ('owner', '-created_at', '-art'),
+            ('owner', 'artist'),
+            'art',
+        ]
+    }
@@ -0,0 +1,130 @@
+from datetime import datetime, timedelta
+from enum import Enum
+from mongoengine import Document, StringField, DictField, IntField, DateTimeField, ListField
+from mongoengine.queryset.visitor import Q
+from django.conf import settings
+
+
+class OutboxStatus(Enum):
+    PENDING = "pending"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class OutboxJob(Document):
+    """
+    Side effects queued by a state change (e.g. an auction closing) and run by
+    manage.py run_outbox_worker. ``key`` makes enqueueing idempotent, and
+    ``done_steps`` lets a retried job skip the steps that already succeeded.
+    """
+
+    key = StringField(required=True, unique=True)
+    kind = StringField(required=True)
+    payload = DictField()
+    status = StringField(
+        choices=[status.value for status in OutboxStatus],
+        default=OutboxStatus.PENDING.value
+    )
+    attempts = IntField(default=0)
+    done_steps = ListField(StringField())
+    available_at = DateTimeField(default=datetime.utcnow)
+    locked_until = DateTimeField()
+    last_error = StringField()
+    # Bumped by rearm, so a run that started before it does not mark the job done.
+    generation = IntField(default=0)
+    created_at = DateTimeField(default=datetime.utcnow)
+    completed_at = DateTimeField()
+
+    meta = {
+        'collection': 'outbox',
+        'indexes': [
+            ('status', 'available_at'),
+            # Finished jobs are only kept for inspection; failed ones stay until retried.
+            {'fields': ['completed_at'], 'expireAfterSeconds': settings.OUTBOX_DONE_RETENTION_SECONDS},
+        ]
+    }
+
+    @classmethod
+    def enqueue(cls, kind, key, payload):
+        now = datetime.utcnow()
+        cls.objects(key=key).update_one(
+            upsert=True,
+            set_on_insert__kind=kind,
+            set_on_insert__payload=payload,
+            set_on_insert__status=OutboxStatus.PENDING.value,
+            set_on_insert__available_at=now,
+            set_on_insert__created_at=now,
+        )
+
+    @classmethod
+    def rearm(cls, kind, key, payload):
+        """
+        Like ``enqueue``, for jobs that reconcile with the current state: one
+        job per key, made due again however often it has already run.
+        """
+        now = datetime.utcnow()
+        cls.objects(key=key).update_one(
+            upsert=True,
+            set_on_insert__kind=kind,
+            set_on_insert__created_at=now,
+            set__payload=payload,
+            set__status=OutboxStatus.PENDING.value,
+            set__available_at=now,
+            set__attempts=0,
+            set__done_steps=[],
+            unset__completed_at=True,
+            unset__last_error=True,
+            inc__generation=1,
+        )
+
+    @classmethod
+    def claim(cls, lease_seconds):
+        """Lease the next due job to this worker; an expired lease makes it claimable again."""
+        now = datetime.utcnow()
+        return cls.objects(
+            Q(locked_until=None) | Q(locked_until__lte=now),
+            status=OutboxStatus.PENDING.value,
+            available_at__lte=now,
+        ).order_by("available_at").modify(
+            set__locked_until=now + timedelta(seconds=lease_seconds),
+            inc__attempts=1,
+            new=True,
+        )
+
+    def step(self, name, action):
+        if name in self.done_steps:
+            return
+        action()
+        OutboxJob.objects(id=self.id).update_one(add_to_set__done_steps=name)
+        self.done_steps.append(name)
+
+    def complete(self):
+        # After a rearm while this ran, leave the job due so it runs again.
+        unchanged = Q(generation=self.generation)
+        if not self.generation:
+            unchanged |= Q(generation__exists=False)
+        done = OutboxJob.objects(unchanged, id=self.id).update_one(
+            set__status=OutboxStatus.DONE.value,
+            set__completed_at=datetime.utcnow(),
+            unset__locked_until=True,
+            unset__last_error=True,
+        )
+        if not done:
+            OutboxJob.objects(id=self.id).update_one(unset__locked_until=True)
+
+    def retry_later(self, error, max_attempts):
+        if self.attempts >= max_attempts:
+            OutboxJob.objects(id=self.id).update_one(
+                set__status=OutboxStatus.FAILED.value,
+                set__last_error=error,
+                unset__locked_until=True,
+            )
+            return False
+
+        backoff = min(5 * 2 ** self.attempts, 600)
+        OutboxJob.objects(id=self.id).update_one(
+            set__available_at=datetime.utcnow() + timedelta(seconds=backoff),
+            set__last_error=error,
+            unset__locked_until=True,
+        )
+        return True
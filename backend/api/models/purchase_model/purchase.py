@@ -2,6 +2,7 @@ from mongoengine import Document, ReferenceField, DateTimeField, FloatField, Boo
 from datetime import datetime
 from ..user_model.users import User
 from ..artwork_model.artwork import Art
+from ..artwork_model.bid import Auction
 
 
 class Purchase(Document):
@@ -9,11 +10,13 @@ class Purchase(Document):
     art = ReferenceField(Art, required=True)      # The artwork purchased
     price = FloatField(required=True)             # Final price at purchase
     purchased_at = DateTimeField(default=datetime.utcnow)
+    auction = ReferenceField(Auction, required=False)  # Set when the artwork was won at auction
 
     meta = {
         'collection': 'purchases',
         'indexes': [
-            ('buyer', 'art')
+            ('buyer', 'art'),
+            'auction',
         ]
     }
     
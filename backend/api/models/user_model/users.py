@@ -1,4 +1,4 @@
-from mongoengine import Document, StringField, DateTimeField, EmailField, IntField, BooleanField,URLField,ListField,ReferenceField
+from mongoengine import Document, StringField, DateTimeField, EmailField, IntField, BooleanField,URLField,ListField,ReferenceField,ObjectIdField
 from datetime import datetime,timedelta
 import bcrypt
 from mongoengine.queryset import Q
@@ -26,7 +26,25 @@ class User(Document):
     gender = StringField(choices=["Male", "Female", "Other"], required=False)  
     date_of_birth = DateTimeField(required=False)  
 
-    blocked_users = ListField(ReferenceField('User'))
+    # Raw ids, so reading them never dereferences; blocked_by is the reverse
+    # relation. Feeds read both through api.utils.blocking.excluded_user_ids.
+    blocked_users = ListField(ObjectIdField())
+    blocked_by = ListField(ObjectIdField())
+
+    # Maintained by Follower.follow / Follower.unfollow (manage.py repair_follow_counts recomputes them).
+    followers_count = IntField(default=0)
+    following_count = IntField(default=0)
+    # Last follow/unfollow by this user; build_follow_suggestions recomputes them after it.
+    graph_changed_at = DateTimeField(required=False)
+
+    meta = {
+        'indexes': ['graph_changed_at'],
+    }
+
+    def save(self, *args, **kwargs):
+        # RetrieveUserView validates on updated_at, so every saved change (admin role and status changes included) has to move it.
+        self.updated_at = datetime.utcnow()
+        return super().save(*args, **kwargs)
     
     def set_password(self, password):
          self.password = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
@@ -1,6 +1,5 @@
 from rest_framework import serializers
 from api.models.artwork_model.artwork import Art
-from api.models.interaction_model.interaction import Like
 from api.models.user_model.users import User
 import traceback
 
@@ -78,13 +77,7 @@ class ArtDetailSerializer(serializers.Serializer):
         return []
 
     def get_likes_count(self, obj):
-        try:
-            return Like.objects.filter(art=obj).count()
-        except Exception as e:
-            print("❌ Error in get_likes_count():", e)
-            import traceback
-            traceback.print_exc()
-            return 0
+        return obj.likes_count or 0
 
     def to_representation(self, instance):
         try:
@@ -1,13 +1,36 @@
 from rest_framework import serializers
-from api.models.artwork_model.artwork import Art
+from api.models.artwork_model.artwork import Art, ArtStatus, ArtVisibility, normalize_art_status, normalize_art_visibility
+from api.models.user_model.users import User
 from datetime import datetime
-from api.models.interaction_model.interaction import Like
 import cloudinary.uploader
 from api.utils.content_moderation import moderate_image
+from api.utils.loaders import identity_scope, load, prime, ref_id
+from api.utils.sparse_fields import SparseFieldsMixin
 from rest_framework.exceptions import ValidationError
 from rest_framework import serializers
 
-class ArtSerializer(serializers.Serializer):
+
+def get_artist_id(art):
+    # Read the raw reference so collecting IDs never dereferences the artist.
+    return ref_id(art, "artist")
+
+
+class ArtListSerializer(serializers.ListSerializer):
+    """Primes the page's artists so they are fetched in one query while rendering the children."""
+
+    def to_representation(self, data):
+        artworks = list(data)
+        with identity_scope():
+            prime(User, [get_artist_id(art) for art in artworks])
+            return [self.child.to_representation(art) for art in artworks]
+
+
+class PrefetchedArtistMixin:
+    def resolve_artist(self, obj):
+        return load(User, get_artist_id(obj))
+
+
+class ArtSerializer(SparseFieldsMixin, PrefetchedArtistMixin, serializers.Serializer):
     id = serializers.CharField(read_only=True)
     title = serializers.CharField(max_length=100)
     artist = serializers.SerializerMethodField()
@@ -39,8 +62,29 @@ class ArtSerializer(serializers.Serializer):
 
     likes_count = serializers.SerializerMethodField()
 
+    field_sources = {
+        "artist_id": ("artist",),
+        "profile_picture": ("artist",),
+    }
+
+    class Meta:
+        list_serializer_class = ArtListSerializer
+
     def get_likes_count(self, obj):
-        return Like.objects.filter(art=obj).count()
+        return obj.likes_count or 0
+
+    def validate_art_status(self, value):
+        # Art.art_status has choices, so an unknown value would fail in save() as a 500.
+        value = normalize_art_status(value)
+        if value not in [status.value for status in ArtStatus]:
+            raise ValidationError(f"Unknown art status '{value}'.")
+        return value
+
+    def validate_visibility(self, value):
+        value = normalize_art_visibility(value)
+        if value not in [visibility.value for visibility in ArtVisibility]:
+            raise ValidationError(f"Unknown visibility '{value}'.")
+        return value
 
     def validate(self, data):
         price = data.get("price")
@@ -108,18 +152,20 @@ class ArtSerializer(serializers.Serializer):
 
 
     def get_artist(self, obj):
-        if obj.artist:
+        artist = self.resolve_artist(obj)
+        if artist:
             return {
-                "id": str(obj.artist.id),
-                "name": f"{obj.artist.first_name} {obj.artist.last_name}",
-                "profile_picture": str(obj.artist.profile_picture)
+                "id": str(artist.id),
+                "name": f"{artist.first_name} {artist.last_name}",
+                "profile_picture": str(artist.profile_picture)
             }
         return None
 
     def to_representation(self, instance):
-        artist_data = self.get_artist(instance) or {}
+        wants_artist = any(self.wants(name) for name in ("artist", "artist_id", "profile_picture"))
+        artist_data = (self.get_artist(instance) if wants_artist else None) or {}
 
-        return {
+        return self.restrict({
             "id": str(instance.id),
             "title": instance.title,
             "artist_id": str(artist_data.get("id", "")),
@@ -139,22 +185,26 @@ class ArtSerializer(serializers.Serializer):
             "likes_count": self.get_likes_count(instance),
             "edition": instance.edition,
             "year_created": instance.year_created,
-        }
+        })
 
 
 
-class LightweightArtSerializer(serializers.Serializer):
+class LightweightArtSerializer(SparseFieldsMixin, PrefetchedArtistMixin, serializers.Serializer):
     id = serializers.CharField(read_only=True)
     title = serializers.CharField()
     artist = serializers.SerializerMethodField()
     image_url = serializers.SerializerMethodField()
     likes_count = serializers.SerializerMethodField()
 
+    class Meta:
+        list_serializer_class = ArtListSerializer
+
     def get_artist(self, obj):
-        if obj.artist:
+        artist = self.resolve_artist(obj)
+        if artist:
             return {
-                "name": f"{obj.artist.first_name} {obj.artist.last_name}",
-                "profile_picture": str(obj.artist.profile_picture or "")
+                "name": f"{artist.first_name} {artist.last_name}",
+                "profile_picture": str(artist.profile_picture or "")
             }
         return {
             "name": "",
@@ -174,9 +224,9 @@ class LightweightArtSerializer(serializers.Serializer):
         return []
 
     def get_likes_count(self, obj):
-        return Like.objects.filter(art=obj).count()
+        return obj.likes_count or 0
 
-class ArtCardSerializer(serializers.Serializer):
+class ArtCardSerializer(SparseFieldsMixin, serializers.Serializer):
     id = serializers.CharField(read_only=True)
     title = serializers.CharField()
     price = serializers.IntegerField()
@@ -188,8 +238,12 @@ class ArtCardSerializer(serializers.Serializer):
     art_status=serializers.SerializerMethodField()
     edition=serializers.SerializerMethodField()
 
+    field_sources = {
+        "total_ratings": ("likes_count",),
+    }
+
     def get_total_ratings(self, obj):
-        return Like.objects.filter(art=obj).count()
+        return obj.likes_count or 0
 
     def get_visibility(self, obj):
         return str(obj.visibility).lower() if hasattr(obj, "visibility") and obj.visibility else ""
@@ -1,30 +1,57 @@
+from django.conf import settings
 from rest_framework import serializers
 from api.models.artwork_model.bid import Bid, Auction
-from api.models.artwork_model.bid import AuctionStatus
+from api.models.artwork_model.bid import AuctionStatus, BidRejected
 from datetime import datetime, timezone
 from api.models.artwork_model.artwork import Art
 from mongoengine.errors import DoesNotExist
 from api.models.interaction_model.interaction import Like
 from api.serializers.artwork_s.artwork_serializers import ArtSerializer
+from api.utils.sparse_fields import SparseFieldsMixin
+from api.utils.cache_utils import invalidate_tags
+from api.utils.realtime import broadcast_bid
+from api.utils.view_tracking import anonymous_view_counts, recent_viewer_ids, viewed_target_ids
 from api.serializers.user_s.users_serializers import UserSerializer
+from api.models.user_model.users import User
+from api.utils.loaders import (
+    identity_scope, load_many, load_reference, load_references, prime, ref_id, ref_ids
+)
+
+
+class BidListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        bids = list(data)
+        with identity_scope():
+            prime(User, [ref_id(bid, "bidder") for bid in bids])
+            return [self.child.to_representation(bid) for bid in bids]
+
 
 class BidSerializer(serializers.Serializer):
-    user = UserSerializer(source="bidder", read_only=True) 
+    user = serializers.SerializerMethodField()
     bidderFullName = serializers.SerializerMethodField()
     artwork_id = serializers.CharField(write_only=True, required=False)
     amount = serializers.FloatField()
     timestamp = serializers.DateTimeField(read_only=True)
     identity_type = serializers.ChoiceField(choices=["anonymous", "username", "fullName"], required=True)
 
+    class Meta:
+        list_serializer_class = BidListSerializer
+
+    def get_user(self, obj):
+        bidder = load_reference(obj, "bidder")
+        return UserSerializer(bidder).data if bidder else None
+
     def get_bidderFullName(self, obj):
         identity = obj.identity_type
         if identity == "anonymous":
             return "Anonymous"
-        elif identity == "username":
-            return getattr(obj.bidder, "username", "Unknown User")
+
+        bidder = load_reference(obj, "bidder")
+        if identity == "username":
+            return getattr(bidder, "username", "Unknown User")
         elif identity == "fullName":
-            full_name = f"{getattr(obj.bidder, 'first_name', '')} {getattr(obj.bidder, 'last_name', '')}".strip()
-            return full_name if full_name else getattr(obj.bidder, "username", "Unknown User")
+            full_name = f"{getattr(bidder, 'first_name', '')} {getattr(bidder, 'last_name', '')}".strip()
+            return full_name if full_name else getattr(bidder, "username", "Unknown User")
         else:
             return "Unknown"
 
@@ -37,130 +64,198 @@ class BidSerializer(serializers.Serializer):
         except DoesNotExist:
             raise serializers.ValidationError({"error": "Artwork not found."})
         
-        if artwork.artist==bidder:
-            raise serializers.ValidationError({"error": "You cannot bid on your own artwork."})
-        
         try:
             auction = Auction.objects.get(artwork=artwork, status=AuctionStatus.ON_GOING.value)
         except DoesNotExist:
-            raise serializers.ValidationError({"error": "Auction not found or has ended."})
+            raise serializers.ValidationError({"error": "Auction not found or has ended.", "reason": BidRejected.ENDED})
+
+        try:
+            if ref_id(artwork, "artist") == bidder.id:
+                raise BidRejected(BidRejected.OWN_ARTWORK)
+            bid = auction.place_bid(bidder, validated_data['amount'], validated_data['identity_type'])
+        except BidRejected as e:
+            if e.reason == BidRejected.ENDED and auction.status == AuctionStatus.ON_GOING.value:
+                auction.close_auction()
+            detail = {"error": str(e), "reason": e.reason}
+            if e.highest_amount is not None:
+                detail["highest_amount"] = e.highest_amount
+            raise serializers.ValidationError(detail)
 
-        auction_end = auction.end_time
-        if auction_end.tzinfo is None or auction_end.tzinfo.utcoffset(auction_end) is None:
-            auction_end = auction_end.replace(tzinfo=timezone.utc)
+        # The auction was updated in place, so no post_save fires for it.
+        invalidate_tags(f"auction:{auction.id}")
+        broadcast_bid(auction)
+        return bid
 
-        now_utc = datetime.now(timezone.utc)
 
-        if auction_end < now_utc:
-            auction.close_auction()
-            raise serializers.ValidationError({"error": "This auction has ended."})
 
-        current_highest_bid = auction.highest_bid
-        new_bid_amount = validated_data['amount']
+VIEWERS_SHOWN = 10
 
-        if current_highest_bid:
-            is_current_bidder_highest = current_highest_bid.bidder == bidder
 
-            if is_current_bidder_highest:
-              
-                raise serializers.ValidationError(
-                    {"error": "You are currently the highest bidder."}
-                )
-            else:
-                
-                if new_bid_amount <= current_highest_bid.amount:
-                    raise serializers.ValidationError(
-                        {"error": "Bid must be higher than the current highest bid."}
-                    )
+def latest_bid_ids(auction, limit):
+    # Accepted bids only ever go up, so the latest ones are also the highest.
+    bid_ids = ref_ids(auction, "bid_history")
+    return bid_ids[-limit:] if limit else []
 
-        
-        bid = Bid.objects.create(
-            bidder=bidder,
-            artwork=auction.artwork,
-            amount=new_bid_amount,
-            identity_type=validated_data['identity_type']
-        )
-        auction.highest_bid = bid
-        auction.bid_history.append(bid)
-        auction.save()
 
-        return bid
+class AuctionListSerializer(serializers.ListSerializer):
+    """Loads artworks, bids and every user they reference in one query per collection."""
+
+    def to_representation(self, data):
+        auctions = list(data)
+        with identity_scope():
+            artworks = load_many(Art, [ref_id(auction, "artwork") for auction in auctions])
+            prime(User, [ref_id(art, "artist") for art in artworks])
+            # Lists only carry each auction's latest bids; the rest is on /bid/history/.
+            self.context.setdefault("bid_history_limit", settings.AUCTION_LIST_BID_HISTORY)
+            limit = self.context["bid_history_limit"]
+            if self.child.wants("highest_bid") or self.child.wants("bid_history"):
+                bids = load_many(Bid, [
+                    bid_id
+                    for auction in auctions
+                    for bid_id in [ref_id(auction, "highest_bid")] + latest_bid_ids(auction, limit)
+                ])
+                prime(User, [ref_id(bid, "bidder") for bid in bids])
+
+            auction_ids = [auction.id for auction in auctions]
+            if self.child.wants("viewers"):
+                recent = recent_viewer_ids(auction_ids, VIEWERS_SHOWN)
+                self.context["recent_viewer_ids"] = recent
+                prime(User, [user_id for user_ids in recent.values() for user_id in user_ids])
+            if self.child.wants("anonymous_views"):
+                self.context["anonymous_views"] = anonymous_view_counts("auction", auction_ids)
+
+            request = self.context.get("request", None)
+            user = getattr(request, "user", None)
+            if user and not user.is_anonymous and self.child.wants("user_has_liked_auction"):
+                liked = Like.objects(user=user, auction__in=auction_ids).only("auction")
+                self.context["liked_auction_ids"] = {ref_id(like, "auction") for like in liked}
+            if self.child.wants("joinedByCurrentUser") or self.child.wants("isLost"):
+                self.context["viewed_auction_ids"] = viewed_target_ids(user, auction_ids)
 
+            return [self.child.to_representation(auction) for auction in auctions]
 
 
-class AuctionSerializer(serializers.Serializer):
+class AuctionSerializer(SparseFieldsMixin, serializers.Serializer):
     id = serializers.CharField()
-    artwork = ArtSerializer(read_only=True)
+    artwork = serializers.SerializerMethodField()
     start_bid_amount = serializers.FloatField()
     start_time = serializers.DateTimeField()
     end_time = serializers.DateTimeField()
-    highest_bid = BidSerializer(read_only=True)
-    bid_history = BidSerializer(read_only=True, many=True)
+    highest_bid = serializers.SerializerMethodField()
+    bid_history = serializers.SerializerMethodField()
+    bid_summary = serializers.SerializerMethodField()
     status = serializers.CharField(read_only=True)
     viewers = serializers.SerializerMethodField()
+    view_count = serializers.IntegerField(read_only=True)
+    anonymous_views = serializers.SerializerMethodField()
     auction_likes_count = serializers.SerializerMethodField()
     user_has_liked_auction = serializers.SerializerMethodField()
-    
+
+    field_sources = {
+        "viewers": (),
+        "anonymous_views": (),
+        "auction_likes_count": ("likes_count",),
+        "user_has_liked_auction": (),
+        "bid_summary": ("summary",),
+        "joinedByCurrentUser": ("summary",),
+        "isHighestBidder": ("summary",),
+        "isLost": ("status", "summary"),
+    }
+
+    # Computed after the declared fields; only emitted when requested.
+    participation_fields = ("joinedByCurrentUser", "isHighestBidder", "isLost")
+
+    class Meta:
+        list_serializer_class = AuctionListSerializer
+
+    def get_artwork(self, obj):
+        artwork = load_reference(obj, "artwork")
+        return ArtSerializer(artwork).data if artwork else None
+
+    def get_highest_bid(self, obj):
+        highest_bid = load_reference(obj, "highest_bid")
+        return BidSerializer(highest_bid).data if highest_bid else None
+
+    def get_bid_history(self, obj):
+        limit = self.context.get("bid_history_limit")
+        if limit is None:
+            return BidSerializer(load_references(obj, "bid_history"), many=True).data
+        return BidSerializer(load_many(Bid, latest_bid_ids(obj, limit)), many=True).data
+
+    def get_bid_summary(self, obj):
+        summary = obj.summary
+        return {
+            "amount": summary.amount,
+            "bidder_id": str(summary.bidder) if summary.bidder else None,
+            "bidder_name": summary.bidder_name,
+            "bid_count": summary.bid_count,
+            "bidder_count": len(summary.participants),
+        }
+
     def get_viewers(self, obj):
-        return [user.username for user in obj.viewed_by]
+        # The latest few signed-in viewers; view_count has the total.
+        recent = self.context.get("recent_viewer_ids")
+        if recent is None:
+            recent = recent_viewer_ids([obj.id], VIEWERS_SHOWN)
+        return [user.username for user in load_many(User, recent.get(obj.id, []))]
+
+    def get_anonymous_views(self, obj):
+        counts = self.context.get("anonymous_views")
+        if counts is None:
+            counts = anonymous_view_counts("auction", [obj.id])
+        return counts.get(obj.id, 0)
     
     def get_auction_likes_count(self, obj):
-        return Like.objects(auction=obj).count() 
+        return obj.likes_count or 0
     
     def get_user_has_liked_auction(self, obj):
     
         request = self.context.get("request", None)
         user = getattr(request, "user", None)
         if user and not user.is_anonymous:
+            liked_auction_ids = self.context.get("liked_auction_ids")
+            if liked_auction_ids is not None:
+                return obj.id in liked_auction_ids
             return Like.objects(user=user, auction=obj).first() is not None
         return False
+
     def to_representation(self, instance):
-        data = super().to_representation(instance)
-        request = self.context.get("request", None)
-        user = getattr(request, "user", None)
+        # A single auction still shares one identity map across its nested serializers.
+        with identity_scope():
+            data = super().to_representation(instance)
+            if not any(self.wants(name) for name in self.participation_fields):
+                return data
 
-        data['artwork'] = ArtSerializer(instance.artwork).data
-        data['highest_bid'] = (
-            BidSerializer(instance.highest_bid).data if instance.highest_bid else None
-        )
-        data['bid_history'] = BidSerializer(instance.bid_history, many=True).data
-        data['viewers'] = [u.username for u in instance.viewed_by]
+            request = self.context.get("request", None)
+            user = getattr(request, "user", None)
 
-        if user and not user.is_anonymous:
-            user_id = str(user.id)
-            username = str(user.username)
-
-            joined_by_bid_history = any(
-                (getattr(bid.bidder, 'id', None) and str(bid.bidder.id) == user_id)
-                or (getattr(bid.bidder, 'username', None) == username)
-                for bid in instance.bid_history
-            )
-
-            joined_by_viewers = username in data['viewers']
-
-            data['joinedByCurrentUser'] = joined_by_bid_history or joined_by_viewers
-
-            data['isHighestBidder'] = (
-                instance.highest_bid and
-                (
-                    (getattr(instance.highest_bid.bidder, 'id', None) and str(instance.highest_bid.bidder.id) == user_id)
-                    or
-                    (getattr(instance.highest_bid.bidder, 'username', None) == username)
-                )
-            )
-
-            data['isLost'] = (
-                instance.status == AuctionStatus.CLOSED.value and
-                data['joinedByCurrentUser'] and
-                not data['isHighestBidder']
-            )
-        else:
-            data['joinedByCurrentUser'] = False
-            data['isHighestBidder'] = False
-            data['isLost'] = False
+            if user and not user.is_anonymous:
+                joined_by_bid_history = user.id in instance.summary.participants
 
-        return data
+                viewed_auction_ids = self.context.get("viewed_auction_ids")
+                if viewed_auction_ids is None:
+                    viewed_auction_ids = viewed_target_ids(user, [instance.id])
+                joined_by_viewers = instance.id in viewed_auction_ids
 
+                joined = joined_by_bid_history or joined_by_viewers
 
+                is_highest_bidder = instance.summary.bidder == user.id
 
+                participation = {
+                    'joinedByCurrentUser': joined,
+                    'isHighestBidder': is_highest_bidder,
+                    'isLost': (
+                        instance.status == AuctionStatus.CLOSED.value and
+                        joined and
+                        not is_highest_bidder
+                    ),
+                }
+            else:
+                participation = {
+                    'joinedByCurrentUser': False,
+                    'isHighestBidder': False,
+                    'isLost': False,
+                }
 
+            data.update(self.restrict(participation))
+            return data
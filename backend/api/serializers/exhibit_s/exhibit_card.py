@@ -6,8 +6,9 @@ from api.models.exhibit_model.exhibit import Exhibit
 from datetime import datetime
 from api.models.interaction_model.interaction import Like
 from api.serializers.artwork_s.artwork_serializers import ArtSerializer
+from api.utils.sparse_fields import SparseFieldsMixin
 
-class ExhibitCardSerializer(serializers.Serializer):
+class ExhibitCardSerializer(SparseFieldsMixin, serializers.Serializer):
     id = serializers.CharField(read_only=True)
     title = serializers.CharField()
     description = serializers.CharField()
@@ -26,6 +27,19 @@ class ExhibitCardSerializer(serializers.Serializer):
     artworks = serializers.SerializerMethodField()  
     slotArtworkMap = serializers.SerializerMethodField()
 
+    field_sources = {
+        "image": ("banner",),
+        "likes": (),
+        "views": ("view_count",),
+        "isSolo": ("exhibit_type",),
+        "isShared": ("exhibit_type",),
+        "startDate": ("start_time",),
+        "endDate": ("end_time",),
+        "exhibit_likes_count": ("likes_count",),
+        "user_has_liked_exhibit": (),
+        "slotArtworkMap": ("artworks",),
+    }
+
     def get_artworks(self, obj):
         from api.models.artwork_model.artwork import Art
         from api.serializers.artwork_s.artwork_serializers import ArtSerializer
@@ -44,7 +58,7 @@ class ExhibitCardSerializer(serializers.Serializer):
         return ArtSerializer(artworks, many=True, context=self.context).data
 
     def get_exhibit_likes_count(self, obj):
-        return Like.objects(exhibit=obj).count()
+        return obj.likes_count or 0
 
     def get_user_has_liked_exhibit(self, obj):
         request = self.context.get("request", None)
@@ -60,7 +74,7 @@ class ExhibitCardSerializer(serializers.Serializer):
         return 1
 
     def get_views(self, obj):
-        return len(obj.viewed_by or [])
+        return obj.view_count or 0
 
     def get_startDate(self, obj):
         return obj.start_time.isoformat() if obj.start_time else None
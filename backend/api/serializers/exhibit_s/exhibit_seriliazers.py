@@ -6,7 +6,9 @@ import cloudinary.uploader
 from datetime import datetime
 from api.models.interaction_model.interaction import Like
 from api.serializers.artwork_s.artwork_serializers import ArtSerializer
-class ExhibitSerializer(serializers.Serializer):
+from api.utils.sparse_fields import SparseFieldsMixin
+
+class ExhibitSerializer(SparseFieldsMixin, serializers.Serializer):
     id = serializers.CharField(read_only=True)
     title = serializers.CharField(max_length=100)
     description = serializers.CharField(required=False, allow_blank=True)
@@ -29,8 +31,13 @@ class ExhibitSerializer(serializers.Serializer):
     exhibit_likes_count = serializers.SerializerMethodField()
     user_has_liked_exhibit = serializers.SerializerMethodField()
 
+    field_sources = {
+        "exhibit_likes_count": ("likes_count",),
+        "user_has_liked_exhibit": (),
+    }
+
     def get_exhibit_likes_count(self, obj):
-        return Like.objects(exhibit=obj).count()
+        return obj.likes_count or 0
 
     def get_user_has_liked_exhibit(self, obj):
         request = self.context.get("request", None)
@@ -94,7 +101,7 @@ class ExhibitSerializer(serializers.Serializer):
         return instance
 
     def to_representation(self, instance):
-        return {
+        return self.restrict({
             "id": str(instance.id),
             "title": instance.title,
             "description": instance.description,
@@ -103,7 +110,10 @@ class ExhibitSerializer(serializers.Serializer):
             "owner": str(instance.owner.id) if instance.owner else None,
             "exhibit_type": instance.exhibit_type,
             "collaborators": [str(u.id) for u in instance.collaborators],
-            "artworks": ArtSerializer(instance.artworks, many=True, context=self.context).data,
+            "artworks": (
+                ArtSerializer(instance.artworks, many=True, context=self.context).data
+                if self.wants("artworks") else []
+            ),
 
             "category": instance.category,
             "visibility": instance.visibility,
@@ -114,6 +124,7 @@ class ExhibitSerializer(serializers.Serializer):
             "updated_at": instance.updated_at,
             "viewed_by": [str(u.id) for u in instance.viewed_by],
             "exhibit_likes_count": self.get_exhibit_likes_count(instance),
-            "user_has_liked_exhibit": self.get_user_has_liked_exhibit(instance),
-
-        }
\ No newline at end of file
+            "user_has_liked_exhibit": (
+                self.get_user_has_liked_exhibit(instance) if self.wants("user_has_liked_exhibit") else False
+            ),
+        })
\ No newline at end of file
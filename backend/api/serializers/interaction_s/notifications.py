@@ -2,12 +2,24 @@ from rest_framework import serializers
 from django.utils.timesince import timesince
 from api.models.interaction_model.notification import Notification
 from api.serializers.user_s.users_serializers import UserSerializer
+from api.models.user_model.users import User
+from api.utils.loaders import identity_scope, load_reference, prime, ref_id
+
+
+class NotificationListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        notifications = list(data)
+        with identity_scope():
+            prime(User, [ref_id(notification, "user") for notification in notifications])
+            prime(User, [ref_id(notification, "actor") for notification in notifications])
+            return [self.child.to_representation(notification) for notification in notifications]
+
 
 class NotificationSerializer(serializers.Serializer):
     id = serializers.CharField(read_only=True)
-    user = UserSerializer(read_only=True)
+    user = serializers.SerializerMethodField()
 
-    actor = UserSerializer(read_only=True) 
+    actor = serializers.SerializerMethodField()
 
     name = serializers.CharField(required=False, allow_blank=True, allow_null=True)
     avatar = serializers.CharField(required=False, allow_blank=True, allow_null=True)
@@ -28,6 +40,17 @@ class NotificationSerializer(serializers.Serializer):
     created_at = serializers.DateTimeField(format="%Y-%m-%d %H:%M:%S", read_only=True)
     time = serializers.SerializerMethodField()
 
+    class Meta:
+        list_serializer_class = NotificationListSerializer
+
+    def get_user(self, obj):
+        user = load_reference(obj, "user")
+        return UserSerializer(user).data if user else None
+
+    def get_actor(self, obj):
+        actor = load_reference(obj, "actor")
+        return UserSerializer(actor).data if actor else None
+
     def get_time(self, obj):
         if obj.created_at:
             return timesince(obj.created_at) + " ago"
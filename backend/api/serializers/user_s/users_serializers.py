@@ -8,8 +8,9 @@ from api.models.user_model.users import User
 from datetime import datetime
 import cloudinary.uploader
 from django.core.exceptions import ValidationError
+from api.utils.sparse_fields import SparseFieldsMixin
 
-class UserSerializer(serializers.Serializer):
+class UserSerializer(SparseFieldsMixin, serializers.Serializer):
     id = serializers.CharField(read_only=True)
     username = serializers.CharField(max_length=150)
     password = serializers.CharField(write_only=True, required=False, allow_null=True)
@@ -146,7 +147,7 @@ class UserSerializer(serializers.Serializer):
 
 
     def to_representation(self, instance):
-        return {
+        return self.restrict({
             "id": str(instance.id),
             "username": instance.username,
             "email": instance.email,
@@ -164,7 +165,20 @@ class UserSerializer(serializers.Serializer):
             "contact_number": instance.contact_number,
             "address": instance.address,
             "blocked_users": [str(user_id) for user_id in getattr(instance, 'blocked_users', [])]
-        }
+        })
+
+class UserCardSerializer(serializers.Serializer):
+    """Compact user for long lists such as followers and following."""
+
+    FIELDS = ("id", "username", "first_name", "last_name", "profile_picture", "followers_count")
+
+    id = serializers.CharField(read_only=True)
+    username = serializers.CharField(read_only=True)
+    first_name = serializers.CharField(read_only=True)
+    last_name = serializers.CharField(read_only=True)
+    profile_picture = serializers.CharField(read_only=True)
+    followers_count = serializers.IntegerField(read_only=True)
+
 
 class ChangePasswordSerializer(serializers.Serializer):
     old_password = serializers.CharField(write_only=True, required=True)
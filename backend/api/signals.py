@@ -31,3 +31,139 @@ def populate_mongo_user(sender, request, user, **kwargs):
 
     except Exception as e:
         print("Error creating user in MongoDB:", e)
+
+
+from mongoengine import signals as mongo_signals
+from api.models.artwork_model.artwork import Art
+from api.models.artwork_model.bid import Auction, AuctionStatus, Bid
+from api.models.artwork_model.trending import TrendingArt
+from api.models.exhibit_model.exhibit import Exhibit
+from api.models.interaction_model.follows import Follower
+from api.models.interaction_model.interaction import Like
+from api.models.jobs_model.outbox import OutboxJob
+from api.utils.cache_utils import invalidate_tags
+from api.utils.loaders import ref_id
+from api.utils.realtime import broadcast_closed, broadcast_sync
+from api.utils.timeline import TIMELINE_ART_JOB, backfill_follow, on_timeline, prune_follow
+
+# Response cache invalidation. Row tags ("art:<id>", "auction:<id>", ...) drop
+# the cached pages a document appears on; feed tags ("art:feed", ...) are only
+# dropped when a save can change which documents a feed lists.
+
+FEED_FIELDS = {
+    Art: ("art_status", "visibility", "artist"),
+    Auction: ("status", "end_time"),
+    Exhibit: ("visibility",),
+}
+
+
+def tag(prefix, doc_id):
+    return f"{prefix}:{doc_id}" if doc_id else None
+
+
+def mark_feed_change(sender, document, created=False, **kwargs):
+    changed = set(document._get_changed_fields())
+    document._feed_changed = created or any(field in changed for field in FEED_FIELDS[sender])
+
+
+def invalidate_art(sender, document, **kwargs):
+    invalidate_tags(
+        tag("art", document.id),
+        tag("artist", ref_id(document, "artist")),
+        "art:feed" if getattr(document, "_feed_changed", True) else None,
+    )
+
+
+def invalidate_auction(sender, document, **kwargs):
+    invalidate_tags(
+        tag("auction", document.id),
+        "auction:feed" if getattr(document, "_feed_changed", True) else None,
+    )
+
+
+def stream_auction_change(sender, document, created=False, **kwargs):
+    if created:
+        return
+    # Changed fields are still set during post_save.
+    changed = set(document._get_changed_fields())
+    if "status" in changed and document.status != AuctionStatus.ON_GOING.value:
+        broadcast_closed(document)
+    elif "end_time" in changed:
+        broadcast_sync(document)
+
+
+def queue_timeline_sync(sender, document, created=False, **kwargs):
+    # Runs for every save that can add an artwork to timelines or take it off them.
+    if created and not on_timeline(document):
+        return
+    if created or getattr(document, "_feed_changed", True):
+        # One job per artwork: sync_art reconciles with its current state, however many saves queued it.
+        OutboxJob.rearm(TIMELINE_ART_JOB, f"{TIMELINE_ART_JOB}:{document.id}", {"art": str(document.id)})
+
+
+def drop_trending(sender, document, **kwargs):
+    # The leaderboard is only rebuilt every refresh, so artworks leave it here at once.
+    if not on_timeline(document):
+        drop_deleted_trending(sender, document)
+
+
+def drop_deleted_trending(sender, document, **kwargs):
+    TrendingArt.objects(art=document.id).delete()
+
+
+def timeline_follow_started(sender, document, created=False, **kwargs):
+    if created:
+        backfill_follow(document)
+
+
+def timeline_follow_ended(sender, document, **kwargs):
+    prune_follow(ref_id(document, "follower"), ref_id(document, "following"))
+
+
+def invalidate_bid(sender, document, **kwargs):
+    # Auction pages are also tagged with their artwork, which is all a bid references.
+    invalidate_tags(tag("art", ref_id(document, "artwork")))
+
+
+def invalidate_exhibit(sender, document, **kwargs):
+    invalidate_tags(
+        tag("exhibit", document.id),
+        "exhibit:feed" if getattr(document, "_feed_changed", True) else None,
+    )
+
+
+def invalidate_like(sender, document, **kwargs):
+    auction_id = ref_id(document, "auction")
+    invalidate_tags(
+        tag("art", ref_id(document, "art")),
+        tag("auction", auction_id),
+        tag("exhibit", ref_id(document, "exhibit")),
+        # Popular auctions are ranked by likes, so any auction like can reorder them.
+        "auction:feed" if auction_id else None,
+    )
+
+
+def invalidate_user(sender, document, **kwargs):
+    invalidate_tags(tag("artist", document.id))
+
+
+for document_cls in FEED_FIELDS:
+    mongo_signals.pre_save_post_validation.connect(mark_feed_change, sender=document_cls)
+
+mongo_signals.post_save.connect(invalidate_art, sender=Art)
+mongo_signals.post_delete.connect(invalidate_art, sender=Art)
+mongo_signals.post_save.connect(invalidate_auction, sender=Auction)
+mongo_signals.post_delete.connect(invalidate_auction, sender=Auction)
+mongo_signals.post_save.connect(stream_auction_change, sender=Auction)
+mongo_signals.post_save.connect(queue_timeline_sync, sender=Art)
+mongo_signals.post_save.connect(drop_trending, sender=Art)
+mongo_signals.post_delete.connect(drop_deleted_trending, sender=Art)
+mongo_signals.post_delete.connect(queue_timeline_sync, sender=Art)
+mongo_signals.post_save.connect(timeline_follow_started, sender=Follower)
+mongo_signals.post_delete.connect(timeline_follow_ended, sender=Follower)
+mongo_signals.post_save.connect(invalidate_bid, sender=Bid)
+mongo_signals.post_save.connect(invalidate_exhibit, sender=Exhibit)
+mongo_signals.post_delete.connect(invalidate_exhibit, sender=Exhibit)
+mongo_signals.post_save.connect(invalidate_like, sender=Like)
+mongo_signals.post_delete.connect(invalidate_like, sender=Like)
+mongo_signals.post_save.connect(invalidate_user, sender=User)
@@ -1,3 +1,133 @@
-from django.test import TestCase
+import os
+import random
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from unittest import SkipTest
+from django.test import SimpleTestCase
+from mongoengine import connect, disconnect
+from mongoengine.connection import get_connection, get_db
+from pymongo.errors import ServerSelectionTimeoutError
+from api.middleware.middleware import QueryCounterListener
+from api.models.artwork_model.artwork import Art, ArtStatus, ArtVisibility
+from api.models.artwork_model.bid import Auction, Bid, BidRejected
+from api.models.user_model.users import User
+from api.utils.loaders import ref_id, ref_ids
 
-# Create your tests here.
+LOCAL_HOSTS = {"localhost", "127.0.0.1", "::1", "mongo"}
+
+
+class MongoTestCase(SimpleTestCase):
+    """
+    Runs against a throwaway database on the configured MongoDB, which must
+    be local; the database is dropped afterwards.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        seeds = list(get_connection().topology_description.server_descriptions())
+        if not seeds or not {host for host, _port in seeds} <= LOCAL_HOSTS:
+            raise SkipTest("MongoDB tests only run against a local server.")
+
+        host, port = seeds[0]
+        disconnect(alias="default")
+        # No database in the URI, so it cannot override the throwaway name.
+        connect(
+            db=f"vags_test_{uuid.uuid4().hex[:8]}",
+            host=f"mongodb://{host}:{port}",
+            alias="default",
+            serverSelectionTimeoutMS=2000,
+        )
+        try:
+            get_connection().admin.command("ping")
+        except ServerSelectionTimeoutError:
+            cls.restore_connection()
+            raise SkipTest(f"No MongoDB server at {host}:{port}.")
+
+    @classmethod
+    def tearDownClass(cls):
+        get_connection().drop_database(get_db().name)
+        cls.restore_connection()
+        super().tearDownClass()
+
+    @classmethod
+    def restore_connection(cls):
+        disconnect(alias="default")
+        connect(
+            db=os.getenv("MONGO_DB_NAME"),
+            host=os.getenv("MONGO_DB_URI"),
+            alias="default",
+            event_listeners=[QueryCounterListener()],
+        )
+
+
+class ConcurrentBidTests(MongoTestCase):
+    BIDDERS = 100
+    ROUNDS = 5
+
+    def setUp(self):
+        self.artist = self.make_user("stress-artist")
+        self.bidders = [self.make_user(f"stress-{i}") for i in range(self.BIDDERS)]
+        artwork = Art(
+            title="Stress test",
+            artist=self.artist,
+            price=1,
+            art_status=ArtStatus.ON_BID.value,
+            visibility=ArtVisibility.HIDDEN.value,
+        )
+        artwork.save()
+        now = datetime.utcnow()
+        self.auction = Auction.create_auction(artwork.id, now, now + timedelta(hours=1), 1)
+
+    def make_user(self, username):
+        username = f"{username}-{uuid.uuid4().hex[:6]}"
+        user = User(username=username, email=f"{username}@example.com", first_name="Stress", last_name="Test")
+        user.save()
+        return user
+
+    def fire(self, bids):
+        start = threading.Barrier(len(bids))
+        counts = {"accepted": 0, "rejected": 0}
+        lock = threading.Lock()
+
+        def place(bidder, amount):
+            auction = Auction.objects.get(id=self.auction.id)
+            start.wait()
+            try:
+                auction.place_bid(bidder, amount, "username")
+                outcome = "accepted"
+            except BidRejected:
+                outcome = "rejected"
+            with lock:
+                counts[outcome] += 1
+
+        # One thread per bid: the barrier releases them all at once.
+        with ThreadPoolExecutor(max_workers=len(bids)) as pool:
+            for future in [pool.submit(place, bidder, amount) for bidder, amount in bids]:
+                future.result()
+        return counts["accepted"], counts["rejected"]
+
+    def test_tied_bids_accept_exactly_one(self):
+        accepted, rejected = self.fire([(bidder, 10.0) for bidder in self.bidders])
+        self.assertEqual(accepted, 1)
+        self.assertEqual(rejected, self.BIDDERS - 1)
+        self.assert_consistent(Auction.objects.get(id=self.auction.id))
+
+    def test_racing_bids_keep_history_increasing(self):
+        for round_no in range(1, self.ROUNDS + 1):
+            floor = 100.0 * round_no
+            self.fire([(bidder, floor + random.randint(0, 50)) for bidder in self.bidders])
+        self.assert_consistent(Auction.objects.get(id=self.auction.id))
+
+    def assert_consistent(self, auction):
+        bid_ids = ref_ids(auction, "bid_history")
+        amounts = {bid.id: bid.amount for bid in Bid.objects(id__in=bid_ids)}
+        ordered = [amounts[bid_id] for bid_id in bid_ids]
+
+        self.assertTrue(all(later > earlier for earlier, later in zip(ordered, ordered[1:])), ordered)
+        self.assertEqual(ref_id(auction, "highest_bid"), bid_ids[-1])
+        self.assertEqual((auction.summary.amount, auction.summary.bid_count), (ordered[-1], len(ordered)))
+        # Rejected bids must not be left behind in the bids collection.
+        self.assertEqual(Bid.objects(artwork=ref_id(auction, "artwork")).count(), len(ordered))
@@ -0,0 +1,53 @@
+from datetime import datetime
+from django.conf import settings
+from api.models.user_model.users import User
+from api.utils.cache_utils import delete_cache_data, get_cached_data, invalidate_tags, set_cache_data, user_tag
+
+NO_ONE = frozenset()
+
+
+def exclusion_key(user_id):
+    return f"user-exclusions:{user_id}"
+
+
+def excluded_user_ids(user):
+    """
+    Ids of the users whose content ``user`` should not see: the ones they
+    blocked and the ones who blocked them. Cached per user (dropped by
+    block/unblock) and kept on the user object for the rest of the request.
+    """
+    if user is None or not user.is_authenticated or getattr(user, "id", None) is None:
+        return NO_ONE
+
+    excluded = getattr(user, "_excluded_user_ids", None)
+    if excluded is not None:
+        return excluded
+
+    key = exclusion_key(user.id)
+    excluded = get_cached_data(key)
+    if excluded is None:
+        row = User.objects(id=user.id).only("blocked_users", "blocked_by").first()
+        excluded = frozenset(row.blocked_users) | frozenset(row.blocked_by) if row else NO_ONE
+        set_cache_data(key, excluded, settings.BLOCKED_USERS_CACHE_TIMEOUT)
+
+    user._excluded_user_ids = excluded
+    return excluded
+
+
+def block(user_id, target_id):
+    User.objects(id=user_id).update_one(add_to_set__blocked_users=target_id, set__updated_at=datetime.utcnow())
+    User.objects(id=target_id).update_one(add_to_set__blocked_by=user_id)
+    forget_exclusions(user_id, target_id)
+
+
+def unblock(user_id, target_id):
+    User.objects(id=user_id).update_one(pull__blocked_users=target_id, set__updated_at=datetime.utcnow())
+    User.objects(id=target_id).update_one(pull__blocked_by=user_id)
+    forget_exclusions(user_id, target_id)
+
+
+def forget_exclusions(*user_ids):
+    for user_id in user_ids:
+        delete_cache_data(exclusion_key(user_id))
+    # Their cached feeds were filtered with the old set.
+    invalidate_tags(*[user_tag(user_id) for user_id in user_ids])
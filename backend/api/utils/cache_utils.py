@@ -1,14 +1,184 @@
+import hashlib
+import time
+import uuid
+from functools import wraps
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.response import Response
+
+
+class ResilientCache:
+    """
+    Routes cache calls to the shared (Redis) cache and falls back to the
+    in-process LRU cache while it is unreachable. After a failure the shared
+    cache is skipped for ``retry_after`` seconds instead of paying a
+    connection timeout on every call.
+
+    Entries written to the fallback are local to one worker process, so they
+    are only as fresh as their timeout once several workers are running.
+    """
+
+    def __init__(self, primary="default", fallback="local", retry_after=30):
+        self.primary = primary
+        self.fallback = fallback
+        self.retry_after = retry_after
+        self.down_until = 0.0
+
+    def _call(self, method, *args, **kwargs):
+        if time.monotonic() >= self.down_until:
+            try:
+                return getattr(caches[self.primary], method)(*args, **kwargs)
+            except Exception as e:
+                print(f"Cache backend '{self.primary}' unavailable, using '{self.fallback}': {e}")
+                self.down_until = time.monotonic() + self.retry_after
+        return getattr(caches[self.fallback], method)(*args, **kwargs)
+
+    def get(self, key, default=None):
+        return self._call("get", key, default)
+
+    def get_many(self, keys):
+        return self._call("get_many", keys)
+
+    def set(self, key, value, timeout):
+        return self._call("set", key, value, timeout)
+
+    def add(self, key, value, timeout):
+        return self._call("add", key, value, timeout)
+
+    def delete(self, key):
+        return self._call("delete", key)
+
+    def delete_many(self, keys):
+        return self._call("delete_many", keys)
+
+
+cache = ResilientCache(retry_after=settings.CACHE_RETRY_AFTER_SECONDS)
 
-from django.core.cache import cache
 
 def get_cached_data(cache_key):
 
     return cache.get(cache_key)
 
 def set_cache_data(cache_key, data, timeout=3600):
-  
+
     cache.set(cache_key, data, timeout)
 
 def delete_cache_data(cache_key):
-  
+
     cache.delete(cache_key)
+
+
+# Tags are versioned rather than indexed: every cached entry remembers the
+# version of each tag it was stored under, and invalidating a tag just drops
+# its version so all entries stored under the old one stop matching.
+
+TAG_PREFIX = "cache-tag:"
+
+
+def tag_key(tag):
+    return f"{TAG_PREFIX}{tag}"
+
+
+def get_tag_versions(tags, create=False):
+    keys = [tag_key(tag) for tag in tags]
+    versions = cache.get_many(keys)
+
+    if create:
+        for key in keys:
+            if key not in versions:
+                version = uuid.uuid4().hex
+                if not cache.add(key, version, settings.CACHE_TAG_TIMEOUT):
+                    # Another worker created it first; use theirs.
+                    version = cache.get(key) or version
+                versions[key] = version
+
+    return {tag: versions.get(tag_key(tag)) for tag in tags}
+
+
+def invalidate_tags(*tags):
+    tags = [tag for tag in tags if tag]
+    if tags:
+        cache.delete_many([tag_key(tag) for tag in tags])
+
+
+def get_tagged(cache_key):
+    entry = cache.get(cache_key)
+    if not entry:
+        return None
+
+    stored = entry["tags"]
+    current = get_tag_versions(list(stored))
+    if any(current[tag] is None or current[tag] != version for tag, version in stored.items()):
+        return None
+    return entry["data"]
+
+
+def set_tagged(cache_key, data, tags, timeout, versions=None):
+    # ``versions`` are ones captured before the data was built, so an
+    # invalidation that happened meanwhile makes the entry stale at once.
+    versions = dict(versions or {})
+    versions.update(get_tag_versions(sorted(set(tags) - set(versions)), create=True))
+    cache.set(cache_key, {"tags": versions, "data": data}, timeout)
+
+
+def user_tag(user_id):
+    # Carried by every per-user response entry of that user.
+    return f"user:{user_id}"
+
+
+def is_per_user(request, per_user):
+    return bool(per_user and request.user and request.user.is_authenticated)
+
+
+def response_cache_key(request, view_name, per_user):
+    if is_per_user(request, per_user):
+        scope = f"user:{request.user.id}"
+    else:
+        scope = "anon"
+    path = hashlib.md5(request.get_full_path().encode("utf-8")).hexdigest()
+    return f"response:{view_name}:{scope}:{path}"
+
+
+def cache_response(timeout=None, tags=(), item_tags=None, per_user=True):
+    """
+    Cache the successful GET responses of an ``APIView`` handler.
+
+    ``tags`` are fixed tags for the endpoint (e.g. ``"art:feed"``) and
+    ``item_tags(item)`` yields extra tags for each row of the response, so
+    that saving one artwork only drops the pages it appears on. With
+    ``per_user`` the entry is keyed by the authenticated user and tagged
+    ``user:<id>``, which keeps blocked-user filtering correct; anonymous
+    visitors share one entry.
+    """
+
+    def decorator(handler):
+        @wraps(handler)
+        def wrapper(view, request, *args, **kwargs):
+            if not settings.RESPONSE_CACHE_ENABLED:
+                return handler(view, request, *args, **kwargs)
+
+            cache_key = response_cache_key(request, type(view).__name__, per_user)
+            data = get_tagged(cache_key)
+            if data is not None:
+                response = Response(data)
+                response["X-Cache"] = "HIT"
+                return response
+
+            static_tags = list(tags)
+            if is_per_user(request, per_user):
+                static_tags.append(user_tag(request.user.id))
+            versions = get_tag_versions(sorted(set(static_tags)), create=True)
+            response = handler(view, request, *args, **kwargs)
+            if response.status_code == 200:
+                entry_tags = list(static_tags)
+                if item_tags:
+                    rows = response.data.get("results", []) if isinstance(response.data, dict) else response.data
+                    for row in rows:
+                        entry_tags.extend(item_tags(row))
+                set_tagged(cache_key, response.data, entry_tags, timeout or settings.RESPONSE_CACHE_TIMEOUT, versions)
+            response["X-Cache"] = "MISS"
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,64 @@
+import hashlib
+from calendar import timegm
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date, parse_etags, parse_http_date_safe
+from rest_framework import status
+from rest_framework.response import Response
+
+
+def make_etag(*parts):
+    digest = hashlib.md5("|".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+    return f'W/"{digest}"'
+
+
+def _opaque(etag):
+    # Weak comparison (RFC 9110 8.8.3.2) ignores the W/ prefix.
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def is_not_modified(request, etag, last_modified):
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match:
+        # When both are sent, If-None-Match wins and If-Modified-Since is ignored.
+        etags = parse_etags(if_none_match)
+        return "*" in etags or any(_opaque(candidate) == _opaque(etag) for candidate in etags)
+
+    if_modified_since = parse_http_date_safe(request.headers.get("If-Modified-Since") or "")
+    if if_modified_since is not None and last_modified is not None:
+        return timegm(last_modified.utctimetuple()) <= if_modified_since
+    return False
+
+
+def conditional_response(request, build, modified=(), version=()):
+    """
+    Answer a detail GET with ``304 Not Modified`` when the client's copy is current.
+
+    ``modified`` are the ``updated_at`` timestamps the payload depends on and
+    ``version`` the counters and states that change without touching them.
+    The ETag also covers the requesting user and the full path, since detail
+    payloads carry per-user flags and honour ``?fields=``. ``build`` is only
+    called, and the payload only serialized, on a miss.
+    """
+    timestamps = [timestamp for timestamp in modified if timestamp is not None]
+    last_modified = max(timestamps) if timestamps else None
+    user_id = request.user.id if request.user and request.user.is_authenticated else "anon"
+    etag = make_etag(
+        request.get_full_path(),
+        user_id,
+        *[timestamp.isoformat() for timestamp in timestamps],
+        *version,
+    )
+
+    if request.method in ("GET", "HEAD") and is_not_modified(request, etag, last_modified):
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        response = build()
+
+    if response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+        response["ETag"] = etag
+        if last_modified is not None:
+            response["Last-Modified"] = http_date(timegm(last_modified.utctimetuple()))
+        # Let browsers keep the copy but revalidate it on every poll.
+        response["Cache-Control"] = "private, no-cache"
+        patch_vary_headers(response, ["Authorization"])
+    return response
@@ -0,0 +1,151 @@
+"""
+Scoring for "who to follow", over sparse matrices of the whole follow and
+like graphs (rows and columns are user indexes):
+
+- follows[u, v] = 1 when u follows v
+- likes[u, a]   = log(1 + artworks of artist a that u liked)
+- colike[a, b]  = users who liked both artists a and b, pruned per row
+
+A candidate v is scored for u from three row-normalised signals:
+two-hop (people u follows who follow v), co-likes (artists liked together with
+the ones u likes) and u's own likes of v's work.
+"""
+import numpy as np
+from scipy import sparse
+from api.models.interaction_model.suggestions import SuggestionReason
+
+REASONS = (SuggestionReason.MUTUAL_FOLLOWS, SuggestionReason.SIMILAR_LIKES, SuggestionReason.LIKED_WORK)
+
+
+def edge_matrix(rows, cols, n, weights=None):
+    rows = np.asarray(rows, dtype=np.int32)
+    cols = np.asarray(cols, dtype=np.int32)
+    data = np.ones(len(rows), dtype=np.float32) if weights is None else np.asarray(weights, dtype=np.float32)
+    matrix = sparse.csr_matrix((data, (rows, cols)), shape=(n, n))
+    matrix.sum_duplicates()
+    return matrix
+
+
+def top_per_row(matrix, n):
+    """Keep the ``n`` largest entries of every row of a CSR matrix."""
+    matrix = matrix.tocsr()
+    indptr, indices, data = [0], [], []
+    for row in range(matrix.shape[0]):
+        start, end = matrix.indptr[row], matrix.indptr[row + 1]
+        row_data = matrix.data[start:end]
+        keep = np.argpartition(row_data, -n)[-n:] if len(row_data) > n else np.arange(len(row_data))
+        indices.append(matrix.indices[start:end][keep])
+        data.append(row_data[keep])
+        indptr.append(indptr[-1] + len(keep))
+    return sparse.csr_matrix(
+        (np.concatenate(data or [[]]).astype(np.float32), np.concatenate(indices or [[]]).astype(np.int32), indptr),
+        shape=matrix.shape,
+    )
+
+
+def normalize_rows(matrix):
+    row_max = matrix.max(axis=1).toarray().ravel()
+    row_max[row_max == 0] = 1
+    return sparse.diags(1 / row_max).dot(matrix).tocsr()
+
+
+class FollowGraph:
+    def __init__(self, n_users, follows, likes, colike_neighbours=50, block_size=2000):
+        """
+        ``follows`` is (follower, followed) index arrays; ``likes`` is
+        (user, artist) index arrays, one pair per liked artwork.
+        """
+        self.n = n_users
+        self.follows = edge_matrix(*follows, n_users)
+        self.follows.data[:] = 1
+
+        self.likes = edge_matrix(*likes, n_users)
+        liked = self.likes.copy()
+        liked.data[:] = 1
+        self.likes.data = np.log1p(self.likes.data)
+        self.colike = self.colike_matrix(liked, colike_neighbours, block_size)
+
+    def colike_matrix(self, liked, neighbours, block_size):
+        # Built a block of artists at a time and pruned to each artist's closest
+        # neighbours, so very popular artists cannot make it dense.
+        liked_t = liked.T.tocsr()
+        artists = np.flatnonzero(np.diff(liked_t.indptr))
+        blocks = []
+        for start in range(0, self.n, block_size):
+            rows = liked_t[start:start + block_size]
+            if not rows.nnz:
+                blocks.append(sparse.csr_matrix(rows.shape, dtype=np.float32))
+                continue
+            block = rows.dot(liked).tocoo()
+            off_diagonal = block.row + start != block.col
+            block = sparse.csr_matrix(
+                (block.data[off_diagonal], (block.row[off_diagonal], block.col[off_diagonal])), shape=block.shape
+            )
+            blocks.append(top_per_row(block, neighbours))
+        self.artist_count = len(artists)
+        return sparse.vstack(blocks).tocsr()
+
+    def score(self, rows, weights, k, excluded=None, candidates=None):
+        """
+        Top ``k`` suggestions for each user index in ``rows``, as a list of
+        ``[(candidate, score, reason, mutual_count), ...]``. ``excluded`` maps a
+        row to extra indexes to skip (e.g. blocks); ``candidates`` is a boolean
+        mask of users that may be suggested at all.
+        """
+        rows = np.asarray(rows, dtype=np.int32)
+        follows = self.follows[rows]
+        likes = self.likes[rows]
+
+        two_hop = follows.dot(self.follows).tocsr()
+        components = [
+            normalize_rows(two_hop),
+            normalize_rows(likes.dot(self.colike)),
+            normalize_rows(likes),
+        ]
+        total = (
+            weights["two_hop"] * components[0]
+            + weights["colike"] * components[1]
+            + weights["liked"] * components[2]
+        ).tocsr()
+
+        chosen = []
+        for i, user in enumerate(rows):
+            start, end = total.indptr[i], total.indptr[i + 1]
+            indices, scores = total.indices[start:end], total.data[start:end]
+
+            skip = np.concatenate([follows.indices[follows.indptr[i]:follows.indptr[i + 1]], [user]])
+            if excluded is not None and excluded.get(user):
+                skip = np.concatenate([skip, list(excluded[user])])
+            keep = ~np.isin(indices, skip)
+            if candidates is not None:
+                keep &= candidates[indices]
+            indices, scores = indices[keep], scores[keep]
+
+            if len(indices) > k:
+                best = np.argpartition(scores, -k)[-k:]
+                indices, scores = indices[best], scores[best]
+            order = np.argsort(-scores, kind="stable")
+            chosen.append((indices[order], scores[order]))
+
+        # Reasons and mutual counts are looked up for the chosen pairs only.
+        pair_rows = np.repeat(np.arange(len(rows)), [len(indices) for indices, _ in chosen])
+        pair_cols = np.concatenate([indices for indices, _ in chosen] or [[]]).astype(np.int32)
+        signals = np.vstack([pair_values(matrix, pair_rows, pair_cols) for matrix in components])
+        mutual = pair_values(two_hop, pair_rows, pair_cols)
+        reasons = signals.argmax(axis=0) if len(pair_cols) else []
+        offsets = np.concatenate([[0], np.cumsum([len(indices) for indices, _ in chosen])])
+
+        results = []
+        for i, (indices, scores) in enumerate(chosen):
+            start = offsets[i]
+            results.append([
+                (int(candidate), float(score), REASONS[reasons[start + j]], int(mutual[start + j]))
+                for j, (candidate, score) in enumerate(zip(indices, scores))
+            ])
+        return results
+
+
+def pair_values(matrix, rows, cols):
+    if not len(rows):
+        return np.zeros(0)
+    return np.asarray(matrix[rows, cols]).ravel()
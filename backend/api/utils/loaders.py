@@ -0,0 +1,119 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from mongoengine import Document
+
+
+_identity_map = ContextVar("identity_map", default=None)
+
+
+def ref_id(document, field):
+    """Return the id stored in a ReferenceField without dereferencing it."""
+    value = document._data.get(field)
+    return getattr(value, "id", value)
+
+
+def ref_ids(document, field):
+    """Same as ``ref_id`` for a ListField of references."""
+    return [getattr(value, "id", value) for value in document._data.get(field) or []]
+
+
+class IdentityMap:
+    """
+    Per-request store of documents keyed by class and id.
+
+    Serializers ``prime`` the ids they are about to need; the first ``load``
+    for a class then fetches every pending id of that class with a single
+    ``id__in`` query, and later lookups are served from memory.
+    """
+
+    def __init__(self):
+        self.documents = {}
+        self.pending = {}
+
+    def prime(self, document_cls, ids):
+        loaded = self.documents.setdefault(document_cls, {})
+        pending = self.pending.setdefault(document_cls, set())
+        pending.update(doc_id for doc_id in ids if doc_id is not None and doc_id not in loaded)
+
+    def add(self, document):
+        self.documents.setdefault(type(document), {})[document.id] = document
+        self.pending.get(type(document), set()).discard(document.id)
+        return document
+
+    def flush(self, document_cls):
+        pending = self.pending.pop(document_cls, None)
+        if not pending:
+            return
+
+        loaded = self.documents.setdefault(document_cls, {})
+        for document in document_cls.objects(id__in=list(pending)):
+            loaded[document.id] = document
+        # Remember misses too, so a dangling reference is not queried again.
+        for doc_id in pending:
+            loaded.setdefault(doc_id, None)
+
+    def load_many(self, document_cls, ids):
+        ids = [doc_id for doc_id in ids if doc_id is not None]
+        self.prime(document_cls, ids)
+        self.flush(document_cls)
+        loaded = self.documents[document_cls]
+        return [loaded[doc_id] for doc_id in ids if loaded.get(doc_id) is not None]
+
+    def load(self, document_cls, doc_id):
+        if doc_id is None:
+            return None
+        self.prime(document_cls, [doc_id])
+        self.flush(document_cls)
+        return self.documents[document_cls].get(doc_id)
+
+
+@contextmanager
+def identity_scope():
+    """Activate an identity map, reusing the enclosing one when already inside a scope."""
+    current = _identity_map.get()
+    if current is not None:
+        yield current
+        return
+
+    token = _identity_map.set(IdentityMap())
+    try:
+        yield _identity_map.get()
+    finally:
+        _identity_map.reset(token)
+
+
+def get_identity_map():
+    # Outside of a scope nothing is shared, so lookups simply aren't cached.
+    return _identity_map.get() or IdentityMap()
+
+
+def prime(document_cls, ids):
+    get_identity_map().prime(document_cls, ids)
+
+
+def load(document_cls, doc_id):
+    return get_identity_map().load(document_cls, doc_id)
+
+
+def load_many(document_cls, ids):
+    return get_identity_map().load_many(document_cls, ids)
+
+
+def load_reference(document, field):
+    # References the caller already dereferenced are reused instead of refetched.
+    value = document._data.get(field)
+    if isinstance(value, Document):
+        return get_identity_map().add(value)
+
+    document_cls = document._fields[field].document_type
+    return load(document_cls, ref_id(document, field))
+
+
+def load_references(document, field):
+    values = document._data.get(field) or []
+    if values and all(isinstance(value, Document) for value in values):
+        identity_map = get_identity_map()
+        return [identity_map.add(value) for value in values]
+
+    document_cls = document._fields[field].field.document_type
+    return load_many(document_cls, ref_ids(document, field))
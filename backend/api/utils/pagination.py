@@ -0,0 +1,148 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from bson import ObjectId
+from django.conf import settings
+from bson.errors import InvalidId
+from mongoengine.queryset.visitor import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class MongoCursorPagination(BasePagination):
+    """
+    Keyset pagination for MongoEngine querysets, newest first.
+
+    Pages are ordered by ``(ordering_field, _id)`` descending and the cursor
+    stores the last row's key, so every page is a range scan on a matching
+    compound index no matter how deep the client goes. Set ``ordering_field``
+    to ``None`` to page on ``_id`` alone (ObjectIds already sort by creation).
+
+    Pagination is opt-in: clients that send neither ``cursor`` nor
+    ``page_size`` still receive the plain list.
+    """
+
+    ordering_field = "created_at"
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    invalid_cursor_message = "Invalid cursor."
+
+    def is_requested(self, request):
+        params = request.query_params
+        return self.cursor_query_param in params or self.page_size_query_param in params
+
+    def get_page_size(self, request):
+        default = settings.API_PAGE_SIZE
+        try:
+            page_size = int(request.query_params.get(self.page_size_query_param, default))
+        except (TypeError, ValueError):
+            return default
+        if page_size <= 0:
+            return default
+        return min(page_size, self.max_page_size)
+
+    def get_ordering(self):
+        if self.ordering_field:
+            return (f"-{self.ordering_field}", "-id")
+        return ("-id",)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not self.is_requested(request):
+            return None
+
+        self.request = request
+        self.page_size = self.get_page_size(request)
+
+        position = self.decode_cursor(request)
+        if position is not None:
+            queryset = queryset.filter(self.after(position))
+
+        rows = list(queryset.order_by(*self.get_ordering()).limit(self.page_size + 1))
+        self.has_next = len(rows) > self.page_size
+        page = rows[:self.page_size]
+
+        self.next_position = self.position_of(page[-1]) if self.has_next else None
+        return page
+
+    def paginate_keys(self, fetch_keys, request):
+        """
+        Always-on pagination for pages that are not a single queryset:
+        ``fetch_keys(position, limit)`` returns up to ``limit`` newest-first
+        ``(value, id)`` keys after ``position``; the page's ids are returned.
+        """
+        self.request = request
+        self.page_size = self.get_page_size(request)
+
+        keys = fetch_keys(self.decode_cursor(request), self.page_size + 1)
+        self.has_next = len(keys) > self.page_size
+        page = keys[:self.page_size]
+
+        self.next_position = page[-1] if self.has_next else None
+        return [key_id for _, key_id in page]
+
+    def after(self, position):
+        value, last_id = position
+        if not self.ordering_field:
+            return Q(id__lt=last_id)
+        return (
+            Q(**{f"{self.ordering_field}__lt": value})
+            | Q(**{self.ordering_field: value, "id__lt": last_id})
+        )
+
+    def position_of(self, instance):
+        value = getattr(instance, self.ordering_field) if self.ordering_field else None
+        return value, instance.id
+
+    def encode_cursor(self, position):
+        value, last_id = position
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        payload = json.dumps({"v": value, "id": str(last_id)}, separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode("ascii")))
+            value = payload["v"]
+            if self.ordering_field and isinstance(value, str):
+                value = datetime.fromisoformat(value)
+            return value, ObjectId(payload["id"])
+        except (binascii.Error, ValueError, KeyError, TypeError, InvalidId):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.page_size_query_param, self.page_size)
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.next_position))
+
+    def get_paginated_response(self, data):
+        return Response({
+            "next": self.get_next_link(),
+            "results": data,
+        })
+
+
+class ObjectIdCursorPagination(MongoCursorPagination):
+    ordering_field = None
+
+
+class TimestampCursorPagination(MongoCursorPagination):
+    ordering_field = "timestamp"
+
+
+class FollowedAtCursorPagination(MongoCursorPagination):
+    ordering_field = "followed_at"
+
+    # Follower lists can be arbitrarily long, so they are always paginated.
+    def is_requested(self, request):
+        return True
@@ -0,0 +1,70 @@
+from datetime import datetime
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+
+# Watchers of an auction share one channel-layer group; every message sent to
+# it is a small delta the client applies to the snapshot it got on connect.
+
+
+def auction_group(auction_id):
+    return f"auction.{auction_id}"
+
+
+def timestamp(value):
+    return value.isoformat() + "Z" if value else None
+
+
+def summary_delta(auction):
+    summary = auction.summary
+    return {
+        "amount": summary.amount,
+        "bidder": str(summary.bidder) if summary.bidder else None,
+        "name": summary.bidder_name,
+        "count": summary.bid_count,
+    }
+
+
+def countdown(auction):
+    # Clients derive the countdown from the server's clock, not their own.
+    return {"end_time": timestamp(auction.end_time), "server_time": timestamp(datetime.utcnow())}
+
+
+def auction_snapshot(auction):
+    return {
+        "type": "snapshot",
+        "auction": str(auction.id),
+        "status": auction.status,
+        **summary_delta(auction),
+        **countdown(auction),
+    }
+
+
+def auction_event(event, payload):
+    return {"type": event, "payload": payload}
+
+
+def broadcast(auction_id, event, payload):
+    channel_layer = get_channel_layer()
+    if channel_layer is None:
+        return
+    try:
+        async_to_sync(channel_layer.group_send)(auction_group(auction_id), auction_event(event, payload))
+    except Exception as e:
+        # Live updates are best effort; the bid or close has already been saved.
+        print(f"Error broadcasting {event} for auction {auction_id}: {e}")
+
+
+def bid_delta(auction):
+    return {"type": "bid", **summary_delta(auction)}
+
+
+def broadcast_bid(auction):
+    broadcast(auction.id, "auction.bid", bid_delta(auction))
+
+
+def broadcast_closed(auction):
+    broadcast(auction.id, "auction.closed", {"type": "closed", "status": auction.status, **summary_delta(auction)})
+
+
+def broadcast_sync(auction):
+    broadcast(auction.id, "auction.sync", {"type": "sync", **countdown(auction)})
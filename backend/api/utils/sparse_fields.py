@@ -0,0 +1,81 @@
+FIELDS_QUERY_PARAM = "fields"
+
+# Loaded even when not requested: cursor pagination reads created_at.
+ALWAYS_LOADED = ("id", "created_at")
+
+
+def requested_fields(request):
+    """Parse ``?fields=a,b`` into a list, or None when the client wants everything."""
+    raw = request.query_params.get(FIELDS_QUERY_PARAM) if request is not None else None
+    if not raw:
+        return None
+    fields = [name.strip() for name in raw.split(",") if name.strip()]
+    return fields or None
+
+
+def projection(document_cls, serializer_cls, fields):
+    names = set(fields) | set(serializer_cls.always_included)
+    sources = set(ALWAYS_LOADED)
+    for name in names:
+        sources.update(serializer_cls.field_sources.get(name, (name,)))
+    return sorted(source for source in sources if source in document_cls._fields)
+
+
+def sparse_only(queryset, serializer_cls, fields, default=(), also=()):
+    """
+    Restrict ``queryset`` to the document fields the requested output fields
+    read, plus ``also``. Without a ``fields`` request the ``default``
+    projection, if any, is kept.
+    """
+    if fields:
+        return queryset.only(*projection(queryset._document, serializer_cls, fields), *also)
+    if default:
+        return queryset.only(*default)
+    return queryset
+
+
+class SparseFieldsMixin:
+    """
+    Serializer mixin limiting the output to ``fields=[...]``; ``id`` is always kept.
+
+    ``field_sources`` maps output fields to the document fields they read when
+    the names differ, so views can project the queryset to match.
+    """
+
+    always_included = ("id",)
+    field_sources = {}
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.sparse_fields = set(fields) | set(self.always_included) if fields else None
+        if self.sparse_fields:
+            for name in list(self.fields):
+                if name not in self.sparse_fields:
+                    self.fields.pop(name)
+
+    def wants(self, name):
+        return self.sparse_fields is None or name in self.sparse_fields
+
+    def restrict(self, data):
+        # For serializers that build their representation by hand.
+        if self.sparse_fields is None:
+            return data
+        return {key: value for key, value in data.items() if key in self.sparse_fields}
+
+
+class SparseFieldsViewMixin:
+    """Generic view mixin wiring ``?fields=`` into the serializer and the queryset projection."""
+
+    def get_sparse_fields(self):
+        return requested_fields(self.request)
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs.setdefault("fields", self.get_sparse_fields())
+        return super().get_serializer(*args, **kwargs)
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        fields = self.get_sparse_fields()
+        if fields and hasattr(queryset, "only"):
+            queryset = sparse_only(queryset, self.get_serializer_class(), fields)
+        return queryset
@@ -0,0 +1,118 @@
+from django.conf import settings
+from mongoengine.queryset.visitor import Q
+from pymongo import UpdateOne
+from api.models.artwork_model.artwork import Art, ArtStatus, ArtVisibility
+from api.models.interaction_model.follows import Follower
+from api.models.interaction_model.timeline import TimelineEntry
+from api.models.user_model.users import User
+from api.utils.loaders import ref_id
+
+FANOUT_BATCH = 1000
+TIMELINE_ART_JOB = "timeline_art"
+
+
+def timeline_artworks(**filters):
+    return Art.objects(visibility=ArtVisibility.PUBLIC.value, art_status=ArtStatus.ACTIVE.value, **filters)
+
+
+def on_timeline(art):
+    return art.visibility == ArtVisibility.PUBLIC.value and art.art_status == ArtStatus.ACTIVE.value
+
+
+def is_pull_artist(artist_id):
+    artist = User.objects(id=artist_id).only("followers_count").first()
+    return artist is not None and artist.followers_count > settings.TIMELINE_FANOUT_MAX_FOLLOWERS
+
+
+def entry(owner_id, art_id, artist_id, created_at):
+    return UpdateOne(
+        {"owner": owner_id, "art": art_id},
+        {"$setOnInsert": {"artist": artist_id, "created_at": created_at}},
+        upsert=True,
+    )
+
+
+def write_entries(ops):
+    if ops:
+        TimelineEntry._get_collection().bulk_write(ops, ordered=False)
+    return len(ops)
+
+
+def fan_out(art):
+    """
+    Write ``art`` into the timeline of everyone following its artist. Returns
+    the number of timelines written, or None when the artist has too many
+    followers and is read at query time instead.
+    """
+    artist_id = ref_id(art, "artist")
+    if is_pull_artist(artist_id):
+        Follower.objects(following=artist_id, pull__ne=True).update(set__pull=True)
+        return None
+
+    written, ops = 0, []
+    for follow in Follower.objects(following=artist_id).only("follower").no_cache():
+        ops.append(entry(ref_id(follow, "follower"), art.id, artist_id, art.created_at))
+        if len(ops) >= FANOUT_BATCH:
+            written += write_entries(ops)
+            ops = []
+    return written + write_entries(ops)
+
+
+def prune_art(art_id):
+    TimelineEntry.objects(art=art_id).delete()
+
+
+def sync_art(art_id):
+    # Reconciles the timelines with the artwork's current state, so jobs may run late or twice.
+    art = Art.objects(id=art_id).only("id", "artist", "visibility", "art_status", "created_at").first()
+    if art is not None and on_timeline(art):
+        return fan_out(art)
+    prune_art(art_id)
+    return 0
+
+
+def backfill_follow(follow):
+    """Add the followed artist's latest artworks to the follower's timeline."""
+    artist_id = ref_id(follow, "following")
+    if is_pull_artist(artist_id):
+        Follower.objects(id=follow.id).update_one(set__pull=True)
+        return 0
+
+    owner_id = ref_id(follow, "follower")
+    artworks = timeline_artworks(artist=artist_id).order_by("-created_at", "-id").only("id", "created_at")
+    return write_entries([
+        entry(owner_id, art.id, artist_id, art.created_at)
+        for art in artworks.limit(settings.TIMELINE_BACKFILL)
+    ])
+
+
+def prune_follow(follower_id, artist_id):
+    TimelineEntry.objects(owner=follower_id, artist=artist_id).delete()
+
+
+def timeline_keys(user_id, position, limit):
+    """
+    Newest-first ``(created_at, art_id)`` keys of the user's home timeline
+    after the cursor ``position``: the fanned-out entries merged with the
+    latest artworks of the pull artists they follow.
+    """
+    entries = TimelineEntry.objects(owner=user_id)
+    if position is not None:
+        created_at, art_id = position
+        entries = entries.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, art__lt=art_id))
+    keys = {
+        (row.created_at, row.art)
+        for row in entries.order_by("-created_at", "-art").only("created_at", "art").limit(limit)
+    }
+
+    pulled = [ref_id(follow, "following") for follow in Follower.objects(follower=user_id, pull=True).only("following")]
+    if pulled:
+        artworks = timeline_artworks(artist__in=pulled)
+        if position is not None:
+            artworks = artworks.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=art_id))
+        keys.update(
+            (art.created_at, art.id)
+            for art in artworks.order_by("-created_at", "-id").only("created_at").limit(limit)
+        )
+
+    return sorted(keys, reverse=True)[:limit]
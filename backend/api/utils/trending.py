@@ -0,0 +1,94 @@
+from datetime import datetime, timedelta
+from django.conf import settings
+from pymongo import UpdateOne
+from api.models.artwork_model.artwork import Art, ArtStatus, ArtVisibility
+from api.models.artwork_model.bid import Bid
+from api.models.artwork_model.trending import TrendingArt
+from api.models.interaction_model.interaction import Like, Saved, View
+
+
+# Events older than this many half-lives contribute less than 1% and are skipped.
+HALF_LIVES_CONSIDERED = 7
+
+
+def decayed_event_scores(document_cls, art_field, time_field, now, half_life):
+    """
+    Sum ``0.5 ** (age / half_life)`` per artwork over one event collection.
+    The decay is evaluated inside MongoDB so only one row per artwork comes back.
+    """
+    art_db_field = document_cls._fields[art_field].db_field
+    time_db_field = document_cls._fields[time_field].db_field
+    half_life_ms = half_life.total_seconds() * 1000
+
+    pipeline = [
+        {"$match": {
+            art_db_field: {"$ne": None},
+            time_db_field: {"$gte": now - half_life * HALF_LIVES_CONSIDERED},
+        }},
+        {"$group": {
+            "_id": f"${art_db_field}",
+            "score": {"$sum": {"$pow": [
+                0.5,
+                {"$divide": [{"$subtract": [now, f"${time_db_field}"]}, half_life_ms]},
+            ]}},
+        }},
+    ]
+    return {row["_id"]: row["score"] for row in document_cls._get_collection().aggregate(pipeline)}
+
+
+def compute_trending_scores(now=None):
+    now = now or datetime.utcnow()
+    half_life = timedelta(hours=settings.TRENDING_HALF_LIFE_HOURS)
+    weights = settings.TRENDING_WEIGHTS
+
+    signals = (
+        (weights["like"], decayed_event_scores(Like, "art", "created_at", now, half_life)),
+        (weights["save"], decayed_event_scores(Saved, "art", "created_at", now, half_life)),
+        (weights["bid"], decayed_event_scores(Bid, "artwork", "timestamp", now, half_life)),
+        (weights["view"], decayed_event_scores(View, "art", "created_at", now, half_life)),
+    )
+
+    scores = {}
+    for weight, per_art in signals:
+        for art_id, value in per_art.items():
+            scores[art_id] = scores.get(art_id, 0.0) + weight * value
+    return scores
+
+
+def refresh_trending(top_k=None, now=None):
+    """Recompute the leaderboard and rewrite ``trending_art``. Returns the number of ranked artworks."""
+    now = now or datetime.utcnow()
+    top_k = top_k or settings.TRENDING_TOP_K
+
+    scores = compute_trending_scores(now)
+    # Over-fetch so that hidden, sold or imageless artworks can be dropped.
+    candidates = sorted(scores, key=scores.get, reverse=True)[:top_k * 4]
+
+    eligible = Art.objects(
+        id__in=candidates,
+        visibility=ArtVisibility.PUBLIC.value,
+        art_status=ArtStatus.ACTIVE.value,
+    ).only("artist", "image_url").no_dereference()
+    eligible = {art.id: art for art in eligible if art.image_url}
+
+    ranked = [art_id for art_id in candidates if art_id in eligible][:top_k]
+
+    operations = [
+        UpdateOne(
+            {"rank": rank},
+            {"$set": {
+                "art": art_id,
+                "artist": eligible[art_id].artist.id if eligible[art_id].artist else None,
+                "score": scores[art_id],
+                "computed_at": now,
+            }},
+            upsert=True,
+        )
+        for rank, art_id in enumerate(ranked, start=1)
+    ]
+
+    collection = TrendingArt._get_collection()
+    if operations:
+        collection.bulk_write(operations, ordered=False)
+    collection.delete_many({"rank": {"$gt": len(ranked)}})
+    return len(ranked)
@@ -0,0 +1,128 @@
+import hashlib
+from django.conf import settings
+from mongoengine.errors import NotUniqueError
+from api.models.artwork_model.bid import Auction
+from api.models.exhibit_model.exhibit import Exhibit
+from api.models.interaction_model.interaction import View
+from api.utils.cache_utils import invalidate_tags
+from api.utils.loaders import ref_id
+
+TARGET_TYPES = {
+    Auction: "auction",
+    Exhibit: "exhibit",
+}
+
+_sketch_client = None
+
+
+def record_view(document, request):
+    """
+    Count ``request``'s user as a viewer of an Auction or Exhibit.
+
+    Signed-in users get one row in ``views`` each; only the first one bumps the
+    document's ``view_count``, with ``$inc``, so repeat views never write the
+    document itself. Anonymous visitors go to the HyperLogLog sketch instead.
+    Returns True for a new unique signed-in viewer.
+    """
+    target_type = TARGET_TYPES[type(document)]
+    user = request.user if request.user and request.user.is_authenticated else None
+    if user is None:
+        add_anonymous_view(target_type, document.id, request)
+        return False
+
+    try:
+        View(
+            target=document.id,
+            target_type=target_type,
+            user=user,
+            art=ref_id(document, "artwork") if target_type == "auction" else None,
+        ).save(force_insert=True)
+    except NotUniqueError:
+        return False
+
+    type(document).objects(id=document.id).update_one(inc__view_count=1)
+    # Keep the instance in step without marking it dirty.
+    document._data["view_count"] = (document.view_count or 0) + 1
+    if target_type == "auction":
+        Auction.refresh_popularity(document.id)
+    invalidate_tags(f"{target_type}:{document.id}")
+    return True
+
+
+def viewed_target_ids(user, target_ids):
+    if not user or user.is_anonymous or not target_ids:
+        return set()
+    return {row.target for row in View.objects(user=user, target__in=list(target_ids)).only("target")}
+
+
+def recent_viewer_ids(target_ids, limit):
+    """Ids of the latest ``limit`` signed-in viewers of each target, newest first."""
+    pipeline = [
+        {"$match": {"target": {"$in": list(target_ids)}}},
+        {"$sort": {"target": 1, "created_at": -1}},
+        {"$group": {"_id": "$target", "users": {"$push": "$user"}}},
+        {"$project": {"users": {"$slice": ["$users", limit]}}},
+    ]
+    return {row["_id"]: row["users"] for row in View._get_collection().aggregate(pipeline)}
+
+
+# Anonymous viewers: one HyperLogLog per target, ~12 KB at most regardless of
+# traffic, with a standard error of 0.81%.
+
+def sketch_key(target_type, target_id):
+    return f"views:anon:{target_type}:{target_id}"
+
+
+def get_sketch_client():
+    global _sketch_client
+    if not settings.VIEW_SKETCH_ENABLED:
+        return None
+    if _sketch_client is None:
+        import redis
+
+        _sketch_client = redis.Redis.from_url(
+            settings.REDIS_URL, socket_connect_timeout=0.5, socket_timeout=0.5
+        )
+    return _sketch_client
+
+
+def client_address(request):
+    proxies = settings.TRUSTED_PROXY_COUNT
+    if proxies:
+        # Each trusted proxy appends the address it saw, so the client is the
+        # entry added by the outermost one; anything left of it is unverified.
+        forwarded = [part.strip() for part in request.META.get("HTTP_X_FORWARDED_FOR", "").split(",") if part.strip()]
+        if len(forwarded) >= proxies:
+            return forwarded[-proxies]
+    return request.META.get("REMOTE_ADDR", "")
+
+
+def visitor_fingerprint(request):
+    address = client_address(request)
+    agent = request.META.get("HTTP_USER_AGENT", "")
+    return hashlib.sha1(f"{address}|{agent}".encode("utf-8")).hexdigest()
+
+
+def add_anonymous_view(target_type, target_id, request):
+    client = get_sketch_client()
+    if client is None:
+        return
+    try:
+        client.pfadd(sketch_key(target_type, target_id), visitor_fingerprint(request))
+    except Exception as e:
+        print(f"Error recording anonymous view of {target_type} {target_id}: {e}")
+
+
+def anonymous_view_counts(target_type, target_ids):
+    client = get_sketch_client()
+    target_ids = list(target_ids)
+    if client is None or not target_ids:
+        return {}
+    try:
+        pipeline = client.pipeline(transaction=False)
+        for target_id in target_ids:
+            pipeline.pfcount(sketch_key(target_type, target_id))
+        return dict(zip(target_ids, pipeline.execute()))
+    except Exception as e:
+        print(f"Error reading anonymous views for {target_type}: {e}")
+        return {}
@@ -3,8 +3,12 @@ from bson.errors import InvalidId
 from rest_framework import generics
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
 from rest_framework.exceptions import NotFound
-from api.models.artwork_model.artwork import Art
+from api.models.artwork_model.artwork import Art, ArtStatus, ArtVisibility
 from api.serializers.artwork_s.artwork_detail_serializer import ArtDetailSerializer
+from api.models.user_model.users import User
+from api.utils.conditional import conditional_response
+from api.utils.loaders import load, ref_id
+from rest_framework.response import Response
 import traceback
 
 class MarketplaceArtDetailView(generics.RetrieveAPIView):
@@ -18,8 +22,8 @@ class MarketplaceArtDetailView(generics.RetrieveAPIView):
         try:
             art = Art.objects.get(
                 id=art_id,
-                art_status="onSale",
-                visibility="Public"
+                art_status=ArtStatus.ON_SALE.value,
+                visibility=ArtVisibility.PUBLIC.value
             )
             print("🟢 Art object found:", art.title)
 
@@ -31,3 +35,14 @@ class MarketplaceArtDetailView(generics.RetrieveAPIView):
             print("🔥 Unexpected error:", e)
             traceback.print_exc()
             raise NotFound("Something went wrong loading artwork.")
+
+    def retrieve(self, request, *args, **kwargs):
+        artwork = self.get_object()
+        artist = load(User, ref_id(artwork, "artist"))
+
+        return conditional_response(
+            request,
+            lambda: Response(self.get_serializer(artwork).data),
+            modified=(artwork.updated_at, getattr(artist, "updated_at", None)),
+            version=(artwork.likes_count,),
+        )
@@ -1,6 +1,7 @@
 from bson import ObjectId
 from rest_framework import generics, permissions
-from api.models.artwork_model.artwork import Art
+from api.models.artwork_model.artwork import Art, ArtStatus, ArtVisibility
+from api.models.artwork_model.trending import TrendingArt
 from api.models.user_model.users import User
 from api.models.interaction_model.notification import Notification
 from api.serializers.artwork_s.artwork_serializers import ArtSerializer
@@ -21,6 +22,12 @@ from rest_framework.response import Response
 from rest_framework.exceptions import PermissionDenied
 from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework.permissions import IsAuthenticated
+from api.utils.pagination import MongoCursorPagination
+from api.utils.cache_utils import cache_response
+from api.utils.sparse_fields import SparseFieldsViewMixin, requested_fields, sparse_only
+from api.utils.conditional import conditional_response
+from api.utils.loaders import load, ref_id
+from api.utils.blocking import excluded_user_ids
 
 class ArtCreateView(generics.ListCreateAPIView):
     queryset = Art.objects.all()
@@ -71,18 +78,17 @@ class SellArtworkView(APIView):
             return Response(ArtSerializer(art).data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-class ArtListView(generics.ListAPIView):
+class ArtListView(SparseFieldsViewMixin, generics.ListAPIView):
     serializer_class = ArtSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
+    pagination_class = MongoCursorPagination
 
     def get_queryset(self):
-        blocked_user_ids = []
-        if self.request.user.is_authenticated and hasattr(self.request.user, 'blocked_users'):
-            blocked_user_ids = [user.id for user in self.request.user.blocked_users]
+        blocked_user_ids = excluded_user_ids(self.request.user)
 
         return Art.objects(
-            visibility__iexact="public",
-            art_status__iexact="active",
+            visibility=ArtVisibility.PUBLIC.value,
+            art_status=ArtStatus.ACTIVE.value,
             artist__nin=blocked_user_ids
         ).order_by('-created_at')
 
@@ -92,26 +98,34 @@ class PopularLightweightArtView(APIView):
 
     def get(self, request):
         try:
-            blocked_user_ids = []
-            if request.user.is_authenticated and hasattr(request.user, 'blocked_users'):
-                blocked_user_ids = [user.id for user in request.user.blocked_users]
+            blocked_user_ids = excluded_user_ids(request.user)
 
  
-            artworks = Art.objects(
-                visibility__iexact="public",
-                art_status__iexact="active",
+            # A few spare rows, in case some artworks left the feed since the last refresh.
+            trending = TrendingArt.objects(
                 artist__nin=blocked_user_ids
-            )
- 
-            artworks = [art for art in artworks if art.image_url and len(art.image_url) > 0]
-     
-            artworks_sorted = sorted(
-                artworks,
-                key=lambda art: Like.objects.filter(art=art).count(),
-                reverse=True
-            )
-
-            top_artworks = artworks_sorted[:5] if artworks_sorted else artworks[:5]
+            ).order_by("rank").limit(10).only("art").no_dereference()
+            art_ids = [entry.art.id for entry in trending]
+
+            if art_ids:
+                artworks_by_id = {
+                    art.id: art
+                    for art in Art.objects(
+                        id__in=art_ids,
+                        visibility=ArtVisibility.PUBLIC.value,
+                        art_status=ArtStatus.ACTIVE.value,
+                        artist__nin=blocked_user_ids,
+                    )
+                }
+                top_artworks = [artworks_by_id[art_id] for art_id in art_ids if art_id in artworks_by_id][:5]
+            else:
+                # The trending job has not run yet: fall back to the most liked artworks.
+                top_artworks = Art.objects(
+                    visibility=ArtVisibility.PUBLIC.value,
+                    art_status=ArtStatus.ACTIVE.value,
+                    artist__nin=blocked_user_ids,
+                    image_url__ne=[],
+                ).order_by("-likes_count", "-created_at").limit(5)
 
             serializer = LightweightArtSerializer(top_artworks, many=True)
             return Response(serializer.data)
@@ -124,19 +138,27 @@ class PopularLightweightArtView(APIView):
 class ArtCardListView(APIView):
     permission_classes = [IsAuthenticatedOrReadOnly]
 
+    @cache_response(tags=["art:feed"], item_tags=lambda row: [f"art:{row['id']}"])
     def get(self, request):
         try:
-            blocked_user_ids = []
-            if request.user.is_authenticated and hasattr(request.user, 'blocked_users'):
-                blocked_user_ids = [user.id for user in request.user.blocked_users]
+            blocked_user_ids = excluded_user_ids(request.user)
 
-            artworks = Art.objects(
-                visibility__iexact="public",
-                art_status__iexact="onSale", 
+            fields = requested_fields(request)
+            artworks = sparse_only(Art.objects(
+                visibility=ArtVisibility.PUBLIC.value,
+                art_status=ArtStatus.ON_SALE.value,
                 artist__nin=blocked_user_ids
-            ).only("title", "price", "discounted_price", "total_ratings", "image_url", "category","edition").order_by("-created_at")
+            ), ArtCardSerializer, fields, default=(
+                "title", "price", "discounted_price", "total_ratings", "likes_count", "image_url", "category","edition", "created_at"
+            )).order_by("-created_at")
+
+            paginator = MongoCursorPagination()
+            page = paginator.paginate_queryset(artworks, request, view=self)
+            if page is not None:
+                serializer = ArtCardSerializer(page, many=True, fields=fields)
+                return paginator.get_paginated_response(serializer.data)
 
-            serializer = ArtCardSerializer(artworks, many=True)
+            serializer = ArtCardSerializer(artworks, many=True, fields=fields)
             return Response(serializer.data)
         except Exception as e:
             return Response({"error": str(e)}, status=500)
@@ -147,17 +169,18 @@ class MyArtCardListView(APIView):
     def get(self, request):
         try:
             user = request.user
+            fields = requested_fields(request)
 
-            artworks = Art.objects(
+            artworks = sparse_only(Art.objects(
                 artist=user.id,
-                visibility__iexact="public",
-                art_status__in=["onSale", "on Sale"]  
-            ).only(
-                "title", "price", "discounted_price", "total_ratings",
+                visibility=ArtVisibility.PUBLIC.value,
+                art_status=ArtStatus.ON_SALE.value
+            ), ArtCardSerializer, fields, default=(
+                "title", "price", "discounted_price", "total_ratings", "likes_count",
                 "image_url", "category", "visibility", "art_status"
-            ).order_by("-created_at")
+            )).order_by("-created_at")
 
-            serializer = ArtCardSerializer(artworks, many=True)
+            serializer = ArtCardSerializer(artworks, many=True, fields=fields)
             return Response(serializer.data, status=200)
         except Exception as e:
             return Response({"error": str(e)}, status=500)
@@ -168,52 +191,51 @@ class UserArtCardListView(APIView):
 
     def get(self, request, user_id):
         try:
-            if request.user.is_authenticated and hasattr(request.user, 'blocked_users'):
-                blocked_user_ids = [user.id for user in request.user.blocked_users]
-                if str(user_id) in [str(uid) for uid in blocked_user_ids]:
-                    return Response([], status=200)
+            if ObjectId.is_valid(user_id) and ObjectId(user_id) in excluded_user_ids(request.user):
+                return Response([], status=200)
 
-            artworks = Art.objects(
+            fields = requested_fields(request)
+            artworks = sparse_only(Art.objects(
                 artist=user_id,
-                visibility__iexact="public",
-                art_status__in=["onSale", "on Sale"] 
-            ).only(
-                "title", "price", "discounted_price", "total_ratings",
+                visibility=ArtVisibility.PUBLIC.value,
+                art_status=ArtStatus.ON_SALE.value
+            ), ArtCardSerializer, fields, default=(
+                "title", "price", "discounted_price", "total_ratings", "likes_count",
                 "image_url", "category", "visibility", "art_status"
-            ).order_by("-created_at")
+            )).order_by("-created_at")
 
-            serializer = ArtCardSerializer(artworks, many=True)
+            serializer = ArtCardSerializer(artworks, many=True, fields=fields)
             return Response(serializer.data, status=200)
         except Exception as e:
             return Response({"error": str(e)}, status=500)
 
 
 
-class ArtBulkListView(generics.ListAPIView):
+class ArtBulkListView(SparseFieldsViewMixin, generics.ListAPIView):
     serializer_class = ArtSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
+    pagination_class = MongoCursorPagination
 
     def get_queryset(self):
-        valid_statuses = ["Active"]
-        blocked_user_ids = []
-        if self.request.user.is_authenticated and hasattr(self.request.user, 'blocked_users'):
-            blocked_user_ids = [user.id for user in self.request.user.blocked_users]
+        valid_statuses = [ArtStatus.ACTIVE.value]
+        blocked_user_ids = excluded_user_ids(self.request.user)
 
         return Art.objects(
-            visibility__iexact="public",
+            visibility=ArtVisibility.PUBLIC.value,
             art_status__in=valid_statuses,
             artist__nin=blocked_user_ids
         ).order_by('-created_at')
 
    
     
-class ArtListViewOwner(generics.ListAPIView):
+class ArtListViewOwner(SparseFieldsViewMixin, generics.ListAPIView):
     serializer_class = ArtSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
+    pagination_class = MongoCursorPagination
 
     def get_queryset(self):
         user_id = self.request.query_params.get('userId', None)
-        valid_statuses = ["Active", "onBid", "Hidden"]
+        valid_statuses = [ArtStatus.ACTIVE.value, ArtStatus.ON_BID.value, ArtStatus.HIDDEN.value]
 
         if user_id:
             try:
@@ -231,14 +253,14 @@ class ArtListViewOwner(generics.ListAPIView):
             ).order_by('-created_at')
 
 
-class ArtListViewSpecificUser(generics.ListAPIView):
+class ArtListViewSpecificUser(SparseFieldsViewMixin, generics.ListAPIView):
     serializer_class = ArtSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
 
     def get_queryset(self):
         user_id = self.request.query_params.get('userId', None)
         print(f"Received userId: {user_id}")
-        valid_statuses = ["Active", "onBid", "Hidden"]
+        valid_statuses = [ArtStatus.ACTIVE.value, ArtStatus.ON_BID.value, ArtStatus.HIDDEN.value]
 
         if user_id:
             try:
@@ -270,7 +292,7 @@ class ArtworksByArtistView(generics.RetrieveAPIView):
 
         return artworks
     
-class ArtDetailView(generics.RetrieveAPIView):
+class ArtDetailView(SparseFieldsViewMixin, generics.RetrieveAPIView):
     serializer_class = ArtSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
 
@@ -278,10 +300,23 @@ class ArtDetailView(generics.RetrieveAPIView):
     
         art_id = self.kwargs.get('pk')
         try:
-            return Art.objects.get(id=art_id)
+            return sparse_only(
+                Art.objects, ArtSerializer, self.get_sparse_fields(), also=("updated_at", "likes_count")
+            ).get(id=art_id)
         except Art.DoesNotExist:
             raise Http404("Artwork not found")
 
+    def retrieve(self, request, *args, **kwargs):
+        artwork = self.get_object()
+        artist = load(User, ref_id(artwork, "artist"))
+
+        return conditional_response(
+            request,
+            lambda: Response(self.get_serializer(artwork).data),
+            modified=(artwork.updated_at, getattr(artist, "updated_at", None)),
+            version=(artwork.likes_count,),
+        )
+
 
 class MarketplaceArtDetailView(generics.RetrieveAPIView):
     serializer_class = ArtDetailSerializer
@@ -290,7 +325,7 @@ class MarketplaceArtDetailView(generics.RetrieveAPIView):
     def get_object(self):
         art_id = self.kwargs.get('pk')
         try:
-            return Art.objects.get(id=art_id, art_status="For Sale", visibility="Public")
+            return Art.objects.get(id=art_id, art_status=ArtStatus.ON_SALE.value, visibility=ArtVisibility.PUBLIC.value)
         except Art.DoesNotExist:
             raise NotFound("Artwork not found or not available for sale.")
 
@@ -318,6 +353,7 @@ class BulkArtDetailView(APIView):
 class ArtListByArtistView(generics.ListAPIView):
     serializer_class = ArtSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
+    pagination_class = MongoCursorPagination
 
     def get_queryset(self):
         artist_id = self.kwargs.get("artist_id") 
@@ -362,7 +398,7 @@ class HideArtworkView(APIView):
         except Art.DoesNotExist:
             raise Http404("Artwork not found")
 
-        artwork.visibility = "Hidden"
+        artwork.visibility = ArtVisibility.HIDDEN.value
         artwork.updated_at = datetime.utcnow()
         artwork.save()
 
@@ -377,7 +413,7 @@ class UnHideArtworkView(APIView):
         except Art.DoesNotExist:
             raise Http404("Artwork not found")
 
-        artwork.visibility = "Public"
+        artwork.visibility = ArtVisibility.PUBLIC.value
         artwork.updated_at = datetime.utcnow()
         artwork.save()
 
@@ -392,8 +428,8 @@ class DeleteArtwork(APIView):
         except Art.DoesNotExist:
             raise Http404("Artwork not found")
 
-        artwork.art_status = "Active"
-        artwork.visibility = "Deleted"
+        artwork.art_status = ArtStatus.ACTIVE.value
+        artwork.visibility = ArtVisibility.DELETED.value
         artwork.updated_at = datetime.utcnow()
         artwork.save()
 
@@ -408,8 +444,8 @@ class RestoreArtwork(APIView):
         except Art.DoesNotExist:
             raise Http404("Artwork not found")
 
-        artwork.art_status = "Active"
-        artwork.visibility = "Public"
+        artwork.art_status = ArtStatus.ACTIVE.value
+        artwork.visibility = ArtVisibility.PUBLIC.value
         artwork.updated_at = datetime.utcnow()
         artwork.save()
 
@@ -438,8 +474,8 @@ class ArchivedArtwork(APIView):
         except Art.DoesNotExist:
             raise Http404("Artwork not found")
 
-        artwork.art_status = "Active"
-        artwork.visibility = "Archived"
+        artwork.art_status = ArtStatus.ACTIVE.value
+        artwork.visibility = ArtVisibility.ARCHIVED.value
         artwork.updated_at = datetime.utcnow()
         artwork.save()
 
@@ -454,8 +490,8 @@ class UnArchivedArtwork(APIView):
         except Art.DoesNotExist:
             raise Http404("Artwork not found")
 
-        artwork.art_status = "Active"
-        artwork.visibility = "Public"
+        artwork.art_status = ArtStatus.ACTIVE.value
+        artwork.visibility = ArtVisibility.PUBLIC.value
         artwork.updated_at = datetime.utcnow()
         artwork.save()
 
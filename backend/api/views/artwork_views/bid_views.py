@@ -3,9 +3,9 @@ from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
 from rest_framework import status
 from api.models.artwork_model.bid import Bid, Auction
-from api.models.artwork_model.bid import AuctionStatus
+from api.models.artwork_model.bid import AuctionStatus, AuctionParticipation, ParticipationOutcome
 from api.models.interaction_model.interaction import Like
-from api.models.artwork_model.artwork import Art
+from api.models.artwork_model.artwork import Art, ArtStatus
 from api.serializers.artwork_s.bid_serializers import BidSerializer, AuctionSerializer
 from api.models.interaction_model.follows import Follower
 from datetime import datetime
@@ -23,6 +23,13 @@ from api.models.user_model.users import User
 from bson import ObjectId
 from rest_framework.exceptions import ValidationError
 from django.utils.timezone import now
+from api.utils.pagination import ObjectIdCursorPagination, TimestampCursorPagination
+from api.utils.blocking import excluded_user_ids
+from api.utils.cache_utils import cache_response
+from api.utils.sparse_fields import SparseFieldsViewMixin, requested_fields
+from api.utils.conditional import conditional_response
+from api.utils.loaders import load_reference, ref_ids
+from api.utils.view_tracking import record_view
 
 class AuctionCreateView(APIView):
     def post(self, request, *args, **kwargs):
@@ -44,7 +51,7 @@ class AuctionCreateView(APIView):
 
             artwork = Art.objects.get(id=artwork_id)
             
-            if artwork.art_status != "Active":
+            if artwork.art_status != ArtStatus.ACTIVE.value:
                 return Response(
                     {"error": "Auction can only be created for artworks with status 'Active'."},
                     status=status.HTTP_400_BAD_REQUEST
@@ -128,47 +135,18 @@ class AuctionCreateView(APIView):
             )
 
 
-class AuctionListView(generics.ListAPIView):
+class AuctionListView(SparseFieldsViewMixin, generics.ListAPIView):
     serializer_class = AuctionSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    pagination_class = ObjectIdCursorPagination
 
     def get_queryset(self):
-        now_utc = now()
+        # Expired auctions are closed by `manage.py run_auction_scheduler`, not here.
 
-        # ✅ 1. Auto-close expired auctions safely
-        try:
-            expired_auctions = Auction.objects(
-                status=AuctionStatus.ON_GOING.value,
-                end_time__lt=now_utc
-            )
-            for auction in expired_auctions:
-                try:
-                    auction.close_auction()
-                    auction.reload()
-                except Exception as e:
-                    print(f"Error closing auction {auction.id}: {e}")
-        except Exception as e:
-            print(f"Error fetching expired auctions: {e}")
+        # ✅ 1. Handle blocked users
+        blocked_user_ids = excluded_user_ids(self.request.user)
 
-        # ✅ 2. Handle blocked users
-        blocked_user_ids = []
-        user = self.request.user
-        if user.is_authenticated and hasattr(user, "blocked_users"):
-            try:
-                blocked_user_ids = [u.id for u in user.blocked_users]
-            except Exception as e:
-                print(f"Error reading blocked users: {e}")
-                blocked_user_ids = []
-
-        valid_artwork_ids = None
-        if blocked_user_ids:
-            try:
-                valid_artworks = Art.objects(artist__nin=blocked_user_ids).only("id")
-                valid_artwork_ids = [art.id for art in valid_artworks]
-            except Exception as e:
-                print(f"Error filtering artworks: {e}")
-
-        # ✅ 3. Handle status param safely
+        # ✅ 2. Handle status param safely
         query = {}
         status_param = self.request.query_params.get("status")
         allowed_statuses = [choice.value for choice in AuctionStatus]
@@ -178,14 +156,15 @@ class AuctionListView(generics.ListAPIView):
                 raise ValidationError(f"Invalid status filter: {status_param}")
             query["status"] = status_param
 
-        if valid_artwork_ids is not None:
-            query["artwork__in"] = valid_artwork_ids
+        if blocked_user_ids:
+            # Auction.artist is a copy of the artwork's artist (manage.py refresh_auction_popularity backfills it).
+            query["artist__nin"] = blocked_user_ids
 
         return Auction.objects(**query)
 
 
 
-class AuctionListViewOwner(generics.ListAPIView):
+class AuctionListViewOwner(SparseFieldsViewMixin, generics.ListAPIView):
     serializer_class = AuctionSerializer
     permission_classes = [permissions.IsAuthenticated]
 
@@ -197,16 +176,6 @@ class AuctionListViewOwner(generics.ListAPIView):
         artwork_ids = [art.id for art in user_artworks]
 
         
-        expired_auctions = Auction.objects(
-            artwork__in=artwork_ids,
-            status=AuctionStatus.ON_GOING.value,
-            end_time__lt=datetime.utcnow()
-        )
-
-        for auction in expired_auctions:
-            auction.close_auction()
-
-        
         queryset = Auction.objects(artwork__in=artwork_ids)
 
         status = self.request.query_params.get('status')
@@ -215,7 +184,7 @@ class AuctionListViewOwner(generics.ListAPIView):
 
         return queryset
         
-class AuctionListViewSpecificUser(generics.ListAPIView):
+class AuctionListViewSpecificUser(SparseFieldsViewMixin, generics.ListAPIView):
     serializer_class = AuctionSerializer
     permission_classes = [permissions.AllowAny]
 
@@ -229,16 +198,6 @@ class AuctionListViewSpecificUser(generics.ListAPIView):
         user_artworks = Art.objects(artist=user_id).only('id')
         artwork_ids = [art.id for art in user_artworks]
 
-       
-        expired_auctions = Auction.objects(
-            artwork__in=artwork_ids,
-            status=AuctionStatus.ON_GOING.value,
-            end_time__lt=datetime.utcnow()
-        )
-        for auction in expired_auctions:
-            auction.close_auction()
-
-        
         queryset = Auction.objects(artwork__in=artwork_ids)
 
         
@@ -249,7 +208,11 @@ class AuctionListViewSpecificUser(generics.ListAPIView):
         return queryset
 
 
-class AuctionListViewParticipated(generics.ListAPIView):
+def participated_auctions(user_id, outcome=None):
+    return Auction.objects(id__in=AuctionParticipation.auction_ids(user_id, outcome)).order_by('-end_time')
+
+
+class AuctionListViewParticipated(SparseFieldsViewMixin, generics.ListAPIView):
     serializer_class = AuctionSerializer
     permission_classes = [permissions.IsAuthenticated]
 
@@ -258,33 +221,16 @@ class AuctionListViewParticipated(generics.ListAPIView):
         if not user_id:
             return Auction.objects.none()
 
-        now_utc = datetime.now(timezone.utc)
-
-
-        expired_auctions = Auction.objects(
-            status=AuctionStatus.ON_GOING.value,
-            end_time__lt=now_utc
-        )
-        for auction in expired_auctions:
-            auction.close_auction()
-            auction.reload()
-
-        participated_auctions = []
-        all_auctions = Auction.objects()
-
-        for auction in all_auctions:
-            # Check if user participated in bids
-            participated = any(
-                (getattr(bid.bidder, 'id', None) and str(bid.bidder.id) == user_id)
-                or (getattr(bid.bidder, 'username', None) == user_id)
-                for bid in auction.bid_history
-            )
-            if participated:
-                participated_auctions.append(auction)
+        if not ObjectId.is_valid(user_id):
+            # The frontend sometimes passes a username instead of an id.
+            user = User.objects(username=user_id).only("id").first()
+            if not user:
+                return Auction.objects.none()
+            user_id = user.id
 
-        return participated_auctions
+        return participated_auctions(user_id)
     
-class MyAuctionListView(generics.ListAPIView):
+class MyAuctionListView(SparseFieldsViewMixin, generics.ListAPIView):
     serializer_class = AuctionSerializer
     permission_classes = [permissions.IsAuthenticated]
 
@@ -296,16 +242,6 @@ class MyAuctionListView(generics.ListAPIView):
         artwork_ids = [art.id for art in user_artworks]
 
         
-        expired_auctions = Auction.objects(
-            artwork__in=artwork_ids,
-            status=AuctionStatus.ON_GOING.value,
-            end_time__lt=datetime.utcnow()
-        )
-
-        for auction in expired_auctions:
-            auction.close_auction()
-
-        
         queryset = Auction.objects(artwork__in=artwork_ids)
 
         status = self.request.query_params.get('status')
@@ -325,10 +261,12 @@ class PlaceBidView(generics.CreateAPIView):
 class BidHistoryView(generics.ListAPIView):
     serializer_class = BidSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    # Pages walk the (artwork, -timestamp, -id) index; auction lists only carry the latest bids.
+    pagination_class = TimestampCursorPagination
 
     def get_queryset(self):
         artwork_id = self.kwargs.get('artwork_id')
-        return Bid.objects.filter(artwork=artwork_id).order_by('-timestamp')
+        return Bid.objects.filter(artwork=artwork_id).order_by('-timestamp', '-id')
 
 class AuctionDetailView(APIView):
     permission_classes = [permissions.IsAuthenticatedOrReadOnly ]
@@ -348,14 +286,27 @@ class AuctionDetailView(APIView):
                 return Response({"error": "Associated artwork not found."}, status=status.HTTP_404_NOT_FOUND)
 
             
-            user = request.user if request.user and request.user.is_authenticated else None
-            if user and user not in auction.viewed_by:
-                auction.viewed_by.append(user)
-                auction.save()
+            record_view(auction, request)
 
            
-            serializer = AuctionSerializer(auction, context={"request": request})
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            artwork = load_reference(auction, "artwork")
+            artist = load_reference(artwork, "artist")
+
+            return conditional_response(
+                request,
+                lambda: Response(
+                    AuctionSerializer(auction, context={"request": request}, fields=requested_fields(request)).data,
+                    status=status.HTTP_200_OK,
+                ),
+                modified=(auction.updated_at, artwork.updated_at, getattr(artist, "updated_at", None)),
+                version=(
+                    auction.status,
+                    auction.likes_count,
+                    artwork.likes_count,
+                    len(ref_ids(auction, "bid_history")),
+                    auction.view_count,
+                ),
+            )
 
         except Exception as e:
             import traceback
@@ -363,16 +314,12 @@ class AuctionDetailView(APIView):
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
-class ActiveAuctionsView(generics.ListAPIView):
+class ActiveAuctionsView(SparseFieldsViewMixin, generics.ListAPIView):
     serializer_class = AuctionSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
 
     def get_queryset(self):
-        expired_auctions = Auction.objects.filter(status=True, end_time__lt=datetime.utcnow)
-        for auction in expired_auctions:
-            auction.close_auction()
-
-        return Auction.objects.filter(status=True)
+        return Auction.objects.filter(status=AuctionStatus.ON_GOING.value)
 
 class CloseAuctionView(generics.UpdateAPIView):
     permission_classes = [permissions.IsAdminUser]
@@ -381,11 +328,12 @@ class CloseAuctionView(generics.UpdateAPIView):
         artwork_id = self.kwargs.get('artwork_id')
 
         try:
-            auction = Auction.objects.get(artwork=artwork_id, status=True)
+            auction = Auction.objects.get(artwork=artwork_id, status=AuctionStatus.ON_GOING.value)
         except Auction.DoesNotExist:
             return Response({"error": "Auction not found or already closed."}, status=status.HTTP_404_NOT_FOUND)
 
-        auction.close_auction()
+        if not auction.close_auction():
+            return Response({"error": "Auction not found or already closed."}, status=status.HTTP_404_NOT_FOUND)
         return Response({"message": "Auction closed successfully."}, status=status.HTTP_200_OK)
 
 class HighestBidView(generics.RetrieveAPIView):
@@ -405,24 +353,20 @@ class HighestBidView(generics.RetrieveAPIView):
         return Response(BidSerializer(auction.highest_bid).data, status=status.HTTP_200_OK)
 
 
-class MyBidsAuctionListView(generics.ListAPIView):
+MY_BIDS_FILTERS = {
+    "won": ParticipationOutcome.WON.value,
+    "active": ParticipationOutcome.ACTIVE.value,
+    "lost": ParticipationOutcome.LOST.value,
+}
+
+
+class MyBidsAuctionListView(SparseFieldsViewMixin, generics.ListAPIView):
     serializer_class = AuctionSerializer
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        user_id = str(self.request.user.id)
         filter_type = self.request.query_params.get("filter")
-
-        base_qs = Auction.objects(bid_history__bidder=user_id).distinct()
-
-        if filter_type == "won":
-            return base_qs.filter(status="sold", highest_bid__bidder=user_id)
-        elif filter_type == "active":
-            return base_qs.filter(status="on_going")
-        elif filter_type == "lost":
-            return base_qs.filter(status="closed", highest_bid__bidder__ne=user_id)
-        
-        return base_qs
+        return participated_auctions(self.request.user.id, MY_BIDS_FILTERS.get(filter_type))
 
 
 class FollowedAuctionsView(APIView):
@@ -445,16 +389,6 @@ class FollowedAuctionsView(APIView):
         artwork_ids = [art.id for art in artworks]
        
 
-        now_utc = datetime.now(timezone.utc)
-
-        expired_auctions = Auction.objects(
-            artwork__in=artwork_ids,
-            status=AuctionStatus.ON_GOING.value,
-            end_time__lt=now_utc
-        )
-        for auction in expired_auctions:
-            auction.close_auction()
-
         auctions = Auction.objects(
             artwork__in=artwork_ids,
             status=AuctionStatus.ON_GOING.value
@@ -464,30 +398,27 @@ class FollowedAuctionsView(APIView):
         serialized = AuctionSerializer(auctions, many=True)
         return Response(serialized.data, status=status.HTTP_200_OK)
     
-class PopularAuctionListView(generics.ListAPIView):
+class PopularAuctionListView(SparseFieldsViewMixin, generics.ListAPIView):
     serializer_class = AuctionSerializer
     permission_classes = [permissions.IsAuthenticated]
 
+    @cache_response(
+        tags=["auction:feed"],
+        item_tags=lambda row: [f"auction:{row['id']}", f"art:{(row.get('artwork') or {}).get('id')}"],
+    )
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
     def get_queryset(self):
-        now_utc = datetime.now(timezone.utc)
-       
         queryset = Auction.objects(
             status=AuctionStatus.ON_GOING.value,
-            end_time__gt=now_utc
+            end_time__gt=datetime.utcnow(),
         )
 
         user = self.request.user
-        if user.is_authenticated and hasattr(user, "blocked_users"):
-            blocked_user_ids = [u.id for u in user.blocked_users]
-            valid_artworks = Art.objects(artist__nin=blocked_user_ids).only('id')
-            valid_artwork_ids = [art.id for art in valid_artworks]
-            queryset = queryset.filter(artwork__in=valid_artwork_ids)
-
-      
-        sorted_queryset = sorted(
-            queryset,
-            key=lambda auction: Like.objects(auction=auction).count(),
-            reverse=True
-        )
+        blocked_user_ids = excluded_user_ids(user)
+        if blocked_user_ids:
+            queryset = queryset.filter(artist__nin=blocked_user_ids)
 
-        return sorted_queryset[:4]
+        # Walks the (status, -popularity) index; scores are kept current on likes, bids and views.
+        return queryset.order_by("-popularity", "-id").limit(4)
@@ -3,12 +3,20 @@ from rest_framework.response import Response
 from rest_framework import status,parsers
 from api.serializers.exhibit_s.exhibit_seriliazers import ExhibitSerializer
 from api.models.exhibit_model.exhibit import Exhibit
+from api.models.artwork_model.artwork import Art
 from api.serializers.exhibit_s.exhibit_card import ExhibitCardSerializer
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
 from rest_framework import generics, permissions
 from rest_framework.permissions import IsAuthenticated
 from api.models.user_model.users import User
 from rest_framework import status
+from api.utils.pagination import MongoCursorPagination
+from api.utils.cache_utils import cache_response
+from api.utils.sparse_fields import requested_fields, sparse_only
+from api.utils.conditional import conditional_response
+from api.utils.view_tracking import record_view
+from api.utils.loaders import ref_ids
+
 class ExhibitCreateView(APIView):
     parser_classes = [parsers.MultiPartParser, parsers.FormParser]
 
@@ -21,14 +29,28 @@ class ExhibitCreateView(APIView):
 
 class ExhibitListView(APIView):
     def get(self, request):
-        exhibits = Exhibit.objects.all()
-        serializer = ExhibitSerializer(exhibits, many=True)
+        fields = requested_fields(request)
+        exhibits = sparse_only(Exhibit.objects.all(), ExhibitSerializer, fields)
+
+        paginator = MongoCursorPagination()
+        page = paginator.paginate_queryset(exhibits, request, view=self)
+        if page is not None:
+            serializer = ExhibitSerializer(page, many=True, fields=fields)
+            return paginator.get_paginated_response(serializer.data)
+
+        serializer = ExhibitSerializer(exhibits, many=True, fields=fields)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
+def exhibit_card_tags(row):
+    return [f"exhibit:{row['id']}"] + [f"art:{art['id']}" for art in row.get("artworks") or []]
+
+
 class ExhibitCardListView(APIView):
+    @cache_response(tags=["exhibit:feed"], item_tags=exhibit_card_tags, per_user=False)
     def get(self, request):
-        exhibits = Exhibit.objects.filter(visibility='Pending')
-        serializer = ExhibitCardSerializer(exhibits, many=True)
+        fields = requested_fields(request)
+        exhibits = sparse_only(Exhibit.objects.filter(visibility='Pending'), ExhibitCardSerializer, fields)
+        serializer = ExhibitCardSerializer(exhibits, many=True, fields=fields)
         return Response(serializer.data, status=status.HTTP_200_OK)
         
 class MyExhibitCardListView(APIView):
@@ -38,8 +60,9 @@ class MyExhibitCardListView(APIView):
         try:
             user_id = str(request.user.id)
             user = User.objects.get(id=user_id)  # MongoEngine User
-            exhibits = Exhibit.objects.filter(owner=user)
-            serializer = ExhibitCardSerializer(exhibits, many=True)
+            fields = requested_fields(request)
+            exhibits = sparse_only(Exhibit.objects.filter(owner=user), ExhibitCardSerializer, fields)
+            serializer = ExhibitCardSerializer(exhibits, many=True, fields=fields)
             return Response(serializer.data, status=status.HTTP_200_OK)
         except Exception as e:
             print("🔥 ERROR in MyExhibitCardListView:", e)
@@ -54,13 +77,18 @@ class ExhibitCardDetailView(APIView):
         except Exhibit.DoesNotExist:
             return Response({"detail": "Exhibit not found."}, status=status.HTTP_404_NOT_FOUND)
 
-        user = request.user
+        record_view(exhibit, request)
 
-      
-        if user not in exhibit.viewed_by:
-            exhibit.viewed_by.append(user)
-            exhibit.save()
+        # The card embeds its artworks, so their edits and likes count too.
+        artworks = list(Art.objects(id__in=ref_ids(exhibit, "artworks")).only("updated_at", "likes_count"))
 
-        serializer = ExhibitCardSerializer(exhibit, context={"request": request})
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return conditional_response(
+            request,
+            lambda: Response(
+                ExhibitCardSerializer(exhibit, context={"request": request}).data,
+                status=status.HTTP_200_OK,
+            ),
+            modified=(exhibit.updated_at, *[art.updated_at for art in artworks]),
+            version=(exhibit.likes_count, exhibit.view_count, *sorted((str(art.id), art.likes_count) for art in artworks)),
+        )
 
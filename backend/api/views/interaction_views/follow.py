@@ -6,14 +6,36 @@ from api.models.user_model.users import User
 from api.serializers.interaction_s.follow import FollowSerializer
 from rest_framework.permissions import IsAuthenticated
 from api.models.interaction_model.notification import Notification
-from api.serializers.user_s.users_serializers import UserSerializer 
+from api.models.interaction_model.suggestions import FollowSuggestions
+from api.serializers.user_s.users_serializers import UserCardSerializer
 from api.serializers.artwork_s.artwork_serializers import ArtSerializer
 from bson import ObjectId
 from bson.errors import InvalidId
 from datetime import datetime
 from django.utils.timesince import timesince
-from api.models.artwork_model.artwork import Art
+from api.models.artwork_model.artwork import Art, ArtStatus, ArtVisibility
 from django.db.models import Q
+from api.utils.blocking import excluded_user_ids
+from api.utils.loaders import ref_id
+from api.utils.pagination import FollowedAtCursorPagination, MongoCursorPagination
+from api.utils.timeline import timeline_artworks, timeline_keys
+
+FOLLOW_STATS_PREVIEW = 20
+
+
+def follow_counts(user, viewer):
+    """
+    The stored follower/following counts of ``user``, less the follows involving
+    users excluded for the viewer (blocked either way): one small indexed lookup
+    per side, sized by the block set rather than by the user's follower count.
+    """
+    followers_count, following_count = user.followers_count, user.following_count
+    blocked_user_ids = excluded_user_ids(viewer)
+    if blocked_user_ids:
+        followers_count -= Follower.objects(follower__in=blocked_user_ids, following=user.id).count()
+        following_count -= Follower.objects(follower=user.id, following__in=blocked_user_ids).count()
+    return max(followers_count, 0), max(following_count, 0)
+
 
 class FollowCreateView(APIView):
     permission_classes = [IsAuthenticated]  
@@ -33,11 +55,9 @@ class FollowCreateView(APIView):
         if user.id == following.id:
             return Response({"detail": "You cannot follow yourself."}, status=status.HTTP_400_BAD_REQUEST)
         
-        existing_follow = Follower.objects.filter(follower=user, following=following).first()
-        if existing_follow:
+        follow = Follower.follow(user, following)
+        if follow is None:
             return Response({"detail": "You are already following this user."}, status=status.HTTP_400_BAD_REQUEST)
-        
-        follow = Follower.objects.create(follower=user, following=following)
 
         host = request.get_host()
         protocol = "http" if "localhost" in host else "https"
@@ -75,11 +95,9 @@ class UnfollowView(APIView):
         
         follow = Follower.objects.filter(follower=user, following=following).first()
         
-        if not follow:
+        if not follow or not follow.unfollow():
             return Response({"detail": "You are not following this user."}, status=status.HTTP_400_BAD_REQUEST)
         
-       
-        follow.delete()
         return Response({"detail": "Successfully unfollowed the user."}, status=status.HTTP_200_OK)
 
 class CheckFollowStatusView(APIView):
@@ -107,73 +125,63 @@ class FollowedArtworksView(APIView):
     def get(self, request, *args, **kwargs):
         user = request.user
 
-        followed_ids = [f.following for f in Follower.objects(follower=user)]
-
-        if not followed_ids:
-            return Response({
-                "total": 0,
-                "artworks": [],
-                "message": "You are not following any users yet."
-            }, status=status.HTTP_200_OK)
-
-        artworks_queryset = Art.objects(
-            artist__in=followed_ids,
-            visibility="Public",
-            art_status="Active"
-        ).order_by('-created_at')
-
-        total = artworks_queryset.count()
-        artworks = artworks_queryset  
+        paginator = MongoCursorPagination()
+        art_ids = paginator.paginate_keys(
+            lambda position, limit: timeline_keys(user.id, position, limit), request
+        )
 
-        serialized = ArtSerializer(artworks, many=True)
+        # Entries of artworks hidden since fan-out are dropped until their prune job runs.
+        artworks = {art.id: art for art in timeline_artworks(id__in=art_ids)}
+        serialized = ArtSerializer([artworks[art_id] for art_id in art_ids if art_id in artworks], many=True)
         return Response({
-            "total": total,
             "artworks": serialized.data,
+            "next": paginator.get_next_link(),
         }, status=status.HTTP_200_OK)
 
 
 
-class FollowerListView(APIView):
-    permission_classes = [IsAuthenticated]
+def user_cards(user_ids):
+    # One batched fetch for the page, returned in the page's order.
+    users = {user.id: user for user in User.objects(id__in=user_ids).only(*UserCardSerializer.FIELDS)}
+    return UserCardSerializer([users[user_id] for user_id in user_ids if user_id in users], many=True).data
 
-    def get(self, request, *args, **kwargs):
-        user_id = request.query_params.get('user_id')
-        current_user = request.user
 
-        blocked_user_ids = [user.id for user in current_user.blocked_users] if hasattr(current_user, 'blocked_users') else []
+def follow_edge_page(request, edges, field):
+    paginator = FollowedAtCursorPagination()
+    page = paginator.paginate_queryset(edges.only(field, "followed_at"), request)
+    return paginator.get_paginated_response(user_cards([ref_id(edge, field) for edge in page]))
 
-        if user_id:
-           
-            followers = Follower.objects(following=user_id, follower__nin=blocked_user_ids)
-        else:
-            followers = Follower.objects(following=current_user, follower__nin=blocked_user_ids)
-
-        follower_users = [f.follower for f in followers]
-        serializer = UserSerializer(follower_users, many=True)
-        return Response(serializer.data)
 
+def profile_user_id(request):
+    user_id = request.query_params.get('user_id')
+    if not user_id:
+        return request.user.id
+    return ObjectId(user_id) if ObjectId.is_valid(user_id) else None
 
 
-class FollowingListView(APIView):
+class FollowerListView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request, *args, **kwargs):
-        user_id = request.query_params.get('user_id')
-        current_user = request.user
+        user_id = profile_user_id(request)
+        if user_id is None:
+            return Response({"detail": "Invalid user ID format."}, status=status.HTTP_400_BAD_REQUEST)
 
-      
-        blocked_user_ids = [user.id for user in current_user.blocked_users] if hasattr(current_user, 'blocked_users') else []
+        followers = Follower.objects(following=user_id, follower__nin=excluded_user_ids(request.user))
+        return follow_edge_page(request, followers, "follower")
 
-        if user_id:
-            following = Follower.objects.filter(follower=user_id)
-        else:
-            following = Follower.objects.filter(follower=current_user)
 
-        filtered_following = [f for f in following if f.following.id not in blocked_user_ids]
 
-        following_users = [f.following for f in filtered_following]
-        serializer = UserSerializer(following_users, many=True)
-        return Response(serializer.data)
+class FollowingListView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        user_id = profile_user_id(request)
+        if user_id is None:
+            return Response({"detail": "Invalid user ID format."}, status=status.HTTP_400_BAD_REQUEST)
+
+        following = Follower.objects(follower=user_id, following__nin=excluded_user_ids(request.user))
+        return follow_edge_page(request, following, "following")
 
 
 
@@ -189,20 +197,7 @@ class FollowCountsView(APIView):
         except User.DoesNotExist:
             return Response({"detail": "User not found."}, status=status.HTTP_404_NOT_FOUND)
 
-        current_user = request.user
-        blocked_user_ids = [u.id for u in current_user.blocked_users] if hasattr(current_user, 'blocked_users') else []
-
-        
-        followers_count = Follower.objects(
-            following=user,
-            follower__nin=blocked_user_ids
-        ).count()
-
-      
-        following_count = Follower.objects(
-            follower=user,
-            following__nin=blocked_user_ids
-        ).count()
+        followers_count, following_count = follow_counts(user, request.user)
 
         return Response({
             "followers": followers_count,
@@ -222,16 +217,14 @@ class FollowStatsView(APIView):
         else:
             user = request.user
 
-        followers = Follower.objects.filter(following=user)
-        followers_list = [f.follower for f in followers]
-        follower_count = followers.count()
+        # Only the latest few of each; the full lists are paged by FollowerListView / FollowingListView.
+        followers = Follower.objects(following=user.id).order_by('-followed_at', '-id').only('follower')
+        following = Follower.objects(follower=user.id).order_by('-followed_at', '-id').only('following')
 
-        following = Follower.objects.filter(follower=user)
-        following_list = [f.following for f in following]
-        following_count = following.count()
+        follower_count, following_count = user.followers_count, user.following_count
 
-        followers_serialized = UserSerializer(followers_list, many=True).data
-        following_serialized = UserSerializer(following_list, many=True).data
+        followers_serialized = user_cards([ref_id(f, 'follower') for f in followers.limit(FOLLOW_STATS_PREVIEW)])
+        following_serialized = user_cards([ref_id(f, 'following') for f in following.limit(FOLLOW_STATS_PREVIEW)])
 
         return Response({
             "follower_count": follower_count,
@@ -240,6 +233,37 @@ class FollowStatsView(APIView):
             "following": following_serialized
         }, status=200)
 
+class FollowSuggestionsView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        # Precomputed by manage.py build_follow_suggestions; served in one read.
+        row = FollowSuggestions.objects(user=request.user.id).first()
+        if row is None:
+            return Response({"results": [], "computed_at": None}, status=status.HTTP_200_OK)
+
+        hidden = set(excluded_user_ids(request.user))
+        # Follows made since the last run are only checked when there were any.
+        if request.user.graph_changed_at and request.user.graph_changed_at > row.computed_at:
+            suggested = [suggestion.user for suggestion in row.suggestions]
+            hidden.update(ref_id(f, 'following') for f in Follower.objects(follower=request.user.id, following__in=suggested).only('following'))
+
+        results = [
+            {
+                "id": str(suggestion.user),
+                "username": suggestion.username,
+                "first_name": suggestion.first_name,
+                "last_name": suggestion.last_name,
+                "profile_picture": suggestion.profile_picture,
+                "reason": suggestion.reason,
+                "mutual_count": suggestion.mutual_count,
+            }
+            for suggestion in row.suggestions
+            if suggestion.user not in hidden
+        ]
+
+        return Response({"results": results, "computed_at": row.computed_at}, status=status.HTTP_200_OK)
+
 class RemoveFollowerView(APIView):
     permission_classes = [IsAuthenticated]
 
@@ -253,7 +277,8 @@ class RemoveFollowerView(APIView):
         try:
           
             follow_instance = Follower.objects.get(follower=follower_id, following=user)
-            follow_instance.delete()
+            if not follow_instance.unfollow():
+                raise Follower.DoesNotExist
             return Response({"detail": "Follower removed successfully."}, status=status.HTTP_200_OK)
         except Follower.DoesNotExist:
             return Response({"detail": "Follower relationship does not exist."}, status=status.HTTP_404_NOT_FOUND)
@@ -65,6 +65,21 @@ class CommentListView(APIView):
             "comments": comment_serializer.data
         }, status=status.HTTP_200_OK)
         
+def bump_likes_count(document_cls, target_id, delta):
+    """Atomically apply ``delta`` to ``likes_count`` and return the new value."""
+    queryset = document_cls.objects(id=target_id)
+    if delta < 0:
+        queryset = queryset.filter(likes_count__gt=0)
+
+    # updated_at moves with the counter so Last-Modified stays truthful.
+    updated = queryset.only("likes_count").modify(
+        new=True, inc__likes_count=delta, set__updated_at=datetime.utcnow()
+    )
+    if updated is None:
+        return 0
+    return updated.likes_count
+
+
 class LikeCreateView(APIView):
     permission_classes = [IsAuthenticated]
 
@@ -84,7 +99,7 @@ class LikeCreateView(APIView):
             like = Like.objects.filter(user=user, art=art).first()
             if like:
                 like.delete()
-                like_count = Like.objects.filter(art=art).count()
+                like_count = bump_likes_count(Art, art.id, -1)
                 return Response({
                     "is_liked": False,
                     "like_count": like_count,
@@ -104,7 +119,7 @@ class LikeCreateView(APIView):
                     created_at=datetime.now(),
                     link=f"/artwork/{art.id}",
                 )
-                like_count = Like.objects.filter(art=art).count()
+                like_count = bump_likes_count(Art, art.id, 1)
                 return Response({
                     "is_liked": True,
                     "like_count": like_count,
@@ -121,7 +136,8 @@ class LikeCreateView(APIView):
             like = Like.objects.filter(user=user, auction=auction).first()
             if like:
                 like.delete()
-                like_count = Like.objects.filter(auction=auction).count()
+                like_count = bump_likes_count(Auction, auction.id, -1)
+                Auction.refresh_popularity(auction.id)
                 return Response({
                     "is_liked": False,
                     "like_count": like_count,
@@ -141,7 +157,8 @@ class LikeCreateView(APIView):
                     created_at=datetime.now(),
                     link=f"/bid/{auction.id}/",
                 )
-                like_count = Like.objects.filter(auction=auction).count()
+                like_count = bump_likes_count(Auction, auction.id, 1)
+                Auction.refresh_popularity(auction.id)
                 return Response({
                     "is_liked": True,
                     "like_count": like_count,
@@ -158,7 +175,7 @@ class LikeCreateView(APIView):
             like = Like.objects.filter(user=user, exhibit=exhibit).first()
             if like:
                 like.delete()
-                like_count = Like.objects.filter(exhibit=exhibit).count()
+                like_count = bump_likes_count(Exhibit, exhibit.id, -1)
                 return Response({
                     "is_liked": False,
                     "like_count": like_count,
@@ -178,7 +195,7 @@ class LikeCreateView(APIView):
                     created_at=datetime.now(),
                     link=f"/exhibit/{exhibit.id}/",
                 )
-                like_count = Like.objects.filter(exhibit=exhibit).count()
+                like_count = bump_likes_count(Exhibit, exhibit.id, 1)
                 return Response({
                     "is_liked": True,
                     "like_count": like_count,
@@ -259,8 +276,10 @@ class SavedArtworksListView(APIView):
 
     def get(self, request, *args, **kwargs):
         user = request.user
-        saved_entries = Saved.objects.filter(user=user)
-        artworks = [entry.art for entry in saved_entries if entry.art is not None]
+        saved_entries = Saved.objects.filter(user=user).only("art").no_dereference()
+        art_ids = [entry.art.id for entry in saved_entries if entry.art is not None]
+        artworks_by_id = {art.id: art for art in Art.objects(id__in=art_ids)}
+        artworks = [artworks_by_id[art_id] for art_id in art_ids if art_id in artworks_by_id]
 
         serializer = ArtSerializer(artworks, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
@@ -6,11 +6,13 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework import status
+from api.utils.pagination import MongoCursorPagination
 
 
 class NotificationListView(generics.ListCreateAPIView):
     serializer_class = NotificationSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = MongoCursorPagination
 
     def get_queryset(self):
         user_id = str(self.request.user.id) 
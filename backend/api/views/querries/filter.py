@@ -1,7 +1,7 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from api.models.artwork_model.artwork import Art
+from api.models.artwork_model.artwork import Art, normalize_art_status
 from api.serializers.artwork_s.artwork_serializers import ArtSerializer
 from api.models.user_model.users import User
 from bson import ObjectId
@@ -30,7 +30,7 @@ class ArtSearchAndFilterView(APIView):
             query &= Q(category=category)
 
         if art_status:
-            query &= Q(art_status=art_status)
+            query &= Q(art_status=normalize_art_status(art_status))
 
         if min_price:
             query &= Q(price__gte=int(min_price))
@@ -3,11 +3,13 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from api.models.user_model.users import User
-from api.models.artwork_model.artwork import Art
+from api.models.artwork_model.artwork import Art, ArtStatus
 from api.serializers.user_s.top_sellers_serializer import TopSellerSerializer
 from mongoengine.queryset.visitor import Q
+from api.utils.cache_utils import cache_response
 
 class TopSellersAPIView(APIView):
+    @cache_response(tags=["art:feed"], item_tags=lambda row: [f"artist:{row['id']}"], per_user=False)
     def get(self, request):
       
         users = User.objects(role="User", user_status="Active")
@@ -15,7 +17,7 @@ class TopSellersAPIView(APIView):
         seller_data = []
 
         for user in users:
-            on_sale_count = Art.objects(artist=user, art_status__iexact="onSale").count()
+            on_sale_count = Art.objects(artist=user, art_status=ArtStatus.ON_SALE.value).count()
             if on_sale_count > 0:
                 seller_data.append({
                     "id": str(user.id),
@@ -11,6 +11,10 @@ from api.models.user_model.users import User
 from api.serializers.user_s.users_serializers import UserSerializer 
 from api.auth.permissions import IsAdminOrOwner 
 from api.utils.email_utils import generate_otp, send_otp_email
+from api.utils.sparse_fields import requested_fields, sparse_only
+from api.utils.conditional import conditional_response
+from api.utils.loaders import ref_ids
+from api.utils.blocking import block, unblock
 import traceback
 from bson import ObjectId
 from rest_framework import status
@@ -34,8 +38,9 @@ class ListAllUsersView(APIView):
 
     def get(self, request):
         try:
-            users = User.objects(role__in=["Admin", "Moderator", "User"])
-            serializer = UserSerializer(users, many=True, context={"request": request})
+            fields = requested_fields(request)
+            users = sparse_only(User.objects(role__in=["Admin", "Moderator", "User"]), UserSerializer, fields)
+            serializer = UserSerializer(users, many=True, context={"request": request}, fields=fields)
             return Response(serializer.data, status=status.HTTP_200_OK)
         except Exception as e:
             print("Error listing users:", e)
@@ -51,13 +56,23 @@ class RetrieveUserView(APIView):
             if not ObjectId.is_valid(pk):
                 return Response({"error": "Invalid user ID format."}, status=status.HTTP_400_BAD_REQUEST)
 
-            user = User.objects(id=ObjectId(pk)).first()
+            fields = requested_fields(request)
+            user = sparse_only(
+                User.objects(id=ObjectId(pk)), UserSerializer, fields, also=("updated_at", "blocked_users")
+            ).first()
 
             if not user:
                 return Response({"error": "User not found."}, status=status.HTTP_404_NOT_FOUND)
 
-            serializer = UserSerializer(user, context={"request": request})
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            return conditional_response(
+                request,
+                lambda: Response(
+                    UserSerializer(user, context={"request": request}, fields=fields).data,
+                    status=status.HTTP_200_OK,
+                ),
+                modified=(user.updated_at,),
+                version=(len(ref_ids(user, "blocked_users")),),
+            )
 
         except Exception as e:
             print("Error retrieving user:", e)
@@ -101,9 +116,8 @@ class BlockUserView(APIView):
         if user_to_block == current_user:
             return Response({"detail": "Cannot block yourself."}, status=status.HTTP_400_BAD_REQUEST)
         
-        if user_to_block not in current_user.blocked_users:
-            current_user.blocked_users.append(user_to_block)
-            current_user.save()
+        if user_to_block.id not in current_user.blocked_users:
+            block(current_user.id, user_to_block.id)
         
         return Response(
             {"detail": f"The user {user_to_block.first_name} {user_to_block.last_name} has been blocked successfully."},
@@ -120,9 +134,8 @@ class UnblockUserView(APIView):
         if not user_to_unblock:
             return Response({"detail": "User not found."}, status=status.HTTP_404_NOT_FOUND)
         
-        if user_to_unblock in current_user.blocked_users:
-            current_user.blocked_users.remove(user_to_unblock)
-            current_user.save()
+        if user_to_unblock.id in current_user.blocked_users:
+            unblock(current_user.id, user_to_unblock.id)
         
         return Response(
             {"detail": f"The user {user_to_unblock.first_name} {user_to_unblock.last_name} has been unblocked successfully."},
@@ -0,0 +1,6 @@
+from django.urls import re_path
+from api.consumers.auction_consumer import AuctionConsumer
+
+websocket_urlpatterns = [
+    re_path(r"^ws/auction/(?P<auction_id>\w+)/$", AuctionConsumer.as_asgi()),
+]
@@ -11,6 +11,7 @@ import cloudinary.uploader
 import cloudinary.api
 from django.http import JsonResponse
 from corsheaders.defaults import default_headers
+from api.middleware.middleware import QueryCounterListener
 
 load_dotenv() 
 
@@ -23,7 +24,8 @@ cloudinary.config(
 connect(
     db=os.getenv("MONGO_DB_NAME"),
     host=os.getenv("MONGO_DB_URI"),
-    alias="default"
+    alias="default",
+    event_listeners=[QueryCounterListener()],
 )
 
 # Optional: test the connection in dev only
@@ -67,17 +69,72 @@ REST_FRAMEWORK = {
 
 }
 
+# Default page size of api.utils.pagination's cursor pages. Kept out of
+# REST_FRAMEWORK: PAGE_SIZE there without DEFAULT_PAGINATION_CLASS trips
+# rest_framework.W001.
+API_PAGE_SIZE = int(os.getenv("API_PAGE_SIZE", 20))
+
 
 SIMPLE_JWT = {
      "ACCESS_TOKEN_LIFETIME": timedelta(hours=8),
      "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
  }
 
+# Trending artworks (python manage.py refresh_trending --loop)
+TRENDING_REFRESH_SECONDS = int(os.getenv("TRENDING_REFRESH_SECONDS", 900))
+TRENDING_HALF_LIFE_HOURS = float(os.getenv("TRENDING_HALF_LIFE_HOURS", 48))
+TRENDING_TOP_K = int(os.getenv("TRENDING_TOP_K", 50))
+TRENDING_WEIGHTS = {
+    "like": 3.0,
+    "save": 4.0,
+    "bid": 5.0,
+    "view": 0.5,
+}
+
+# Auction closing (python manage.py run_auction_scheduler)
+AUCTION_SCHEDULER_RESCAN_SECONDS = int(os.getenv("AUCTION_SCHEDULER_RESCAN_SECONDS", 30))
+AUCTION_SCHEDULER_LOOKAHEAD_SECONDS = int(os.getenv("AUCTION_SCHEDULER_LOOKAHEAD_SECONDS", 3600))
+
+# Background side effects, e.g. of a closed auction (python manage.py run_outbox_worker)
+OUTBOX_POLL_SECONDS = float(os.getenv("OUTBOX_POLL_SECONDS", 2))
+OUTBOX_LEASE_SECONDS = int(os.getenv("OUTBOX_LEASE_SECONDS", 120))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", 8))
+# Done jobs are removed by a TTL index this long after they complete.
+OUTBOX_DONE_RETENTION_SECONDS = int(os.getenv("OUTBOX_DONE_RETENTION_SECONDS", 7 * 24 * 60 * 60))
+
+# Home timeline (artworks of followed artists). Artists with more followers than
+# this are merged in at read time instead of fanned out; a new follow backfills
+# the artist's latest TIMELINE_BACKFILL artworks.
+TIMELINE_FANOUT_MAX_FOLLOWERS = int(os.getenv("TIMELINE_FANOUT_MAX_FOLLOWERS", 10000))
+TIMELINE_BACKFILL = int(os.getenv("TIMELINE_BACKFILL", 50))
+
+# "Who to follow" (python manage.py build_follow_suggestions). Each signal is
+# normalised per user before weighting.
+FOLLOW_SUGGESTIONS_PER_USER = int(os.getenv("FOLLOW_SUGGESTIONS_PER_USER", 20))
+FOLLOW_SUGGESTION_WEIGHTS = {
+    "two_hop": float(os.getenv("FOLLOW_SUGGESTION_WEIGHT_TWO_HOP", 1.0)),
+    "colike": float(os.getenv("FOLLOW_SUGGESTION_WEIGHT_COLIKE", 0.6)),
+    "liked": float(os.getenv("FOLLOW_SUGGESTION_WEIGHT_LIKED", 0.8)),
+}
+
+# Popular auctions (Auction.popularity). Rescored on every like, bid and new
+# viewer, and all ongoing auctions on each run_auction_scheduler rescan.
+AUCTION_POPULARITY_WEIGHTS = {
+    "like": 3.0,
+    "viewer": 0.5,
+    "bid_rate": 5.0,  # per bid per hour open
+    "closing": 10.0,  # reached as the auction ends
+}
+
+# Bids embedded per auction in list payloads; the full history is paged on /api/bid/history/<artwork_id>/.
+AUCTION_LIST_BID_HISTORY = int(os.getenv("AUCTION_LIST_BID_HISTORY", 3))
+
 # # Application definition
 # SECURE_SSL_REDIRECT = True
 # SESSION_COOKIE_SECURE = True
 # CSRF_COOKIE_SECURE = True
 INSTALLED_APPS = [ 
+    'daphne',
     'corsheaders', 
     'anymail',
     'django.contrib.admin',
@@ -99,6 +156,7 @@ INSTALLED_APPS = [
 ]
 SITE_ID = 1
 MIDDLEWARE = [
+    'api.middleware.middleware.QueryCountMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',  
@@ -109,6 +167,7 @@ MIDDLEWARE = [
     'allauth.account.middleware.AccountMiddleware',  
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'api.middleware.middleware.IdentityMapMiddleware',
 ]
 STATIC_URL = '/static/'
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
@@ -136,12 +195,19 @@ WSGI_APPLICATION = 'backend.wsgi.application'
 ASGI_APPLICATION = 'backend.asgi.application'
 
 
+# Live auction streams (ws/auction/<id>/). Redis shares them between
+# processes; CHANNEL_LAYER=memory keeps them in-process, for local runs and
+# `manage.py ws_load_test`.
+CHANNEL_LAYER = os.getenv("CHANNEL_LAYER", "redis")
+
 CHANNEL_LAYERS = {
     'default': {
         'BACKEND': 'channels_redis.core.RedisChannelLayer',
         'CONFIG': {
-            "hosts": [('localhost', 6379)],  
+            "hosts": [os.getenv("REDIS_URL", "redis://localhost:6379/1")],
         },
+    } if CHANNEL_LAYER == "redis" else {
+        'BACKEND': 'channels.layers.InMemoryChannelLayer',
     },
 }
 
@@ -241,15 +307,62 @@ SOCIALACCOUNT_PROVIDERS = {
         }
     }
     }
-# # CACHES = {
-# #     "default": {
-# #         "BACKEND": "django_redis.cache.RedisCache",
-# #        "LOCATION": "redis://redis:6379/1",  
-# #         "OPTIONS": {
-# #             "CLIENT_CLASS": "django_redis.client.DefaultClient",
-# #         }
-# #     }
-# }
+REDIS_URL = os.getenv("REDIS_URL")
+
+CACHES = {
+    # Shared cache; without REDIS_URL every process simply caches for itself.
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": REDIS_URL,
+        "OPTIONS": {
+            "socket_connect_timeout": 0.5,
+            "socket_timeout": 0.5,
+        },
+    } if REDIS_URL else {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "default",
+    },
+    # In-process LRU used by api.utils.cache_utils while Redis is unreachable.
+    "local": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "local-fallback",
+        "OPTIONS": {"MAX_ENTRIES": int(os.getenv("LOCAL_CACHE_MAX_ENTRIES", 2000))},
+    },
+}
+
+RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() == "true"
+RESPONSE_CACHE_TIMEOUT = int(os.getenv("RESPONSE_CACHE_TIMEOUT", 60))
+CACHE_TAG_TIMEOUT = int(os.getenv("CACHE_TAG_TIMEOUT", 24 * 60 * 60))
+CACHE_RETRY_AFTER_SECONDS = int(os.getenv("CACHE_RETRY_AFTER_SECONDS", 30))
+# Per-user blocked/blocked-by sets (api.utils.blocking); dropped on block and unblock.
+BLOCKED_USERS_CACHE_TIMEOUT = int(os.getenv("BLOCKED_USERS_CACHE_TIMEOUT", 300))
+
+# Anonymous auction viewers are counted in Redis HyperLogLogs (needs REDIS_URL).
+VIEW_SKETCH_ENABLED = bool(REDIS_URL) and os.getenv("VIEW_SKETCH_ENABLED", "true").lower() == "true"
+# Reverse proxies in front of the app that append to X-Forwarded-For. With 0
+# the header is ignored, since any client can send it.
+TRUSTED_PROXY_COUNT = int(os.getenv("TRUSTED_PROXY_COUNT", 0))
+
+# Requests slower than this log every Mongo query they ran (0 disables).
+SLOW_REQUEST_MS = int(os.getenv("SLOW_REQUEST_MS", 500))
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'api.requests': {
+            'handlers': ['console'],
+            'level': os.getenv("REQUEST_LOG_LEVEL", "INFO"),
+            'propagate': False,
+        },
+    },
+}
+
 # LOGGING = {
 #     'version': 1,
 #     'disable_existing_loggers': False,
@@ -0,0 +1,217 @@
+"""
+Load test for the auction hot paths: list browsing, detail polling, bidding
+on a few hot auctions, and bidding into auctions as they expire.
+
+Runs against a local stack only (see docker-compose.loadtest.yml); locust
+itself comes from loadtests/requirements.txt:
+
+    python manage.py seed_loadtest --bidders 500 --auctions 60 --hot 3 --expiring 10
+    locust -f loadtests/locustfile.py --host http://localhost:8000 \
+        --headless -u 300 -r 30 -t 10m --csv loadtests/results/<release>
+    python loadtests/report.py loadtests/results/<release>_stats.csv \
+        --baseline loadtests/results/<previous>_stats.csv
+
+Request names group ids together ("/api/auction/[id]/") so the per-endpoint
+percentiles stay comparable between runs and releases.
+"""
+import json
+import os
+import random
+from datetime import datetime
+from locust import HttpUser, between, constant, events, task
+
+FIXTURE = os.getenv("LOADTEST_FIXTURE", os.path.join(os.path.dirname(__file__), "fixture.json"))
+
+# Rejections the API is expected to hand out under contention; not failures.
+EXPECTED_REJECTIONS = {"bid_too_low", "already_highest", "auction_ended"}
+
+fixture = {"bidders": [], "auctions": []}
+
+
+@events.init.add_listener
+def load_fixture(environment, **kwargs):
+    if not os.path.exists(FIXTURE):
+        raise SystemExit(f"{FIXTURE} not found; run `python manage.py seed_loadtest` first.")
+    with open(FIXTURE) as f:
+        fixture.update(json.load(f))
+    for auction in fixture["auctions"]:
+        auction["ends_at"] = datetime.fromisoformat(auction["end_time"].rstrip("Z")).timestamp()
+
+
+def auctions(hot=None, expiring=None):
+    return [
+        auction for auction in fixture["auctions"]
+        if (hot is None or auction["hot"] == hot) and (expiring is None or auction["expiring"] == expiring)
+    ]
+
+
+def utc_now():
+    return datetime.utcnow().timestamp()
+
+
+class AuthenticatedUser(HttpUser):
+    abstract = True
+
+    def on_start(self):
+        bidder = random.choice(fixture["bidders"])
+        self.user_id = bidder["id"]
+        self.client.headers["Authorization"] = f"Bearer {bidder['token']}"
+
+    def record(self, request_type, name, response_time):
+        # Custom rows in the stats table, e.g. bid outcomes or close lag.
+        self.environment.events.request.fire(
+            request_type=request_type,
+            name=name,
+            response_time=response_time,
+            response_length=0,
+            exception=None,
+            context={},
+        )
+
+
+class AuctionBrowser(AuthenticatedUser):
+    """Scrolls the auction list and the popular strip, opening the odd auction."""
+
+    weight = 3
+    wait_time = between(1, 3)
+
+    @task(4)
+    def browse_list(self):
+        self.client.get("/api/auction/", name="/api/auction/")
+
+    @task(2)
+    def browse_popular(self):
+        self.client.get("/api/auction/popular/", name="/api/auction/popular/")
+
+    @task(1)
+    def browse_cards(self):
+        self.client.get("/api/auction/?fields=id,artwork,end_time,bid_summary", name="/api/auction/?fields=[cards]")
+
+    @task(2)
+    def open_auction(self):
+        auction = random.choice(fixture["auctions"])
+        self.client.get(f"/api/auction/{auction['id']}/", name="/api/auction/[id]/")
+        self.client.get(f"/api/bid/history/{auction['artwork_id']}/", name="/api/bid/history/[artwork]/")
+
+    @task(1)
+    def my_participation(self):
+        self.client.get(f"/api/auction/list/participated/?userId={self.user_id}", name="/api/auction/list/participated/")
+
+
+class DetailPoller(AuthenticatedUser):
+    """Keeps an auction page open, polling it like the bid screen does."""
+
+    weight = 4
+    wait_time = constant(2)
+
+    def on_start(self):
+        super().on_start()
+        # Most watchers sit on the hot auctions.
+        pool = auctions(hot=True) if random.random() < 0.7 else fixture["auctions"]
+        self.auction = random.choice(pool or fixture["auctions"])
+        self.etag = None
+
+    @task
+    def poll(self):
+        headers = {"If-None-Match": self.etag} if self.etag else {}
+        with self.client.get(
+            f"/api/auction/{self.auction['id']}/",
+            headers=headers,
+            name="/api/auction/[id]/ (poll)",
+            catch_response=True,
+        ) as response:
+            if response.status_code == 304:
+                response.success()
+            elif response.status_code == 200:
+                self.etag = response.headers.get("ETag")
+            else:
+                response.failure(f"HTTP {response.status_code}")
+
+
+class HotBidder(AuthenticatedUser):
+    """Outbids others on the few hot auctions; most attempts lose the race."""
+
+    weight = 2
+    wait_time = between(0.2, 1)
+
+    def on_start(self):
+        super().on_start()
+        self.known_high = {}
+
+    @task
+    def bid(self):
+        hot = auctions(hot=True)
+        if hot:
+            self.place_bid(random.choice(hot), "/api/bid/ (hot)")
+
+    def place_bid(self, auction, name):
+        amount = self.known_high.get(auction["id"], 1) + random.randint(1, 20)
+        with self.client.post(
+            "/api/bid/",
+            json={"artwork_id": auction["artwork_id"], "amount": amount, "identity_type": "username"},
+            name=name,
+            catch_response=True,
+        ) as response:
+            if response.status_code == 201:
+                self.known_high[auction["id"]] = amount
+                outcome = "accepted"
+                response.success()
+            elif response.status_code == 400 and self.rejection(response) in EXPECTED_REJECTIONS:
+                body = response.json()
+                if body.get("highest_amount") is not None:
+                    self.known_high[auction["id"]] = float(body["highest_amount"])
+                outcome = body["reason"]
+                response.success()
+            else:
+                outcome = "error"
+                response.failure(f"HTTP {response.status_code}: {response.text[:200]}")
+        self.record("BID", f"{name} {outcome}", response.elapsed.total_seconds() * 1000)
+        return outcome
+
+    def rejection(self, response):
+        try:
+            return response.json().get("reason")
+        except ValueError:
+            return None
+
+
+class ExpiryBidder(HotBidder):
+    """
+    Piles bids onto the auction closest to ending, then watches it until the
+    scheduler closes it and records how late that happened.
+    """
+
+    weight = 1
+    wait_time = between(0.5, 2)
+
+    def on_start(self):
+        super().on_start()
+        self.closed = set()
+
+    @task
+    def bid(self):
+        now = utc_now()
+        pending = [
+            auction for auction in auctions(expiring=True)
+            if auction["id"] not in self.closed and auction["ends_at"] > now - 120
+        ]
+        if not pending:
+            return
+        auction = min(pending, key=lambda a: a["ends_at"])
+
+        if auction["ends_at"] > now:
+            self.place_bid(auction, "/api/bid/ (expiring)")
+            return
+
+        with self.client.get(
+            f"/api/auction/{auction['id']}/",
+            name="/api/auction/[id]/ (expired)",
+            catch_response=True,
+        ) as response:
+            if response.status_code != 200:
+                response.failure(f"HTTP {response.status_code}")
+                return
+            if response.json().get("status") != "on_going":
+                self.closed.add(auction["id"])
+                # Upper bound on the scheduler's lag, within one wait_time.
+                self.record("EXPIRY", "close lag", (utc_now() - auction["ends_at"]) * 1000)
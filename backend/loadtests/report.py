@@ -0,0 +1,82 @@
+"""
+Per-endpoint latency report from a Locust ``--csv`` run, optionally compared
+against a baseline run (e.g. the previous release):
+
+    python loadtests/report.py loadtests/results/v1.4_stats.csv --baseline loadtests/results/v1.3_stats.csv
+"""
+import argparse
+import csv
+import sys
+
+PERCENTILES = ("50%", "95%", "99%")
+
+
+def load_stats(path):
+    with open(path, newline="") as f:
+        rows = list(csv.DictReader(f))
+    stats = {}
+    for row in rows:
+        if row["Name"] == "Aggregated":
+            continue
+        stats[f"{row['Type']} {row['Name']}"] = {
+            "requests": int(row["Request Count"]),
+            "failures": int(row["Failure Count"]),
+            "rps": float(row["Requests/s"]),
+            **{p: float(row[p]) if row[p] not in ("", "N/A") else None for p in PERCENTILES},
+        }
+    return stats
+
+
+def change(current, previous):
+    if current is None or not previous:
+        return ""
+    return f" ({(current - previous) / previous:+.0%})"
+
+
+def render(stats, baseline=None, regression=None):
+    header = ["Endpoint", "Requests", "Failures", "RPS"] + [f"p{p.rstrip('%')} ms" for p in PERCENTILES]
+    lines = ["| " + " | ".join(header) + " |", "|" + "---|" * len(header)]
+    regressions = []
+
+    for name in sorted(stats):
+        row = stats[name]
+        before = (baseline or {}).get(name, {})
+        cells = [name, str(row["requests"]), str(row["failures"]), f"{row['rps']:.1f}"]
+        for p in PERCENTILES:
+            value = row[p]
+            cells.append("-" if value is None else f"{value:.0f}{change(value, before.get(p))}")
+            if regression and value is not None and before.get(p) and value > before[p] * (1 + regression):
+                regressions.append(f"{name} p{p.rstrip('%')}: {before[p]:.0f} -> {value:.0f} ms")
+        lines.append("| " + " | ".join(cells) + " |")
+
+    if baseline:
+        missing = sorted(set(baseline) - set(stats))
+        if missing:
+            lines.append("")
+            lines.append("Not exercised in this run: " + ", ".join(missing))
+    return "\n".join(lines), regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("stats", help="<prefix>_stats.csv written by locust --csv <prefix>")
+    parser.add_argument("--baseline", help="Stats CSV of the run to compare against.")
+    parser.add_argument(
+        "--fail-on-regression",
+        type=float,
+        metavar="FRACTION",
+        help="Exit non-zero when any percentile is this much slower than the baseline (e.g. 0.2).",
+    )
+    args = parser.parse_args()
+
+    baseline = load_stats(args.baseline) if args.baseline else None
+    table, regressions = render(load_stats(args.stats), baseline, args.fail_on_regression if baseline else None)
+    print(table)
+
+    if regressions:
+        print("\nRegressions:\n  " + "\n  ".join(regressions))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
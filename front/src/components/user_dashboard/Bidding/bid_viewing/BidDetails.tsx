@@ -34,6 +34,7 @@ export interface BidCardData {
   imageUrl: string;
   highestBid: number;
   viewers: string[];
+  view_count?: number;
   user_has_liked_auction: boolean;
   auction_likes_count: number;
 }
@@ -422,7 +423,7 @@ const BidDetails = () => {
 
                       <div className="flex items-center space-x-2 text-xs">
                         <i className="bx bx-show text-[15px]"></i>
-                        <span>{item?.viewers.length || 0}</span>
+                        <span>{item?.view_count ?? item?.viewers.length ?? 0}</span>
                       </div>
                     </div>
 
@@ -1,7 +1,7 @@
 import ArtCard from "@/components/user_dashboard/Explore/cards/ArtCard";
 import ArtCardSkeleton from "@/components/skeletons/ArtCardSkeleton";
 import useFollowedArtworks from "@/hooks/artworks/follow_artworks/useFollowedArtworks";
-import React, { useState, useMemo } from "react";
+import React, { useMemo } from "react";
 import { useSearchParams } from "react-router-dom";
 import useBulkArtworkStatus from "@/hooks/interactions/useArtworkStatus";
 import useBulkReportStatus from "@/hooks/mutate/report/useReportStatus";
@@ -12,9 +12,14 @@ type Props = {
 const FollowingSection = ({ onTip }: Props) => {
   const [searchParams] = useSearchParams();
   const searchQuery = searchParams.get("q") || "";
-  const [currentPage] = useState(1);
-
-  const { data: followedArtworks, isLoading, error } = useFollowedArtworks(currentPage);
+  const {
+    data: followedArtworks,
+    isLoading,
+    error,
+    fetchNextPage,
+    hasNextPage,
+    isFetchingNextPage,
+  } = useFollowedArtworks();
   const artworkIds = useMemo(() => {
     if (!followedArtworks) return [];
     return followedArtworks.map((art) => art.id);
@@ -73,6 +78,18 @@ const FollowingSection = ({ onTip }: Props) => {
             })
           )}
         </div>
+
+        {hasNextPage && (
+          <div className="flex justify-center mt-6">
+            <button
+              onClick={() => fetchNextPage()}
+              disabled={isFetchingNextPage}
+              className="text-xs text-blue-500 hover:underline disabled:text-gray-400 disabled:no-underline"
+            >
+              {isFetchingNextPage ? "Loading..." : "Load More"}
+            </button>
+          </div>
+        )}
       </section>
     </div>
   );
@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from "react";
+import React, { useState, useEffect, useRef } from "react";
 import { Dialog, DialogContent, DialogTitle } from "@/components/ui/dialog";
 import { Avatar, AvatarFallback, AvatarImage } from "@/components/ui/avatar";
 import { Button } from "@/components/ui/button";
@@ -28,6 +28,9 @@ interface UserListModalProps {
   onUnfollow?: (userId: string) => void;
   onRemove?: (userId: string) => void;
   isOwner: boolean; // <-- NEW PROP
+  hasMore?: boolean;
+  isLoadingMore?: boolean;
+  onLoadMore?: () => void;
 }
 
 const UserListModal: React.FC<UserListModalProps> = ({
@@ -39,8 +42,24 @@ const UserListModal: React.FC<UserListModalProps> = ({
   onUnfollow,
   onRemove,
   isOwner, // <-- NEW PROP
+  hasMore = false,
+  isLoadingMore = false,
+  onLoadMore,
 }) => {
   const [searchTerm, setSearchTerm] = useState("");
+  const loadMoreRef = useRef<HTMLDivElement | null>(null);
+
+  // Fetch the next page once the end of the list scrolls into view.
+  useEffect(() => {
+    const sentinel = loadMoreRef.current;
+    if (!isOpen || !hasMore || !sentinel || !onLoadMore) return;
+
+    const observer = new IntersectionObserver((entries) => {
+      if (entries[0].isIntersecting) onLoadMore();
+    });
+    observer.observe(sentinel);
+    return () => observer.disconnect();
+  }, [isOpen, hasMore, onLoadMore, users.length]);
   const [selectedUserId, setSelectedUserId] = useState<string | null>(null);
 
   const [artworksCounts, setArtworksCounts] = useState<Record<string, number>>({});
@@ -265,6 +284,11 @@ const UserListModal: React.FC<UserListModalProps> = ({
             ) : (
               <div className="text-center py-8 text-gray-500">No users found</div>
             )}
+            {hasMore && (
+              <div ref={loadMoreRef} className="text-center py-2 text-[10px] text-gray-400">
+                {isLoadingMore ? "Loading..." : ""}
+              </div>
+            )}
           </div>
         </ScrollArea>
       </DialogContent>
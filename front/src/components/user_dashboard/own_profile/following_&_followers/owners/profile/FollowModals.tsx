@@ -22,9 +22,15 @@ const FollowModals: React.FC<FollowModalsProps> = ({ followersCount, followingCo
   const isOwner = profileUserId === loggedInUserId;
   console.log("isOwner:", isOwner);
 
-  const { followers, following, handleFollow, handleUnfollow, handleRemoveFollower } = useUserLists(
-    profileUserId || ""
-  );
+  const {
+    followers,
+    following,
+    followersPaging,
+    followingPaging,
+    handleFollow,
+    handleUnfollow,
+    handleRemoveFollower,
+  } = useUserLists(profileUserId || "");
 
   useEffect(() => {
     console.log(`Visited user ID: ${profileUserId}`);
@@ -58,6 +64,9 @@ const FollowModals: React.FC<FollowModalsProps> = ({ followersCount, followingCo
         onFollow={handleFollow}
         onRemove={handleRemoveFollower}
         isOwner={isOwner}
+        hasMore={followersPaging.hasMore}
+        isLoadingMore={followersPaging.isLoadingMore}
+        onLoadMore={followersPaging.loadMore}
       />
 
       <UserListModal
@@ -67,6 +76,9 @@ const FollowModals: React.FC<FollowModalsProps> = ({ followersCount, followingCo
         users={following}
         onUnfollow={handleUnfollow}
         isOwner={isOwner}
+        hasMore={followingPaging.hasMore}
+        isLoadingMore={followingPaging.isLoadingMore}
+        onLoadMore={followingPaging.loadMore}
       />
     </>
   );
@@ -41,7 +41,8 @@ const {
 const participatedAuctionsWithFlags = useMemo(() => {
   return participatedAuctions.map((auction) => {
     const isHighestBidder = auction.highest_bid?.user?.id === loggedInUserId;
-    const joinedByCurrentUser = auction.bid_history?.some((bid) => bid.user?.id === loggedInUserId) ?? false;
+    const joinedByCurrentUser =
+      auction.joinedByCurrentUser ?? auction.bid_history?.some((bid) => bid.user?.id === loggedInUserId) ?? false;
     const isPaid = auction.status === "sold" && isHighestBidder;
     const isLost = !isHighestBidder && (auction.status === "sold" || auction.status === "closed");
 
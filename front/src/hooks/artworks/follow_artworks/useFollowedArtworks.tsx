@@ -1,14 +1,19 @@
-
-import { useQuery } from "@tanstack/react-query";
+import { useInfiniteQuery } from "@tanstack/react-query";
 import apiClient from "@/utils/apiClient";
 
-const useFollowedArtworks = (page: number) => {
-  return useQuery({
-    queryKey: ["followedArtworks", page],
-    queryFn: async () => {
-      const response = await apiClient.get(`/artworks/following?page=${page}`);
+const PAGE_SIZE = 40;
+
+// Pages through the home timeline with the cursor the API returns in `next`.
+const useFollowedArtworks = () => {
+  return useInfiniteQuery({
+    queryKey: ["followedArtworks"],
+    queryFn: async ({ pageParam }) => {
+      const response = await apiClient.get(pageParam ?? `/artworks/following/?page_size=${PAGE_SIZE}`);
       return response.data;
     },
+    initialPageParam: null as string | null,
+    getNextPageParam: (lastPage) => lastPage.next ?? undefined,
+    select: (data) => data.pages.flatMap((page) => page.artworks ?? []),
     staleTime: 1000 * 60 * 5,
   });
 };
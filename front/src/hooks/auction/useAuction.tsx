@@ -52,7 +52,15 @@ export interface ArtworkAuction {
   auction_likes_count: number;
   artwork: AuctionArtwork;
   highest_bid: Bid | null;
+  // Lists only carry the latest few bids; use bid_summary for totals.
   bid_history: Bid[];
+  bid_summary?: {
+    amount: number | null;
+    bidder_id: string | null;
+    bidder_name: string | null;
+    bid_count: number;
+    bidder_count: number;
+  };
   end_time: string;
   start_time: string;
   status: "on_going" | "sold" | "closed" | "no_bidder" | "reauctioned";
@@ -63,7 +71,9 @@ export interface ArtworkAuction {
     mins: number;
     secs: number;
   };
+  // The latest few signed-in viewers; view_count is the total.
   viewers: string[];
+  view_count?: number;
   
   isShared: boolean;
 
@@ -1,40 +1,47 @@
 import { useState } from "react";
-import { useQuery, useQueryClient } from "@tanstack/react-query";
+import { useInfiniteQuery, useQueryClient } from "@tanstack/react-query";
 import { toast } from "sonner";
 import apiClient from "@/utils/apiClient";
 import { useFollowUser } from "@/hooks/follow/useFollowUser";
 import { useUnfollowUser } from "@/hooks/follow/useUnfollowUser";
 import { User } from "../users/useUserQuery";
-export function useUserLists(userId: string) {
-  const queryClient = useQueryClient();
 
-  const [isLoading, setIsLoading] = useState(false);
+const PAGE_SIZE = 50;
+const EMPTY: User[] = [];
 
-  const {
-    data: followers = [],
-    isLoading: loadingFollowers,
-    error: errorFollowers,
-  } = useQuery<User[]>({
-    queryKey: ["followers", userId],
-    queryFn: async () => {
-      const res = await apiClient.get(`followers/?user_id=${userId}`);
-      return res.data;
+// Follower and following lists are cursor-paginated; each page's `next` is the URL of the one after it.
+function useEdgeList(list: "followers" | "following", userId: string) {
+  const query = useInfiniteQuery({
+    queryKey: [list, userId],
+    queryFn: async ({ pageParam }) => {
+      const res = await apiClient.get(pageParam ?? `${list}/?user_id=${userId}&page_size=${PAGE_SIZE}`);
+      return res.data as { results: User[]; next: string | null };
     },
+    initialPageParam: null as string | null,
+    getNextPageParam: (lastPage) => lastPage.next ?? undefined,
+    select: (data) => data.pages.flatMap((page) => page.results),
     enabled: !!userId,
   });
 
-  const {
-    data: following = [],
-    isLoading: loadingFollowing,
-    error: errorFollowing,
-  } = useQuery<User[]>({
-    queryKey: ["following", userId],
-    queryFn: async () => {
-      const res = await apiClient.get(`following/?user_id=${userId}`);
-      return res.data;
+  return {
+    users: query.data ?? EMPTY,
+    isLoading: query.isLoading,
+    error: query.error,
+    hasMore: !!query.hasNextPage,
+    isLoadingMore: query.isFetchingNextPage,
+    loadMore: () => {
+      if (query.hasNextPage && !query.isFetchingNextPage) query.fetchNextPage();
     },
-    enabled: !!userId,
-  });
+  };
+}
+
+export function useUserLists(userId: string) {
+  const queryClient = useQueryClient();
+
+  const [isLoading, setIsLoading] = useState(false);
+
+  const followersList = useEdgeList("followers", userId);
+  const followingList = useEdgeList("following", userId);
 
   const followMutation = useFollowUser();
   const unfollowMutation = useUnfollowUser();
@@ -90,10 +97,12 @@ export function useUserLists(userId: string) {
   };
 
   return {
-    followers,
-    following,
-    isLoading: isLoading || loadingFollowers || loadingFollowing,
-    error: errorFollowers || errorFollowing,
+    followers: followersList.users,
+    following: followingList.users,
+    followersPaging: followersList,
+    followingPaging: followingList,
+    isLoading: isLoading || followersList.isLoading || followingList.isLoading,
+    error: followersList.error || followingList.error,
     handleFollow,
     handleUnfollow,
     handleRemoveFollower,
@@ -2,6 +2,7 @@ import React, { useState, useEffect } from "react";
 import { ChevronLeft, ChevronRight } from "lucide-react";
 import { motion } from "framer-motion";
 import { useFetchHotBids } from "@/hooks/auction/featured/useFetchHotBids";
+import { ArtworkAuction } from "@/hooks/auction/useAuction";
 import HotBidsCarouselSkeleton from "@/components/skeletons/HotBidsCarouselSkeleton";
 
 const HotBidsCarousel = () => {
@@ -26,9 +27,12 @@ const { data: hotBids, isLoading, isError } = useFetchHotBids();
     return <div className="text-center py-10 text-red-500">Failed to load bids.</div>;
   }
 
+  const bidCount = (auction: ArtworkAuction) =>
+    auction.bid_summary?.bid_count ?? auction.bid_history?.length ?? 0;
+
   const filteredBids = hotBids
-    .filter((auction) => auction.bid_history && auction.bid_history.length > 0)
-    .sort((a, b) => b.bid_history.length - a.bid_history.length);
+    .filter((auction) => bidCount(auction) > 0)
+    .sort((a, b) => bidCount(b) - bidCount(a));
 
   const sortedHotBids = filteredBids.slice(0, Math.min(filteredBids.length, 5));
 
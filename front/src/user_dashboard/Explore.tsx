@@ -48,9 +48,7 @@ const popularArtworks = popularArtworksRaw?.slice(0, 5) ?? [];
   const reportStatusLookup = React.useMemo(() => {
     return reportStatus || {};
   }, [reportStatus]);
-  const [page] = useState(1);
-
-  const { data: followedArtworksData } = useFollowedArtworks(page);
+  const { data: followedArtworksData } = useFollowedArtworks();
 
   const filteredArtworksMemo = useMemo(() => {
     if (!artworks) return [];
@@ -58,7 +56,7 @@ const popularArtworks = popularArtworksRaw?.slice(0, 5) ?? [];
     const category = selectedCategory.toLowerCase();
 
     if (category === "following") {
-      return Array.isArray(followedArtworksData) ? followedArtworksData : followedArtworksData?.artworks ?? [];
+      return followedArtworksData ?? [];
     }
 
     let filtered = artworks;